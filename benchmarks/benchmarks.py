@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Benchmarks for GetDevInfo
+# This file is part of GetDevInfo.
+# Copyright (C) 2013-2022 Hamish McIntyre-Bhatty
+# GetDevInfo is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# GetDevInfo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GetDevInfo.  If not, see <http://www.gnu.org/licenses/>.
+
+#Import modules.
+import getopt
+import sys
+import os
+import time
+import resource
+import subprocess
+import shutil
+import json
+
+import bs4
+from bs4 import BeautifulSoup
+
+#The benchmarks aren't part of the package, so find it next to them.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import getdevinfo.linux as linux #pylint: disable=wrong-import-position
+from getdevinfo.tests import getdevinfo_test_data as data #pylint: disable=wrong-import-position
+
+#lshw profiles that aren't shipped yet. Record them on real hardware with
+#--lshw-profiles before adding them to linux.LSHW_PROFILES.
+CANDIDATE_LSHW_PROFILES = {"fast": ("dmi", "spd", "memory", "cpuid", "cpuinfo", "pci", "isapnp",
+                                    "pcmcia", "network")}
+
+def usage():
+    print("\nUsage: benchmarks.py [OPTION]\n\n")
+    print("Options:\n")
+    print("       -h, --help:                   Display this help text.")
+    print("       -d, --disks:                  The number of disks in the generated lshw output. Default: 500.")
+    print("       -p, --partitions:             The number of partitions on each disk. Default: 8.")
+    print("       -l, --lshw-profiles DIR:      Compare lshw's profiles instead, including the candidate ones that")
+    print("                                     aren't shipped yet. lshw is run with each profile (if it is installed),")
+    print("                                     and its output and runtime are recorded in DIR. Then the recorded")
+    print("                                     outputs are checked to make sure the same disks were found.")
+    print("       -r, --runs:                   The number of times to run lshw with each profile. Default: 3.")
+
+def make_lshw_output(disks, partitions):
+    """Generate lshw output with the given number of disks and partitions on each disk"""
+    fixture = data.return_fake_lshw_output()
+
+    #Use the first disk in the test data, and its first partition, as templates.
+    disk = fixture[fixture.index(b"  <node id=\"disk\""):fixture.index(b"    <node id=\"volume:0\"")]
+    partition = fixture[fixture.index(b"    <node id=\"volume:0\""):fixture.index(b"    <node id=\"volume:1\"")]
+
+    output = [fixture[:fixture.index(b"<list>")], b"<list>\n"]
+
+    for disk_number in range(disks):
+        name = b"/dev/sd"+str(disk_number).encode()
+
+        output.append(disk.replace(b"/dev/sda", name))
+
+        for partition_number in range(1, partitions+1):
+            output.append(partition.replace(b"/dev/sda1", name+b"p"+str(partition_number).encode()))
+
+        output.append(b"  </node>\n")
+
+    output.append(b"</list>\n")
+
+    return b"".join(output)
+
+def parse_with_beautifulsoup(stdout):
+    """The way parse_lshw_output() used to work, for comparison"""
+    output = BeautifulSoup(stdout.decode("utf-8", errors="replace"), "xml")
+
+    for node in output.list.children:
+        if not isinstance(node, bs4.element.Tag):
+            continue
+
+        host_disk = linux.get_device_info(node)
+
+        for subnode in node.find_all("node"):
+            if (not isinstance(subnode, bs4.element.Tag)) or subnode.name != "node":
+                continue
+
+            linux.get_partition_info(subnode, host_disk)
+
+def measure(function, stdout):
+    """
+    Run the function in a child process, and return the CPU time it used and how
+    much its peak memory usage grew by (this includes memory used by libxml2).
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:
+        os.close(read_fd)
+        linux.DISKINFO = {}
+
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start_time = time.process_time()
+
+        function(stdout)
+
+        cpu_time = time.process_time() - start_time
+        peak_memory = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) * 1024
+
+        os.write(write_fd, (str(cpu_time)+" "+str(peak_memory)).encode())
+        os._exit(0)
+
+    os.close(write_fd)
+
+    with os.fdopen(read_fd, "rb") as result:
+        cpu_time, peak_memory = result.read().decode().split()
+
+    os.waitpid(pid, 0)
+
+    return float(cpu_time), int(peak_memory)
+
+def benchmark_lshw_parsing(disks, partitions):
+    """Compare parsing lshw's output with lxml and with BeautifulSoup"""
+    stdout = make_lshw_output(disks, partitions)
+
+    print("lshw output: "+str(len(stdout))+" bytes, "+str(disks)+" disks, "
+          + str(disks*partitions)+" partitions\n")
+
+    #Don't touch the real disks.
+    linux.get_boot_record = data.fake_get_boot_record
+    linux.get_partition_table = data.fake_get_partition_table
+    linux.DISK_LINKS = {}
+    linux.BLKID_INDEX = {}
+    linux.BLKID_SCANNED = True
+
+    results = {}
+
+    for name, function in (("BeautifulSoup", parse_with_beautifulsoup),
+                           ("lxml", linux.parse_lshw_output)):
+
+        results[name] = measure(function, stdout)
+        print(name.ljust(16)+"CPU time: "+format(results[name][0], ".3f")+" s, peak memory: "
+              + format(results[name][1]/1000000, ".1f")+" MB")
+
+    print("\nlxml used "+format(results["BeautifulSoup"][0]/results["lxml"][0], ".1f")
+          + " times less CPU time and "
+          + format(results["BeautifulSoup"][1]/results["lxml"][1], ".1f")
+          + " times less memory.")
+
+def parse_recorded_lshw_output(path):
+    """Parse some recorded lshw output, and return the disk info"""
+    linux.DISKINFO = {}
+
+    with open(path, "rb") as recording:
+        linux.parse_lshw_output(recording)
+
+    return linux.DISKINFO
+
+def get_lshw_profiles():
+    """Get the tests each profile disables, for the shipped profiles and the candidate ones"""
+    profiles = dict(linux.LSHW_PROFILES)
+    profiles.update(CANDIDATE_LSHW_PROFILES)
+
+    return profiles
+
+def benchmark_lshw_profiles(directory, runs):
+    """Compare lshw's runtime with each profile, and check the disks found are the same"""
+    #Don't touch the real disks.
+    linux.get_boot_record = data.fake_get_boot_record
+    linux.get_partition_table = data.fake_get_partition_table
+    linux.DISK_LINKS = {}
+    linux.BLKID_INDEX = {}
+    linux.BLKID_SCANNED = True
+
+    profiles = get_lshw_profiles()
+    times_path = os.path.join(directory, "lshw-profiles.json")
+
+    #Record lshw's output and runtime with each profile, if we can.
+    if shutil.which("lshw") is not None:
+        os.makedirs(directory, exist_ok=True)
+        times = {}
+
+        for profile, tests in profiles.items():
+            command = linux.LSHW_COMMAND
+
+            for test in tests:
+                command += ("-disable", test)
+
+            times[profile] = []
+
+            for _run in range(runs):
+                start_time = time.monotonic()
+                output = subprocess.run(command, check=True, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL).stdout
+
+                times[profile].append(time.monotonic() - start_time)
+
+            with open(os.path.join(directory, "lshw-"+profile+".xml"), "wb") as recording:
+                recording.write(output)
+
+        with open(times_path, "w", encoding="utf-8") as times_file:
+            json.dump(times, times_file)
+
+    else:
+        print("lshw isn't installed, using the recordings in "+directory+"\n")
+
+    with open(times_path, encoding="utf-8") as times_file:
+        times = json.load(times_file)
+
+    results = {}
+
+    for profile in profiles:
+        results[profile] = parse_recorded_lshw_output(os.path.join(directory,
+                                                                   "lshw-"+profile+".xml"))
+
+        print(profile.ljust(16)+"Runtime: "+format(min(times[profile]), ".3f")+" s (best of "
+              + str(len(times[profile]))+"), "+str(len(results[profile]))+" disks and volumes")
+
+    different = False
+
+    for profile in CANDIDATE_LSHW_PROFILES:
+        print("\nThe "+profile+" profile took "
+              + format(min(times[profile])/min(times["full"])*100, ".0f")
+              + "% of the time of the full profile.")
+
+        if results[profile] == results["full"]:
+            print("The disks and volumes found were the same.")
+
+        else:
+            print("WARNING: The disks and volumes found were different!")
+            different = True
+
+    if different:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    #Check all cmdline options are valid.
+    try:
+        OPTS, ARGS = getopt.getopt(sys.argv[1:], "hd:p:l:r:", ["help", "disks=", "partitions=",
+                                                                "lshw-profiles=", "runs="])
+
+    except getopt.GetoptError as err:
+        #Invalid option. Show the help message and then exit.
+        #Show the error.
+        print(str(err))
+        usage()
+        sys.exit(2)
+
+    DISKS = 500
+    PARTITIONS = 8
+    LSHW_PROFILES_DIR = None
+    RUNS = 3
+
+    for o, a in OPTS:
+        if o in ["-d", "--disks"]:
+            DISKS = int(a)
+
+        elif o in ["-p", "--partitions"]:
+            PARTITIONS = int(a)
+
+        elif o in ["-l", "--lshw-profiles"]:
+            LSHW_PROFILES_DIR = a
+
+        elif o in ["-r", "--runs"]:
+            RUNS = int(a)
+
+        elif o in ["-h", "--help"]:
+            usage()
+            sys.exit()
+
+        else:
+            assert False, "unhandled option"
+
+    if LSHW_PROFILES_DIR is not None:
+        benchmark_lshw_profiles(LSHW_PROFILES_DIR, RUNS)
+
+    else:
+        benchmark_lshw_parsing(DISKS, PARTITIONS)
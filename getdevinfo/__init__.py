@@ -21,9 +21,9 @@ The GetDevInfo module.
 from __future__ import absolute_import
 from . import getdevinfo
 
-def get_info():
+def get_info(**kwargs):
     """Wrapper for getdevinfo.get_info()"""
-    return getdevinfo.get_info()
+    return getdevinfo.get_info(**kwargs)
 
 if __name__ == "__main__":
     getdevinfo.run()
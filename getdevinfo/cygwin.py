@@ -46,6 +46,7 @@ module, but you can call it directly if you like.
 
 import subprocess
 import os
+import re
 import json
 
 #Determine path to blkid and smartctl.
@@ -65,6 +66,9 @@ else:
 DISKINFO = None
 ERRORS = []
 
+#Matches the same readable strings as the strings command.
+PRINTABLE_STRING_REGEX = re.compile(rb"[\t\x20-\x7e]{4,}")
+
 def get_info():
     """
     This function is the Cygwin-specific way of getting disk information.
@@ -592,7 +596,8 @@ def get_boot_record(disk):
     """
     Private, implementation detail.
 
-    This function gets the MBR/PBR of a given disk.
+    This function gets the MBR/PBR of a given disk. The first sector is
+    read directly, rather than with dd and strings.
 
     Args:
         disk (str):   The name of a partition/device.
@@ -608,28 +613,46 @@ def get_boot_record(disk):
     >>> boot_record, boot_record_strings = get_boot_record(<aDiskName>)
     """
 
-    #Use status=none to avoid getting status messages from dd in our boot record.
-    cmd = subprocess.run(["dd", "if="+disk, "bs=512", "count=1", "status=none"],
-                        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=False)
+    try:
+        file_descriptor = os.open(disk, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+
+        try:
+            boot_record = os.pread(file_descriptor, 512, 0)
 
-    boot_record = cmd.stdout
-    return_value = cmd.returncode
+        finally:
+            os.close(file_descriptor)
 
-    if return_value != 0:
+    except OSError:
         return ("Unknown", ["Unknown"])
 
-    #Get the readable strings in the boot record.
-    with subprocess.Popen(["strings"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-                           stderr=subprocess.STDOUT) as cmd:
+    return (boot_record, get_boot_record_strings(boot_record))
+
+def get_boot_record_strings(boot_record):
+    """
+    Private, implementation detail.
+
+    This function finds the readable strings in a boot record, the same way
+    as the strings command does: runs of at least 4 printable ASCII characters
+    (including tabs). Spaces are removed from each string, and the list ends
+    with an empty string, to match the old output of strings.
+
+    Args:
+        boot_record (bytes):    The raw boot record.
+
+    Returns:
+        list. The readable strings.
+
+    Usage:
+
+    >>> boot_record_strings = get_boot_record_strings(<someBytes>)
+    """
 
-        cmd.stdin.write(boot_record)
-        boot_record_strings = cmd.communicate()[0].decode("utf-8", errors="replace").replace(" ", "").split("\n")
-        return_value = cmd.returncode
+    boot_record_strings = [string.decode("ascii").replace(" ", "")
+                           for string in PRINTABLE_STRING_REGEX.findall(boot_record)]
 
-    if return_value != 0:
-        return (boot_record, ["Unknown"])
+    boot_record_strings.append("")
 
-    return (boot_record, boot_record_strings)
+    return boot_record_strings
 
 def get_block_size(disk):
     """
@@ -54,12 +54,17 @@ import sys
 #Declare version; useful for users of the module.
 VERSION = "2.0.0"
 
-def get_info(name_main=False):
+def get_info(name_main=False, **kwargs):
     """
     This function is used to determine the platform you're using
     (Linux or macOS) and run the relevant tools. Then, it returns
     the disk information dictionary to the caller.
 
+    Args:
+        **kwargs:   Options for the Linux tools, eg max_workers. These
+                    are passed to linux.get_info(), which documents them.
+                    They are ignored on macOS and Cygwin.
+
     Returns:
         dict, the disk info dictionary.
 
@@ -77,6 +82,10 @@ def get_info(name_main=False):
     Usage:
 
     >>> disk_info = get_info()
+
+    OR:
+
+    >>> disk_info = get_info(max_workers=8)
     """
 
     #Determine if running on Linux or Mac.
@@ -102,12 +111,14 @@ def get_info(name_main=False):
     elif is_cygwin:
         from . import cygwin
         get_info_platform = cygwin.get_info
+        kwargs = {}
 
     else:
         from . import macos
         get_info_platform = macos.get_info
+        kwargs = {}
 
-    get_info_platform()
+    get_info_platform(**kwargs)
 
     if is_linux and not is_cygwin:
         diskinfo = linux.DISKINFO
@@ -24,8 +24,9 @@ module, but you can call it directly if you like.
         You can import this submodule directly, but it might result
         in strange behaviour, or not work on your platform if you
         import the wrong one. That is not how the package is intended
-        to be used, except if you want to use the get_block_size()
-        function to get a block size, as documented below.
+        to be used, except if you want to use the get_block_size() or
+        get_block_sizes() functions to get block sizes, or the get_partition_table()
+        function to read a partition table, as documented below.
 
 .. warning::
         Feel free to experiment, but be aware that you may be able to
@@ -47,19 +48,146 @@ module, but you can call it directly if you like.
 
 import subprocess
 import os
+import io
+import re
 import json
-import bs4
-from bs4 import BeautifulSoup
+import struct
+import uuid
+import zlib
+import fnmatch
+import fcntl
+import time
+import queue
+import threading
+import collections
+import concurrent.futures
+from lxml import etree
 
 #Define global variables to make pylint happy.
 DISKINFO = None
-LSUUIDOUTPUT = None
+DISK_LINKS = None
+BLKID_INDEX = {}
+BLKID_SCANNED = False
+SUPERBLOCK_INDEX = {}
+DM_VOLUMES = None
+DM_NAMES = None
 LSBLKOUTPUT = None
-LSIDOUTPUT = None
 LVMOUTPUT = None
 ERRORS = []
 
-def get_info():
+#Executor used to run per-device probes concurrently (None means run them serially).
+PROBE_EXECUTOR = None
+PENDING_PROBES = collections.deque()
+
+#How long a probe (or command) can take, if probes are watched (set by get_info()),
+#how many workers run them, the queue the workers take them from, the device each
+#probe is for and when it started, and the probes and devices that have hung.
+PROBE_TIMEOUT = None
+PROBE_MAX_WORKERS = 1
+PROBE_QUEUE = None
+PROBE_WORKER_COUNT = 0
+PROBE_DEVICES = {}
+PROBE_START_TIMES = {}
+HUNG_PROBES = set()
+HUNG_DEVICES = set()
+
+#Which devices to look at (set by get_info(), see get_device_filter()).
+DEVICE_FILTER = None
+
+#Which loop devices to look at, if they've been asked for (set by get_info()).
+LOOP_FILTER = None
+
+#Multipath devices, if they're being grouped (set by get_info(), see get_multipath_info()),
+#and the paths to them that are skipped because another path is probed instead.
+MULTIPATH_INFO = {}
+REDUNDANT_PATHS = set()
+
+#The power states of the disks, if probing is power-aware (set by get_info(), see
+#get_power_state()), and the disks that are asleep and mustn't be read.
+POWER_STATES = {}
+SLEEPING_DISKS = set()
+
+#The ATA CHECK POWER MODE command (and its retired opcode, for older drives),
+#sent with the HDIO_DRIVE_CMD ioctl, like hdparm -C does.
+HDIO_DRIVE_CMD = 0x031f
+ATA_CHECK_POWER_MODE_COMMANDS = (0xe5, 0x98)
+ATA_POWER_MODES = {0x00: "standby", 0x40: "standby", 0x41: "active/idle", 0x80: "idle",
+                   0xff: "active/idle"}
+
+#Power states in which reading a disk would wake it up.
+SLEEPING_POWER_STATES = ("standby", "sleeping")
+
+#Devices that are ignored unless get_info() is given a different device filter.
+#Majors can be numbers, or driver names from /proc/devices.
+DEFAULT_DEVICE_FILTER = {"exclude_names": ("loop*", "zram*", "nbd*"),
+                         "exclude_majors": ("loop", "zram", "nbd")}
+
+DEVICE_FILTER_KEYS = ("include_names", "exclude_names", "include_majors", "exclude_majors",
+                      "include_transports", "exclude_transports")
+
+#The places get_info() can find disks.
+BACKENDS = ("lshw", "sysfs", "lsblk")
+
+#Where sysfs is mounted (changed during unit tests).
+SYSFS = "/sys"
+
+#Where udev keeps its database (changed during unit tests).
+UDEV_DATA = "/run/udev/data"
+
+#The udev database files that have been read, with their modification times.
+UDEV_CACHE = {}
+
+#The /dev/disk/by-* directories that get_disk_links() indexes.
+DISK_LINK_TYPES = ("by-uuid", "by-id", "by-label", "by-partuuid", "by-path")
+
+#Matches characters that blkid has escaped in its export output, eg "\ ".
+BLKID_ESCAPE_REGEX = re.compile(r"\\(.)")
+
+#Matches characters that udev has escaped in link names and *_ENC properties, eg \x20.
+UDEV_ESCAPE_REGEX = re.compile(r"\\x([0-9a-fA-F]{2})")
+
+#How much of the start of a disk get_partition_table() reads: the MBR, the GPT header and
+#a 128-entry GPT partition array, with 512 or 4096-byte sectors.
+PARTITION_TABLE_READ_SIZE = 4096 * 2 + 128 * 128
+
+#MBR partition types that hold logical partitions.
+MBR_EXTENDED_TYPES = (0x05, 0x0f, 0x85)
+
+#Partitions that start on a multiple of this many bytes are aligned.
+PARTITION_ALIGNMENT = 1024 * 1024
+
+#How much of the start of a partition get_superblock_info() reads. This covers every
+#superblock probe_superblock() looks for, up to ZFS's first uberblock at 128 KiB.
+SUPERBLOCK_READ_SIZE = 132 * 1024
+
+#Matches NVMe namespaces (eg nvme0n1) and the paths to them through each
+#controller when native multipath is used (eg nvme0c1n1).
+NVME_NAMESPACE_REGEX = re.compile(r"^nvme(\d+)(?:c(\d+))?n(\d+)$")
+
+#Matches the same readable strings as the strings command.
+PRINTABLE_STRING_REGEX = re.compile(rb"[\t\x20-\x7e]{4,}")
+
+#Find the partitions in a device in lshw's XML output.
+LSHW_PARTITIONS_XPATH = etree.XPath("descendant::node")
+
+#The commands that collect_info() starts at the same time.
+LSHW_COMMAND = ("lshw", "-sanitize", "-class", "disk", "-class", "volume", "-xml")
+
+#The lshw tests that each lshw profile disables (see get_info()). Profiles
+#that disable tests are only added here once benchmarks/benchmarks.py --lshw-profiles
+#has shown, on real hardware, that they still find the same disks.
+LSHW_PROFILES = {"full": ()}
+
+LSBLK_COMMAND = ("lsblk", "-o", "NAME,SIZE,TYPE,FSTYPE,VENDOR,MODEL,UUID", "-b", "-J")
+LSBLK_ALL_COMMAND = ("lsblk", "-J", "-O", "-b")
+BLKID_COMMAND = ("blkid", "-c", "/dev/null", "-o", "export")
+LVS_COMMAND = ("lvs", "--reportformat", "json", "--units", "b", "--nosuffix", "-o",
+               "lv_path,lv_uuid,lv_size,vg_name,lv_name,devices,lv_dm_path")
+PVS_COMMAND = ("pvs", "--reportformat", "json", "-o", "pv_name,vg_name")
+
+def get_info(max_workers=1, executor=None, backend="lshw", lshw_profile="full",
+             device_filter=None, include_zram=False, include_loops=False,
+             group_multipath=False, power_aware=False, probe_timeout=None):
     """
     This function is the Linux-specific way of getting disk information.
     It makes use of the lshw, blkid, and lvdisplay commands to gather
@@ -69,6 +197,110 @@ def get_info():
     it **doesn't** return the disk infomation. Instead, it is left as a
     global attribute in this module (DISKINFO).
 
+    The slow per-device probes (reading boot records and detecting file
+    systems) can be run concurrently. The resulting DISKINFO is the same
+    as it would be if they were run one at a time.
+
+    Args:
+        backend(="lshw") (str):     Where to find the disks:
+
+            - "lshw"    - Use lshw, with lsblk as a fallback (the default).
+            - "sysfs"   - Read /sys/block instead. This is much faster, because
+                          lshw is slow to run on large systems, but the vendors,
+                          descriptions and flags are less detailed.
+            - "lsblk"   - Get everything from one lsblk call (all columns),
+                          without running lshw or blkid. Also much faster than
+                          lshw, and gives file systems, labels, UUIDs and
+                          partition schemes, but descriptions are less detailed.
+
+        lshw_profile(="full") (str):    Which of lshw's tests to run:
+
+            - "full"    - All of them (the default, and currently the
+                          only profile).
+
+        device_filter(=None) (dict):    Which devices to look at. Excluded
+                                        devices (and their partitions) are
+                                        skipped before they are probed, and
+                                        where possible the tools are told not
+                                        to look at them at all. Any of these
+                                        keys can be used:
+
+            - "include_names"       - Only devices whose kernel names match one
+                                      of these globs, eg ["sd*", "nvme*"].
+            - "exclude_names"       - No devices whose names match these globs.
+            - "include_majors"      - Only devices with these major numbers. Driver
+                                      names from /proc/devices (eg "sd") can be used.
+            - "exclude_majors"      - No devices with these major numbers.
+            - "include_transports"  - Only devices on these transports (eg "nvme",
+                                      "sata", "usb", "mmc", "virtio", "scsi").
+            - "exclude_transports"  - No devices on these transports.
+
+            The default excludes loop, zram and nbd devices. LVM volumes aren't
+            filtered.
+
+        include_zram(=False) (bool):    Include zram devices, even if the device
+                                        filter excludes them. Their entries also
+                                        have a "Zram" key, with the statistics
+                                        from get_zram_info(), so you can see how
+                                        well they're compressing and whether
+                                        they're running out of memory.
+
+        include_loops(=False) (bool):   Include loop devices that are in use,
+                                        even if the device filter excludes
+                                        them. These aren't probed like other
+                                        devices (so there are no boot records),
+                                        because there can be hundreds of them
+                                        (eg with snaps). Instead, their entries
+                                        have a "Loop" key, with their backing
+                                        files and settings from get_loop_info().
+
+        group_multipath(=False) (bool): Only probe one path to each multipath
+                                        device (eg a SAN LUN that appears as
+                                        several /dev/sdX devices). Paths are
+                                        grouped by dm-multipath map, or by WWID.
+                                        The other paths are left out, and are
+                                        listed, with their states, in the
+                                        "Multipath" key of the path that was
+                                        probed (see get_multipath_info()).
+
+        power_aware(=False) (bool):     Check each disk's power state first (see
+                                        get_power_state()), and don't read disks
+                                        that are in standby, so they aren't spun
+                                        up. Sleeping disks only get information
+                                        that doesn't need their media (eg from
+                                        sysfs and udev). Every entry gets a
+                                        "PowerState" key, and a "PartiallyProbed"
+                                        key that is True if its disk was asleep.
+                                        lshw reads every disk itself, so this
+                                        needs the sysfs or lsblk backend. LVM
+                                        is only allowed to see the disks that
+                                        are awake (with lvs --devices), and
+                                        logical volumes on sleeping disks are
+                                        left out.
+
+        probe_timeout(=None) (float):   The number of seconds a per-device probe
+                                        (eg reading a boot record), or one of the
+                                        tools (eg lshw), can take. If set, probes
+                                        run in up to max_workers daemon threads,
+                                        so a failing device can't hold up the
+                                        others. Probes that take too long are abandoned, and
+                                        their results are "Timed out". The rest
+                                        of the device's probes are abandoned too,
+                                        and a new worker replaces the stuck one.
+                                        Tools that take too long are killed.
+
+        max_workers(=1) (int):      The number of threads to use for the
+                                    per-device probes. 1 runs them serially.
+
+        executor(=None):            A concurrent.futures.Executor to run
+                                    the probes with instead. If given,
+                                    max_workers is ignored, and the caller
+                                    is responsible for shutting it down.
+                                    It isn't used if probe_timeout is set,
+                                    because a probe that hangs would keep
+                                    one of its threads forever, so it could
+                                    never be shut down.
+
     Raises:
         Nothing, hopefully, but errors have a small chance of propagation
         up to here here. Wrap it in a try:, except: block if you are worried.
@@ -76,1028 +308,4642 @@ def get_info():
     Usage:
 
     >>> get_info()
-    """
-    env = os.environ.copy()
-    env["LC_ALL"] = "C"
-
-    #Run lshw to try and get disk information.
-    try:
-        cmd = subprocess.run(["lshw", "-sanitize", "-class", "disk", "-class", "volume", "-xml"],
-                             check=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env)
-
-    except (OSError, subprocess.CalledProcessError) as err:
-        ERRORS.append("linux.get_info(): Exception: "+str(err)+" while running lshw\n")
-        return
-
-    else:
-        #Get the output.
-        stdout = cmd.stdout.decode("utf-8", errors="replace")
 
-    global DISKINFO
-    DISKINFO = {}
-
-    #Save some info for later use.
-    #UUIDs.
-    global LSUUIDOUTPUT
+    OR:
 
-    try:
-        cmd = subprocess.run(["ls", "-l", "/dev/disk/by-uuid/"], stdout=subprocess.PIPE,
-                             check=True, stderr=subprocess.STDOUT)
+    >>> get_info(max_workers=<anInt>, backend=<aBackendName>, lshw_profile=<aProfileName>)
 
-    except (OSError, subprocess.CalledProcessError) as err:
-        ERRORS.append("linux.get_info(): Exception: "+str(err)+" while running ls -l\n")
-        return
+    OR:
 
-    else:
-        LSUUIDOUTPUT = cmd.stdout.decode("utf-8", errors="replace")
+    >>> get_info(device_filter={"exclude_transports": ["usb"]})
 
-    #IDs.
-    global LSIDOUTPUT
+    OR:
 
-    try:
-        cmd = subprocess.run(["ls", "-l" ,"/dev/disk/by-id/"], stdout=subprocess.PIPE,
-                             check=True, stderr=subprocess.STDOUT)
+    >>> get_info(include_zram=True)
 
-    except (OSError, subprocess.CalledProcessError) as err:
-        ERRORS.append("linux.get_info(): Exception: "+str(err)+" while running ls -l\n")
-        LSIDOUTPUT = ""
+    OR:
 
-    else:
-        LSIDOUTPUT = cmd.stdout.decode("utf-8", errors="replace")
+    >>> get_info(group_multipath=True)
 
-    #Parse the XML.
-    output = BeautifulSoup(stdout, "xml")
+    OR:
 
-    if output.list is None:
-        ERRORS.append("linux.get_info(): No disks found!\n")
-        raise RuntimeError("No disks found!")
+    >>> get_info(backend="sysfs", power_aware=True)
 
-    list_of_devices = output.list.children
+    OR:
 
-    #Find the disks.
-    for node in list_of_devices:
-        if not isinstance(node, bs4.element.Tag):
-            continue
+    >>> get_info(probe_timeout=10)
+    """
 
-        #These are devices.
-        host_disk = get_device_info(node)
+    global PROBE_EXECUTOR
+    global PROBE_TIMEOUT
+    global PROBE_MAX_WORKERS
+    global DEVICE_FILTER
+    global LOOP_FILTER
+    global MULTIPATH_INFO
+    global REDUNDANT_PATHS
+    global POWER_STATES
+    global SLEEPING_DISKS
 
-        #Detect any partitions and sub-partitions (logical partitions).
-        partitions = node.find_all("node")
+    if backend not in BACKENDS:
+        raise ValueError("Unknown backend: "+str(backend))
 
-        #Get the info of any partitions these devices contain.
-        for subnode in partitions:
-            if (not isinstance(subnode, bs4.element.Tag)) or subnode.name != "node":
-                continue
+    if lshw_profile not in LSHW_PROFILES:
+        raise ValueError("Unknown lshw profile: "+str(lshw_profile))
 
-            #partitions.
-            get_partition_info(subnode, host_disk)
+    DEVICE_FILTER = get_device_filter(device_filter, include=("zram",) if include_zram else ())
 
-    #Find any NVME disks (lshw currently doesn't detect these).
-    global LSBLKOUTPUT
+    if include_loops:
+        LOOP_FILTER = get_device_filter(device_filter, include=("loop",))
 
-    try:
-        cmd = subprocess.run(["lsblk", "-o", "NAME,SIZE,TYPE,FSTYPE,VENDOR,MODEL,UUID", "-b",
-                              "-J"], check=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                             env=env)
+    if group_multipath:
+        MULTIPATH_INFO = get_multipath_info()
+        REDUNDANT_PATHS = set(path for device, info in MULTIPATH_INFO.items()
+                              for path in info["Paths"] if path != device)
 
-    except (OSError, subprocess.CalledProcessError) as err:
-        ERRORS.append("linux.get_info(): Exception: "+str(err)+" while running lsblk\n")
-        return
+    if power_aware and backend == "lshw":
+        #lshw reads every disk, so it would wake up the sleeping ones.
+        raise ValueError("The lshw backend can't be used with power_aware=True")
 
-    else:
-        LSBLKOUTPUT = cmd.stdout.decode("utf-8", errors="replace")
+    if power_aware:
+        POWER_STATES = get_power_states()
+        SLEEPING_DISKS = set(disk for disk, state in POWER_STATES.items()
+                             if state in SLEEPING_POWER_STATES)
 
-    #Convert to unicode if needed to allow NVME drive detection on Python 3.5 (Ubuntu 16.04)
-    if isinstance(LSBLKOUTPUT, bytes):
-        LSBLKOUTPUT = LSBLKOUTPUT.decode("utf-8", errors="replace")
+    if probe_timeout is not None:
+        #Watched probes always use their own daemon threads. A probe that hangs
+        #would keep one of the executor's threads forever, so it could never
+        #be shut down.
+        PROBE_TIMEOUT = probe_timeout
+        PROBE_MAX_WORKERS = max(1, max_workers)
 
-    #FIXME: Handle exceptions properly here.
-    try:
-        parse_lsblk_output()
+    elif executor is not None:
+        PROBE_EXECUTOR = executor
 
-    except Exception as err:
-        ERRORS.append("linux.get_info(): Unhandled exception: "+str(err)
-                      + " while parsing lsblk output\n")
+    elif max_workers > 1:
+        PROBE_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
 
-    #Find any LVM disks. Don't use -c because it doesn't give us enough information.
-    global LVMOUTPUT
     try:
-        cmd = subprocess.run(["lvdisplay", "--maps"], check=True, stdout=subprocess.PIPE,
-                             stderr=subprocess.STDOUT, env=env)
+        collect_info(backend=backend, lshw_profile=lshw_profile)
 
-    except (OSError, subprocess.CalledProcessError) as err:
-        ERRORS.append("linux.get_info(): Exception: "+str(err)+" while running lvdisplay --maps\n")
-        return
+    finally:
+        #Make sure any probes that are still running are finished before we return.
+        try:
+            collect_probes()
 
-    else:
-        LVMOUTPUT = cmd.stdout.decode("utf-8", errors="replace").split("\n")
+        finally:
+            if executor is None and PROBE_EXECUTOR is not None:
+                PROBE_EXECUTOR.shutdown()
 
-    parse_lvm_output()
+            stop_probe_workers()
 
-    #Check we found some disks.
-    if not DISKINFO:
-        ERRORS.append("linux.get_info(): No disks found!\n")
-        raise RuntimeError("No disks found!")
+            PROBE_EXECUTOR = None
+            PROBE_TIMEOUT = None
+            PROBE_MAX_WORKERS = 1
+            DEVICE_FILTER = None
+            LOOP_FILTER = None
+            MULTIPATH_INFO = {}
+            REDUNDANT_PATHS = set()
+            POWER_STATES = {}
+            SLEEPING_DISKS = set()
 
-def get_device_info(node):
+def collect_info(backend="lshw", lshw_profile="full"):
     """
     Private, implementation detail.
 
-    This function gathers and assembles information for devices (whole disks).
-    It employs some simple logic and the other functions defined in this
-    module to do its work.
+    This function runs the tools and assembles the disk info dictionary.
+    It is called by get_info(), which takes care of setting up and
+    tearing down the probe executor.
 
     Args:
-        node:       A "node" representing a device, generated from lshw's XML
-                    output.
+        backend(="lshw") (str):         Where to find the disks. See get_info().
+        lshw_profile(="full") (str):    Which of lshw's tests to run. See get_info().
 
-    Returns:
-        string.     The name of the device.
+    Raises:
+        RuntimeError, if no disks were found.
 
     Usage:
 
-    >>> host_disk = get_device_info(<aNode>)
-    """
-
-    if isinstance(node.logicalname.string, bytes):
-        host_disk = node.logicalname.string.decode("utf-8") #NOTE: is this ever bytes?
-
-    else:
-        host_disk = node.logicalname.string
+    >>> collect_info()
 
-    #Ignore loop, zram, and nbd devices.
-    if "/dev/loop" in host_disk or "/dev/zram" in host_disk or "/dev/nbd" in host_disk:
-        return host_disk
+    OR:
 
-    DISKINFO[host_disk] = {}
-    DISKINFO[host_disk]["Name"] = host_disk
-    DISKINFO[host_disk]["Type"] = "Device"
-    DISKINFO[host_disk]["HostDevice"] = "N/A"
-    DISKINFO[host_disk]["Partitions"] = []
-    DISKINFO[host_disk]["Vendor"] = get_vendor(node)
-    DISKINFO[host_disk]["Product"] = get_product(node)
+    >>> collect_info(backend=<aBackendName>, lshw_profile=<aProfileName>)
+    """
 
-    #Ignore capacities for all optical media.
-    if "/dev/cdrom" in host_disk or "/dev/sr" in host_disk or "/dev/dvd" in host_disk:
-        DISKINFO[host_disk]["RawCapacity"], DISKINFO[host_disk]["Capacity"] = ("N/A", "N/A")
+    global DISKINFO
+    global DISK_LINKS
+    global BLKID_INDEX
+    global BLKID_SCANNED
+    global SUPERBLOCK_INDEX
+    global DM_VOLUMES
+    global DM_NAMES
+    global LSBLKOUTPUT
 
-    else:
-        DISKINFO[host_disk]["RawCapacity"], DISKINFO[host_disk]["Capacity"] = get_capacity(node)
+    env = os.environ.copy()
+    env["LC_ALL"] = "C"
 
-    if isinstance(node.description.string, bytes):
-        #NOTE: is this ever bytes?
-        DISKINFO[host_disk]["Description"] = node.description.string.decode("utf-8")
+    #Start all of the tools at once, so we only have to wait for the slowest one.
+    commands = {}
+    lvm_filter = get_lvm_filter()
 
-    else:
-        DISKINFO[host_disk]["Description"] = node.description.string
+    if lvm_filter is not None:
+        commands["lvs"] = LVS_COMMAND + lvm_filter
+        commands["pvs"] = PVS_COMMAND + lvm_filter
 
-    DISKINFO[host_disk]["Flags"] = get_capabilities(node)
-    DISKINFO[host_disk]["Partitioning"] = get_partitioning(host_disk)
-    DISKINFO[host_disk]["FileSystem"] = "N/A"
-    DISKINFO[host_disk]["UUID"] = "N/A"
-    DISKINFO[host_disk]["ID"] = get_id(host_disk)
+    if backend == "lsblk":
+        #lsblk tells us everything blkid would.
+        commands["lsblk"] = LSBLK_ALL_COMMAND + get_lsblk_filter()
 
-    #Don't try to get Boot Records for optical drives.
-    if "/dev/cdrom" in host_disk or "/dev/sr" in host_disk or "/dev/dvd" in host_disk:
-        DISKINFO[host_disk]["BootRecord"], DISKINFO[host_disk]["BootRecordStrings"] = ("N/A", ["N/A"])
+    elif not has_udev_database():
+        #Don't let blkid probe devices we're going to ignore.
+        devices = get_included_devices()
 
-    else:
-        DISKINFO[host_disk]["BootRecord"], DISKINFO[host_disk]["BootRecordStrings"] = get_boot_record(host_disk)
+        if devices is None:
+            commands["blkid"] = BLKID_COMMAND
 
-    return host_disk
+        elif devices:
+            commands["blkid"] = BLKID_COMMAND + tuple(devices)
 
-def get_partition_info(subnode, host_disk):
-    """
-    Private, implementation detail.
+    lshw = None
+    lshw_watchdog = None
 
-    This function gathers and assembles information for partitions.
-    It employs some simple logic and the other functions defined in this
-    module to do its work.
+    if backend == "lshw":
+        commands["lsblk"] = LSBLK_COMMAND + get_lsblk_filter()
 
-    Args:
-        subnode:            A "node" representing a partition, generated
-                            from lshw's XML output.
+        #lshw's output is parsed as it runs, so read it from the pipe.
+        try:
+            lshw = subprocess.Popen(get_lshw_command(lshw_profile), stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL, env=env)
 
-        host_disk (str):    The "parent" or "host" device. eg: for
-                            /dev/sda1, the host disk would be /dev/sda.
-                            Used to organise everything nicely in the
-                            disk info dictionary.
+        except OSError as err:
+            ERRORS.append("linux.get_info(): Exception: "+str(err)+" while running lshw\n")
+            return
 
-    Returns:
-        string.     The name of the partition.
+        lshw_watchdog = watch_process(lshw, "lshw")
 
-    Usage:
+    try:
+        commands = start_commands(commands)
 
-    >>> volume = get_device_info(<aNode>)
-    """
+        DISKINFO = {}
 
-    try:
-        if isinstance(subnode.logicalname.string, bytes):
-            #NOTE: is this ever bytes?
-            volume = subnode.logicalname.string.decode("utf-8")
+        #Save some info for later use (UUIDs, IDs, labels, etc).
+        DISK_LINKS = get_disk_links()
+        SUPERBLOCK_INDEX = {}
 
-        else:
-            volume = subnode.logicalname.string
+        #Index the logical volumes in /dev/mapper.
+        DM_VOLUMES, DM_NAMES = get_dm_index()
 
-    except AttributeError:
-        if isinstance(subnode.physid.string, bytes):
-            #NOTE: is this ever bytes?
-            if "nvme" in host_disk:
-                volume = host_disk+"p"+subnode.physid.string.decode("utf-8")
+        #Probe all the file systems with one blkid call, rather than one per disk.
+        if "blkid" in commands:
+            BLKID_INDEX, BLKID_SCANNED = get_blkid_index(future=commands["blkid"])
 
-            else:
-                volume = host_disk+subnode.physid.string.decode("utf-8")
+        elif backend != "lsblk" and has_udev_database():
+            #udev has already probed the file systems, so blkid is only run
+            #for any disks that aren't in its database.
+            BLKID_INDEX, BLKID_SCANNED = {}, False
 
         else:
-            if "nvme" in host_disk:
-                volume = host_disk+"p"+subnode.physid.string
+            #Every device was filtered out, or lsblk is doing blkid's job.
+            BLKID_INDEX, BLKID_SCANNED = {}, True
 
-            else:
-                volume = host_disk+subnode.physid.string
+    except BaseException:
+        #Don't leave lshw running, or unreaped, if we never get to read its output.
+        if lshw is not None:
+            with lshw:
+                lshw.kill()
 
-    #Fix bug on Pmagic, if the volume already exists in DISKINFO,
-    #or if it is an optical drive, ignore it here.
-    if volume in DISKINFO or "/dev/cdrom" in volume or "/dev/sr" in volume \
-        or "/dev/dvd" in volume:
+        if lshw_watchdog is not None:
+            lshw_watchdog.cancel()
 
-        return None
+        raise
 
-    #Ignore loop, zram, and nbd devices.
-    if "/dev/loop" in host_disk or "/dev/zram" in host_disk or "/dev/nbd" in host_disk:
-        return None
+    if backend == "sysfs":
+        #Everything we need from lshw and lsblk is in sysfs.
+        parse_sysfs()
 
-    DISKINFO[volume] = {}
-    DISKINFO[volume]["Name"] = volume
-    DISKINFO[volume]["Type"] = "Partition"
-    DISKINFO[volume]["HostDevice"] = host_disk
-    DISKINFO[volume]["Partitions"] = []
-    DISKINFO[host_disk]["Partitions"].append(volume)
-    DISKINFO[volume]["Vendor"] = get_vendor(subnode)
-    DISKINFO[volume]["Product"] = "Host Device: "+DISKINFO[host_disk]["Product"]
-    DISKINFO[volume]["RawCapacity"], DISKINFO[volume]["Capacity"] = get_capacity(subnode)
+    elif backend == "lsblk":
+        try:
+            cmd = finish_command(commands["lsblk"])
 
-    if isinstance(subnode.description.string, bytes):
-        #NOTE: is this ever bytes?
-        DISKINFO[volume]["Description"] = subnode.description.string.decode("utf-8")
+        except (OSError, subprocess.SubprocessError) as err:
+            ERRORS.append("linux.get_info(): Exception: "+str(err)+" while running lsblk\n")
+            return
+
+        parse_lsblk_all_output(cmd.stdout.decode("utf-8", errors="replace"))
 
     else:
-        DISKINFO[volume]["Description"] = subnode.description.string
+        try:
+            with lshw:
+                parse_lshw_output(lshw.stdout)
 
-    DISKINFO[volume]["Flags"] = get_capabilities(subnode)
+        finally:
+            if lshw_watchdog is not None:
+                lshw_watchdog.cancel()
 
-    #Fx bug: don't try to get file systems of extended partitions.
-    if "extended" in DISKINFO[volume]["Flags"]:
-        DISKINFO[volume]["FileSystem"] = "N/A"
+        if lshw.returncode != 0:
+            ERRORS.append("linux.get_info(): lshw exited with status "+str(lshw.returncode)+"\n")
+            return
 
-    else:
-        DISKINFO[volume]["FileSystem"] = get_file_system(subnode)
+        #Find any NVME disks (lshw currently doesn't detect these).
+        parse_nvme()
 
-    DISKINFO[volume]["Partitioning"] = "N/A"
-    DISKINFO[volume]["UUID"] = get_uuid(volume)
-    DISKINFO[volume]["ID"] = get_id(volume)
-    DISKINFO[volume]["BootRecord"], DISKINFO[volume]["BootRecordStrings"] = get_boot_record(volume)
+        #Find anything else lshw missed.
+        try:
+            cmd = finish_command(commands["lsblk"])
 
-    return volume
+        except (OSError, subprocess.SubprocessError) as err:
+            ERRORS.append("linux.get_info(): Exception: "+str(err)+" while running lsblk\n")
+            return
 
-def parse_lvm_output(testing=False):
-    """
-    Private, implementation detail.
+        else:
+            LSBLKOUTPUT = cmd.stdout.decode("utf-8", errors="replace")
 
-    This function is used to get LVM partition information from the
-    output of lvdisplay --maps.
+        #FIXME: Handle exceptions properly here.
+        try:
+            parse_lsblk_output()
 
-    Args:
-        testing(=False) (bool):     Used during unit tests.
+        except Exception as err:
+            ERRORS.append("linux.get_info(): Unhandled exception: "+str(err)
+                          + " while parsing lsblk output\n")
 
-    Usage:
+    #Add any zram and loop devices we've been asked to include, with their statistics.
+    parse_zram()
+    parse_loops()
 
-    >>> parse_lvm_output()
+    #Note the other paths to any multipath devices, and the disks' power states.
+    parse_multipath()
+    parse_power_states()
 
-    OR:
+    #Find any LVM disks. Use lvs's JSON report if we can, for exact sizes.
+    if lvm_filter is None:
+        #Every device LVM could read is asleep.
+        reports = None
 
-    >>> parse_lvm_output(testing=<aBool>)
-    """
+    else:
+        reports = get_lvm_report(futures=(commands["lvs"], commands["pvs"]))
 
-    line_counter = 0
+    if reports is not None:
+        lvs_report, pvs_report = reports
+        parse_lvm_report(lvs_report, pvs_report)
 
-    for line in LVMOUTPUT:
-        line_counter += 1
+    elif lvm_filter is None or lvm_filter:
+        #lvdisplay would read the sleeping disks (and this LVM may not have --devices).
+        ERRORS.append("linux.get_info(): Skipped LVM, because it would wake up sleeping disks\n")
 
+    else:
+        #Fall back to lvdisplay. Don't use -c because it doesn't give us enough information.
+        #The output is parsed as lvdisplay writes it.
         try:
-            line = line.decode("utf-8", errors="replace")
+            with subprocess.Popen(["lvdisplay", "--maps"], stdout=subprocess.PIPE,
+                                  stderr=subprocess.STDOUT, env=env) as cmd:
 
-        except AttributeError:
-            pass #Already a unicode string.
+                lvdisplay_watchdog = watch_process(cmd, "lvdisplay --maps")
 
-        if "--- Logical volume ---" in line:
-            assemble_lvm_disk_info(line_counter, testing=testing)
+                parse_lvm_output(io.TextIOWrapper(cmd.stdout, encoding="utf-8",
+                                                  errors="replace"))
+
+            if lvdisplay_watchdog is not None:
+                lvdisplay_watchdog.cancel()
+
+        except OSError as err:
+            ERRORS.append("linux.get_info(): Exception: "+str(err)
+                          + " while running lvdisplay --maps\n")
 
-def assemble_lvm_disk_info(line_counter, testing=False):
+            return
+
+        if cmd.returncode != 0:
+            ERRORS.append("linux.get_info(): lvdisplay --maps exited with status "
+                          + str(cmd.returncode)+"\n")
+
+            return
+
+    #Wait for the per-device probes before checking the results.
+    collect_probes()
+
+    #Check we found some disks.
+    if not DISKINFO:
+        ERRORS.append("linux.get_info(): No disks found!\n")
+        raise RuntimeError("No disks found!")
+
+def get_device_filter(device_filter=None, include=()):
     """
     Private, implementation detail.
 
-    This function is used to assemble LVM disk info into the dictionary.
-
-    Like get_device_info(), and get_partition_info(), it uses some of the
-    helper functions here.
+    This function checks a device filter (see get_info()), and gets it
+    ready to use. Majors given as driver names are looked up in
+    /proc/devices (drivers that aren't loaded are left out).
 
     Args:
-        line_counter (int):     The line in the output that informtion for a
-                                particular logical volume begins.
+        device_filter(=None) (dict):    The filter. Uses DEFAULT_DEVICE_FILTER if None.
+        include(=()) (tuple):           Drivers (eg "zram") to stop excluding, by
+                                        name (eg "zram*") and by major number.
 
-        testing(=False) (bool): Used during unit tests.
+    Returns:
+        dict. The filter, with every key from DEVICE_FILTER_KEYS.
+        Majors are sets of ints, and names and transports are tuples.
+
+    Raises:
+        ValueError, if the filter has a key we don't know about.
 
     Usage:
 
-    >>> assemble_lvm_disk_info(<anInt>)
+    >>> device_filter = get_device_filter()
+
+    OR:
+
+    >>> device_filter = get_device_filter(<aDict>)
 
     OR:
 
-    >>> assemble_lvm_disk_info(<anInt>, testing=<aBool>)
+    >>> device_filter = get_device_filter(include=("zram",))
     """
 
-    #Get all the info related to this partition.
-    raw_lvm_info = []
+    if device_filter is None:
+        device_filter = DEFAULT_DEVICE_FILTER
 
-    for line in LVMOUTPUT[line_counter:]:
-        try:
-            line = line.decode("utf-8", errors="replace").replace("'", "")
+    for key in device_filter:
+        if key not in DEVICE_FILTER_KEYS:
+            raise ValueError("Unknown device filter: "+str(key))
 
-        except AttributeError:
-            line = line.replace("'", "")
+    block_majors = None
+    compiled_filter = {}
 
-        except UnicodeError:
-            ERRORS.append("linux.assemble_lvm_disk_information(): UnicodeError!\n")
-            continue
+    for key in DEVICE_FILTER_KEYS:
+        values = device_filter.get(key, ())
 
-        raw_lvm_info.append(line)
+        if isinstance(values, (str, int)):
+            values = (values,)
 
-        #When we get to the next volume, stop adding stuff to this entry's data variable.
-        if "--- Logical volume ---" in line:
-            raw_lvm_info.pop()
-            break
+        #Stop excluding drivers we've been asked to include.
+        if key == "exclude_names":
+            values = tuple(value for value in values if value not in [driver+"*"
+                                                                      for driver in include])
 
-    #Start assembling the entry.
-    for line in raw_lvm_info:
-        if "LV Path" in line:
-            #Get the volume name and a list of aliases it has.
-            if testing is False:
-                volume, alias_list = get_lv_aliases(line)
+        elif key == "exclude_majors":
+            values = tuple(value for value in values if value not in include)
 
-            else:
-                #Get them from the test data, overriding the check to see if they exist.
-                volume, alias_list = get_lv_aliases_test(line) #pylint: disable=undefined-variable
+        if key.endswith("_majors"):
+            majors = set()
 
-            DISKINFO[volume] = {}
-            DISKINFO[volume]["Name"] = volume
-            DISKINFO[volume]["Aliases"] = alias_list
-            DISKINFO[volume]["VGName"], DISKINFO[volume]["LVName"] = get_lv_and_vg_name(volume)
-            DISKINFO[volume]["Type"] = "Partition"
-            DISKINFO[volume]["Partitions"] = []
-            DISKINFO[volume]["Vendor"] = "Linux"
-            DISKINFO[volume]["Product"] = "LVM Partition"
-            DISKINFO[volume]["Description"] = "LVM partition "+DISKINFO[volume]["LVName"] \
-                                              +" in volume group "+DISKINFO[volume]["VGName"]
-
-            DISKINFO[volume]["Flags"] = []
-            DISKINFO[volume]["FileSystem"] = get_lv_file_system(volume)
-            DISKINFO[volume]["Partitioning"] = "N/A"
-            DISKINFO[volume]["BootRecord"], DISKINFO[volume]["BootRecordStrings"] = get_boot_record(volume)
-            DISKINFO[volume]["ID"] = "dm-name-"+DISKINFO[volume]["VGName"]+"-" \
-                                     +DISKINFO[volume]["LVName"]
+            for major in values:
+                if isinstance(major, str) and not major.isdigit():
+                    if block_majors is None:
+                        block_majors = get_block_majors()
 
-        elif "LV UUID" in line:
-            DISKINFO[volume]["UUID"] = line.split()[-1]
+                    if major in block_majors:
+                        majors.add(block_majors[major])
 
-        elif "LV Size" in line:
-            DISKINFO[volume]["Capacity"] = ' '.join(line.split()[-2:])
+                else:
+                    majors.add(int(major))
 
-            #Workaround for weird bug where size is garbled.
-            if DISKINFO[volume]["Capacity"] == "<size":
-                DISKINFO[volume]["Capacity"] = "Unknown"
+            compiled_filter[key] = majors
 
-            DISKINFO[volume]["RawCapacity"] = "Unknown"
+        else:
+            compiled_filter[key] = tuple(str(value).lower() if key.endswith("_transports")
+                                         else str(value) for value in values)
 
-        elif "Physical volume" in line:
-            DISKINFO[volume]["HostPartition"] = line.split()[-1]
+    return compiled_filter
 
-            if DISKINFO[volume]["HostPartition"] in DISKINFO:
-                DISKINFO[volume]["HostDevice"] = DISKINFO[DISKINFO[volume]["HostPartition"]]["HostDevice"]
+def get_block_majors(path="/proc/devices"):
+    """
+    Private, implementation detail.
 
-            else:
-                DISKINFO[volume]["HostDevice"] = "Unknown"
+    This function reads the major numbers of the block device drivers
+    from /proc/devices.
 
-    #If there are any entries called "Unknown" (disks that we couldn't get the name for),
-    #remove them now to prevent issues.
+    Args:
+        path(="/proc/devices") (str):   Where to read them from.
+
+    Returns:
+        dict. Driver names mapped to major numbers, eg {"sd": 8, "loop": 7}.
+        The same major can be used by more than one driver (eg sd).
+
+    Usage:
+
+    >>> block_majors = get_block_majors()
+    """
+
+    block_majors = {}
+
+    try:
+        with open(path, encoding="utf-8", errors="replace") as devices:
+            #Skip past the character devices.
+            for line in devices:
+                if line.startswith("Block devices:"):
+                    break
+
+            for line in devices:
+                try:
+                    major, driver = line.split()
+                    block_majors.setdefault(driver, int(major))
+
+                except ValueError:
+                    continue
+
+    except OSError as err:
+        ERRORS.append("linux.get_block_majors(): Exception: "+str(err)+" while reading "+path+"\n")
+
+    return block_majors
+
+def is_excluded(disk, device_filter=None):
+    """
+    Private, implementation detail.
+
+    This function checks whether a device has been filtered out by the
+    device filter, or is a redundant path to a multipath device, so it
+    can be skipped before anything is done with it.
+
+    Args:
+        disk (str):                     The name of a device, eg /dev/sda.
+        device_filter(=None) (dict):    The filter to use, from get_device_filter().
+                                        DEVICE_FILTER is used if None.
+
+    Returns:
+        bool. True if it should be skipped, otherwise False.
+
+    Usage:
+
+    >>> if is_excluded(<aDiskName>):
+    >>>     ...
+    """
+
+    global DEVICE_FILTER
+
+    if device_filter is None:
+        if DEVICE_FILTER is None:
+            DEVICE_FILTER = get_device_filter()
+
+        device_filter = DEVICE_FILTER
+
+    #Match the kernel's name for the device, in case this is a link (eg /dev/cdrom).
+    name = os.path.basename(os.path.realpath(disk))
+
+    if "/dev/"+name in REDUNDANT_PATHS:
+        return True
+
+    if device_filter["include_names"] and \
+        not any(fnmatch.fnmatchcase(name, glob) for glob in device_filter["include_names"]):
+
+        return True
+
+    if any(fnmatch.fnmatchcase(name, glob) for glob in device_filter["exclude_names"]):
+        return True
+
+    if device_filter["include_majors"] or device_filter["exclude_majors"]:
+        major = get_major(name)
+
+        if device_filter["include_majors"] and major not in device_filter["include_majors"]:
+            return True
+
+        if major in device_filter["exclude_majors"]:
+            return True
+
+    if device_filter["include_transports"] or device_filter["exclude_transports"]:
+        transport = get_transport(name)
+
+        if device_filter["include_transports"] and \
+            transport not in device_filter["include_transports"]:
+
+            return True
+
+        if transport in device_filter["exclude_transports"]:
+            return True
+
+    return False
+
+def get_major(name):
+    """
+    Private, implementation detail.
+
+    This function gets a device's major number from sysfs.
+
+    Args:
+        name (str):   The kernel name of the device, eg sda.
+
+    Returns:
+        int. The major number, or None if it couldn't be found.
+
+    Usage:
+
+    >>> major = get_major(<aKernelName>)
+    """
+
+    try:
+        return int(read_sysfs_file(SYSFS+"/block/"+name+"/dev").split(":")[0])
+
+    except ValueError:
+        return None
+
+def get_transport(name):
+    """
+    Private, implementation detail.
+
+    This function works out which transport a device is connected with,
+    from where it is in sysfs's device tree.
+
+    Args:
+        name (str):   The kernel name of the device, eg sda.
+
+    Returns:
+        string. The transport:
+
+            - "Unknown"     - Couldn't work it out.
+            - Anything else - The transport, eg "nvme", "usb", "sata", "mmc",
+                              "virtio", or "scsi".
+
+    Usage:
+
+    >>> transport = get_transport(<aKernelName>)
+    """
+
+    parts = os.path.realpath(SYSFS+"/block/"+name).split("/")
+
+    #Look for the most specific bus first (eg USB disks also have SCSI hosts).
+    for transport, markers in (("nvme", ("nvme",)), ("usb", ("usb",)), ("mmc", ("mmc_host",)),
+                               ("sata", ("ata",)), ("virtio", ("virtio",)),
+                               ("scsi", ("host",))):
+
+        for part in parts:
+            if any(part == marker or (part.startswith(marker) and part[len(marker):].isdigit())
+                   for marker in markers):
+
+                return transport
+
+    return "Unknown"
+
+def get_included_devices():
+    """
+    Private, implementation detail.
+
+    This function lists the devices and partitions that the device
+    filter lets through, so that tools that would otherwise look at
+    every device (eg blkid) can be told which ones to look at.
+
+    Returns:
+        list. The devices and partitions (eg /dev/sda1), or None if the
+        filter doesn't exclude anything, or they couldn't be listed.
+
+    Usage:
+
+    >>> devices = get_included_devices()
+    """
+
+    try:
+        names = sorted(os.listdir(SYSFS+"/class/block"))
+
+    except OSError:
+        return None
+
+    devices = []
+    excluded = False
+
+    for name in names:
+        #Partitions go wherever their device goes.
+        if os.path.exists(SYSFS+"/class/block/"+name+"/partition"):
+            device = os.path.basename(os.path.dirname(os.path.realpath(SYSFS+"/class/block/"
+                                                                       + name)))
+
+        else:
+            device = name
+
+        #Don't let blkid or LVM wake up sleeping disks either.
+        if is_excluded("/dev/"+device) or is_sleeping("/dev/"+name):
+            excluded = True
+
+        else:
+            devices.append("/dev/"+name)
+
+    if not excluded:
+        return None
+
+    return devices
+
+def get_lvm_filter():
+    """
+    Private, implementation detail.
+
+    This function gets the options that stop lvs and pvs from reading
+    disks that are asleep, if probing is power-aware (see get_info()).
+    LVM reads the label of every device it can see, which would wake
+    them up.
+
+    Returns:
+        tuple. The options (empty if no disks are asleep), or None if
+        LVM shouldn't be run at all, because every device it could read
+        is asleep, or the devices couldn't be listed.
+
+    Usage:
+
+    >>> options = get_lvm_filter()
+    """
+
+    if not SLEEPING_DISKS:
+        return ()
+
+    devices = get_included_devices()
+
+    if not devices:
+        return None
+
+    options = ()
+
+    for device in devices:
+        options += ("--devices", device)
+
+    return options
+
+def get_lsblk_filter():
+    """
+    Private, implementation detail.
+
+    This function gets the lsblk options that make it skip the devices
+    the device filter excludes by major number.
+
+    Returns:
+        tuple. The options (empty if there are none).
+
+    Usage:
+
+    >>> options = get_lsblk_filter()
+    """
+
+    global DEVICE_FILTER
+
+    if DEVICE_FILTER is None:
+        DEVICE_FILTER = get_device_filter()
+
+    #lsblk can't do both at once, so leave the exclusions to is_excluded() if needed.
+    if DEVICE_FILTER["include_majors"]:
+        return ("-I", ",".join(str(major) for major in sorted(DEVICE_FILTER["include_majors"])))
+
+    #lsblk excludes RAM disks (major 1) by default, so keep doing that.
+    if DEVICE_FILTER["exclude_majors"]:
+        return ("-e", ",".join(str(major) for major
+                               in sorted(DEVICE_FILTER["exclude_majors"] | {1})))
+
+    return ()
+
+def get_lshw_command(lshw_profile="full"):
+    """
+    Private, implementation detail.
+
+    This function gets the lshw command to run for the given profile.
+
+    Args:
+        lshw_profile(="full") (str):    The profile. See get_info().
+
+    Returns:
+        tuple. The command.
+
+    Usage:
+
+    >>> command = get_lshw_command()
+
+    OR:
+
+    >>> command = get_lshw_command(<aProfileName>)
+    """
+
+    command = LSHW_COMMAND
+
+    for test in LSHW_PROFILES[lshw_profile]:
+        command += ("-disable", test)
+
+    return command
+
+def start_commands(commands):
+    """
+    Private, implementation detail.
+
+    This function starts running some commands at the same time, in the
+    background, and returns straight away. Each command runs in its own
+    thread, so its output is read as it is produced. If probes are being
+    watched, commands are killed if they take longer than PROBE_TIMEOUT.
+
+    Args:
+        commands (dict):    The commands to run, eg {"lsblk": ("lsblk", "-J")}.
+
+    Returns:
+        dict. The same keys, mapped to futures. Use finish_command() to
+        wait for each command.
+
+    Usage:
+
+    >>> futures = start_commands(<aDict>)
+    """
+
+    env = os.environ.copy()
+    env["LC_ALL"] = "C"
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(commands))
+
+    futures = {}
+
+    for name, command in commands.items():
+        futures[name] = executor.submit(subprocess.run, list(command), stdout=subprocess.PIPE,
+                                        stderr=subprocess.PIPE, check=False, env=env,
+                                        timeout=PROBE_TIMEOUT)
+
+    #The commands keep running, but the threads will exit once they're done.
+    executor.shutdown(wait=False)
+
+    return futures
+
+def watch_process(process, name):
+    """
+    Private, implementation detail.
+
+    This function kills a command whose output is being read as it runs
+    (eg lshw), if it takes longer than PROBE_TIMEOUT, so that reading its
+    output doesn't block forever.
+
+    Args:
+        process (subprocess.Popen):     The command.
+        name (str):                     Its name, for the error message.
+
+    Returns:
+        threading.Timer. The watchdog (cancel it once the command has
+        finished), or None if probes aren't being watched.
+
+    Usage:
+
+    >>> watchdog = watch_process(<aPopenObject>, <aName>)
+    """
+
+    if PROBE_TIMEOUT is None:
+        return None
+
+    def kill_process():
+        ERRORS.append("linux.get_info(): "+name+" timed out after "+str(PROBE_TIMEOUT)
+                      + " seconds\n")
+
+        process.kill()
+
+    watchdog = threading.Timer(PROBE_TIMEOUT, kill_process)
+    watchdog.daemon = True
+    watchdog.start()
+
+    return watchdog
+
+def finish_command(future, ok_statuses=(0,)):
+    """
+    Private, implementation detail.
+
+    This function waits for a command started by start_commands() to
+    finish, and returns the result like subprocess.run() does.
+
+    Args:
+        future (Future):                The command's future.
+        ok_statuses(=(0,)) (tuple):     The exit statuses that don't mean failure.
+
+    Returns:
+        subprocess.CompletedProcess. The result.
+
+    Raises:
+        OSError, if the command couldn't be run.
+        subprocess.CalledProcessError, if it exited with any other status.
+        subprocess.SubprocessError, if it took longer than PROBE_TIMEOUT.
+
+    Usage:
+
+    >>> cmd = finish_command(<aFuture>)
+
+    OR:
+
+    >>> cmd = finish_command(<aFuture>, ok_statuses=<aTuple>)
+    """
+
+    #If the command can't be killed (eg it is stuck in uninterruptible sleep), give up on it.
+    try:
+        cmd = future.result(timeout=PROBE_TIMEOUT)
+
+    except concurrent.futures.TimeoutError:
+        raise subprocess.SubprocessError("Timed out after "+str(PROBE_TIMEOUT)+" seconds") \
+        from None
+
+    if cmd.returncode not in ok_statuses:
+        raise subprocess.CalledProcessError(cmd.returncode, cmd.args, cmd.stdout, cmd.stderr)
+
+    return cmd
+
+class LshwNode:
+    """
+    Private, implementation detail.
+
+    This class wraps an element from lshw's XML output, as parsed by
+    lxml, so that get_vendor(), get_capacity() and friends can read it
+    the same way they read BeautifulSoup's nodes:
+
+        - node.<tag>        The first descendant called <tag>, or None.
+        - node.string       The element's text, or None.
+        - node.name         The element's tag.
+        - node.children     The child elements.
+        - node[<attr>]      The value of an attribute.
+
+    Usage:
+
+    >>> node = LshwNode(<anElement>)
+    """
+
+    __slots__ = ("element",)
+
+    def __init__(self, element):
+        self.element = element
+
+    def __getattr__(self, name):
+        element = self.element.find(".//"+name)
+
+        if element is None:
+            return None
+
+        return LshwNode(element)
+
+    def __getitem__(self, key):
+        return self.element.attrib[key]
+
+    @property
+    def string(self):
+        """The element's text, or None."""
+        return self.element.text
+
+    @property
+    def name(self):
+        """The element's tag."""
+        return self.element.tag
+
+    @property
+    def children(self):
+        """The child elements (not comments)."""
+        return [LshwNode(child) for child in self.element if isinstance(child.tag, str)]
+
+def parse_lshw_output(stdout):
+    """
+    Private, implementation detail.
+
+    This function finds the devices and partitions in lshw's XML
+    output, and adds them to the disk info dictionary.
+
+    The output is parsed as it is read, so if it comes from lshw's pipe,
+    each device is processed as soon as lshw has finished writing it out.
+    Each device's XML is thrown away once it has been processed.
+
+    Args:
+        stdout (bytes or file):     lshw's output, or a binary file object
+                                    (eg lshw's pipe) to read it from.
+
+    Raises:
+        RuntimeError, if lshw didn't find any disks.
+
+    Usage:
+
+    >>> parse_lshw_output(<lshwOutput>)
+    """
+
+    if isinstance(stdout, str):
+        stdout = stdout.encode("utf-8")
+
+    if isinstance(stdout, bytes):
+        stdout = io.BytesIO(stdout)
+
+    parser = etree.XMLPullParser(events=("start", "end"), recover=True, huge_tree=True)
+    root = None
+    finished = False
+
+    try:
+        for chunk in iter(lambda: stdout.read1(65536), b""):
+            parser.feed(chunk)
+
+            for event, element in parser.read_events():
+                if root is None:
+                    root = element
+
+                if event == "end" and element is root:
+                    finished = True
+
+                #Only look at devices once they, and all their partitions, have been read.
+                if event != "end" or element.tag != "node" or element.getparent() is not root \
+                    or root.tag != "list":
+
+                    continue
+
+                #These are devices.
+                host_disk = get_device_info(LshwNode(element))
+
+                #Get the info of any partitions and sub-partitions (logical partitions)
+                #these devices contain.
+                for subelement in LSHW_PARTITIONS_XPATH(element):
+                    get_partition_info(LshwNode(subelement), host_disk)
+
+                #We don't need this device's XML any more.
+                root.remove(element)
+
+        parser.close()
+
+    except etree.XMLSyntaxError as err:
+        ERRORS.append("linux.parse_lshw_output(): lshw output is not valid XML: "+str(err)+"\n")
+
+    #The parser recovers from truncated output, so check it all arrived (eg lshw was killed).
+    if root is not None and not finished:
+        ERRORS.append("linux.parse_lshw_output(): lshw output ended early, so some disks "
+                      + "may be missing\n")
+
+    if root is None or root.tag != "list":
+        ERRORS.append("linux.get_info(): No disks found!\n")
+        raise RuntimeError("No disks found!")
+
+def queue_probe(disk, keys, function, *args):
+    """
+    Private, implementation detail.
+
+    This function runs a (potentially slow) per-device probe, and stores
+    its result in the disk info dictionary. If an executor has been set up
+    by get_info(), or probes are being watched, the probe is submitted to
+    the executor or the watched workers, and the result is stored later by
+    collect_probes(). Otherwise, it is run straight away.
+
+    Args:
+        disk (str):             The name of a partition/device in the
+                                disk info dictionary.
+
+        keys (str/tuple):       The key to store the result under, or
+                                a tuple of keys if the probe returns a
+                                tuple of results.
+
+        function:               The probe function to run.
+
+        *args:                  Arguments for the probe function.
+
+    Usage:
+
+    >>> queue_probe(<aDiskName>, "FileSystem", get_lv_file_system, <aDiskName>)
+    """
+
+    if PROBE_TIMEOUT is not None:
+        future = submit_watched_probe(disk, function, *args)
+
+    elif PROBE_EXECUTOR is not None:
+        future = PROBE_EXECUTOR.submit(function, *args)
+
+    else:
+        store_probe_result(disk, keys, function(*args))
+        return
+
+    #Reserve the keys now so the dictionary's layout matches the serial path.
+    for key in ((keys,) if isinstance(keys, str) else keys):
+        DISKINFO[disk][key] = None
+
+    PENDING_PROBES.append((disk, keys, future))
+
+def store_probe_result(disk, keys, result):
+    """
+    Private, implementation detail.
+
+    This function stores the result of a per-device probe in the disk
+    info dictionary.
+
+    Args:
+        disk (str):             The name of a partition/device in the
+                                disk info dictionary.
+
+        keys (str/tuple):       The key or keys to store the result under.
+
+        result:                 The result of the probe.
+
+    Usage:
+
+    >>> store_probe_result(<aDiskName>, "FileSystem", <aResult>)
+    """
+
+    if isinstance(keys, str):
+        DISKINFO[disk][keys] = result
+        return
+
+    for key, value in zip(keys, result):
+        DISKINFO[disk][key] = value
+
+def collect_probes():
+    """
+    Private, implementation detail.
+
+    This function waits for any probes submitted by queue_probe(), and
+    stores their results in the disk info dictionary. If probes are being
+    watched, each one is given PROBE_TIMEOUT seconds from when it started.
+    Probes that take longer, and the rest of their device's probes, are
+    abandoned, and their results are "Timed out".
+
+    Usage:
+
+    >>> collect_probes()
+    """
+
+    while PENDING_PROBES:
+        disk, keys, future = PENDING_PROBES.popleft()
+
+        if PROBE_TIMEOUT is None:
+            store_probe_result(disk, keys, future.result())
+            continue
+
+        try:
+            result = wait_for_watched_probe(future)
+
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+
+            ERRORS.append("linux.collect_probes(): Probe timed out after "+str(PROBE_TIMEOUT)
+                          + " seconds while probing "+disk+"\n")
+
+            #Keep lists of strings (eg BootRecordStrings) as lists.
+            if isinstance(keys, str):
+                result = "Timed out"
+
+            else:
+                result = tuple(["Timed out"] if key.endswith("Strings") else "Timed out"
+                               for key in keys)
+
+        store_probe_result(disk, keys, result)
+
+def wait_for_watched_probe(future):
+    """
+    Private, implementation detail.
+
+    This function waits for a watched probe to finish. It is given
+    PROBE_TIMEOUT seconds from when it started. While it is waiting to
+    start, other probes that have run out of time are found (see
+    find_hung_probes()), so it isn't stuck behind them.
+
+    Args:
+        future (Future):    The probe's future.
+
+    Returns:
+        The probe's result.
+
+    Raises:
+        concurrent.futures.TimeoutError, if the probe, or another probe for
+        the same device, ran out of time.
+
+    Usage:
+
+    >>> result = wait_for_watched_probe(<aFuture>)
+    """
+
+    while True:
+        find_hung_probes()
+
+        #Probes are cancelled if their device hung before they started.
+        if future.cancelled():
+            raise concurrent.futures.TimeoutError
+
+        if future.done():
+            return future.result()
+
+        #If its device has hung, this probe would hang too.
+        if future in HUNG_PROBES or PROBE_DEVICES.get(future) in HUNG_DEVICES:
+            raise concurrent.futures.TimeoutError
+
+        started = PROBE_START_TIMES.get(future)
+
+        if started is None:
+            #Check again soon, in case the workers are all stuck.
+            timeout = min(PROBE_TIMEOUT, 0.1)
+
+        else:
+            timeout = max(0, started + PROBE_TIMEOUT - time.monotonic())
+
+        concurrent.futures.wait([future], timeout=timeout)
+
+def find_hung_probes():
+    """
+    Private, implementation detail.
+
+    This function finds probes that have been running for longer than
+    PROBE_TIMEOUT, and marks them and their devices as hung. A new worker
+    is started for each one, so there are always PROBE_MAX_WORKERS workers
+    that aren't stuck.
+
+    Usage:
+
+    >>> find_hung_probes()
+    """
+
+    now = time.monotonic()
+
+    for future, started in list(PROBE_START_TIMES.items()):
+        if future.done() or future in HUNG_PROBES or now < started + PROBE_TIMEOUT:
+            continue
+
+        HUNG_PROBES.add(future)
+        HUNG_DEVICES.add(PROBE_DEVICES.get(future))
+
+        if PROBE_QUEUE is not None:
+            start_probe_worker()
+
+def get_probe_device(disk):
+    """
+    Private, implementation detail.
+
+    This function gets the device a probe for a partition/device is really
+    for, if probes are being watched. If a device hangs, so will probes for
+    its partitions, so they aren't waited for.
+
+    Args:
+        disk (str):     The name of a partition/device in the disk info
+                        dictionary.
+
+    Returns:
+        string. The name of the device.
+
+    Usage:
+
+    >>> device = get_probe_device(<aDiskName>)
+    """
+
+    host_disk = DISKINFO.get(disk, {}).get("HostDevice", "N/A")
+
+    if host_disk in (None, "N/A", "Unknown"):
+        return disk
+
+    return host_disk
+
+def submit_watched_probe(disk, function, *args):
+    """
+    Private, implementation detail.
+
+    This function submits a probe to the watched workers (starting
+    PROBE_MAX_WORKERS of them if needed). The workers are daemon threads,
+    so one that is stuck (eg on a device in uninterruptible sleep) can be
+    abandoned. The caller's executor is never used, because it couldn't
+    be shut down while one of its threads was stuck.
+
+    Args:
+        disk (str):             The name of a partition/device in the
+                                disk info dictionary.
+
+        function:               The probe function to run.
+
+        *args:                  Arguments for the probe function.
+
+    Returns:
+        concurrent.futures.Future. The probe's future.
+
+    Usage:
+
+    >>> future = submit_watched_probe(<aDiskName>, get_boot_record, <aDiskName>)
+    """
+
+    global PROBE_QUEUE
+
+    future = concurrent.futures.Future()
+    PROBE_DEVICES[future] = get_probe_device(disk)
+
+    if PROBE_QUEUE is None:
+        PROBE_QUEUE = queue.Queue()
+
+        while PROBE_WORKER_COUNT < PROBE_MAX_WORKERS:
+            start_probe_worker()
+
+    PROBE_QUEUE.put((future, function, args))
+
+    return future
+
+def start_probe_worker():
+    """
+    Private, implementation detail.
+
+    This function starts a worker thread to run watched probes.
+
+    Usage:
+
+    >>> start_probe_worker()
+    """
+
+    global PROBE_WORKER_COUNT
+
+    PROBE_WORKER_COUNT += 1
+
+    #Daemon threads don't stop Python from exiting if they never finish.
+    threading.Thread(target=run_watched_probes, args=(PROBE_QUEUE,),
+                     name="getdevinfo probes "+str(PROBE_WORKER_COUNT), daemon=True).start()
+
+def run_watched_probes(probes):
+    """
+    Private, implementation detail.
+
+    This function is a worker. It runs probes one at a time, until it is
+    given None.
+
+    Args:
+        probes (queue.Queue):   The probes, as (future, function, args).
+
+    Usage:
+
+    >>> run_watched_probes(<aQueue>)
+    """
+
+    for future, function, args in iter(probes.get, None):
+        run_watched_probe(future, function, args)
+
+def run_watched_probe(future, function, args):
+    """
+    Private, implementation detail.
+
+    This function runs a watched probe, unless it has been abandoned or its
+    device has hung, and records when it started.
+
+    Args:
+        future (Future):    The probe's future.
+        function:           The probe function to run.
+        args (tuple):       Arguments for the probe function.
+
+    Usage:
+
+    >>> run_watched_probe(<aFuture>, get_boot_record, (<aDiskName>,))
+    """
+
+    if PROBE_DEVICES.get(future) in HUNG_DEVICES:
+        future.cancel()
+
+    #Skip probes that were abandoned before they started.
+    if not future.set_running_or_notify_cancel():
+        return
+
+    PROBE_START_TIMES[future] = time.monotonic()
+
+    try:
+        future.set_result(function(*args))
+
+    except Exception as err:
+        future.set_exception(err)
+
+def stop_probe_workers():
+    """
+    Private, implementation detail.
+
+    This function tells the probe workers to finish. Workers that are stuck
+    are abandoned, and finish when (and if) their device responds.
+
+    Usage:
+
+    >>> stop_probe_workers()
+    """
+
+    global PROBE_QUEUE
+    global PROBE_WORKER_COUNT
+
+    #Tell each worker to finish.
+    while PROBE_QUEUE is not None and PROBE_WORKER_COUNT:
+        PROBE_QUEUE.put(None)
+        PROBE_WORKER_COUNT -= 1
+
+    PROBE_QUEUE = None
+    PROBE_WORKER_COUNT = 0
+    PROBE_DEVICES.clear()
+    PROBE_START_TIMES.clear()
+    HUNG_PROBES.clear()
+    HUNG_DEVICES.clear()
+
+def get_device_info(node):
+    """
+    Private, implementation detail.
+
+    This function gathers and assembles information for devices (whole disks).
+    It employs some simple logic and the other functions defined in this
+    module to do its work.
+
+    Args:
+        node:       A "node" representing a device, generated from lshw's XML
+                    output.
+
+    Returns:
+        string.     The name of the device.
+
+    Usage:
+
+    >>> host_disk = get_device_info(<aNode>)
+    """
+
+    if isinstance(node.logicalname.string, bytes):
+        host_disk = node.logicalname.string.decode("utf-8") #NOTE: is this ever bytes?
+
+    else:
+        host_disk = node.logicalname.string
+
+    #Ignore devices that have been filtered out (loop, zram, and nbd devices by default).
+    if is_excluded(host_disk):
+        return host_disk
+
+    DISKINFO[host_disk] = {}
+    DISKINFO[host_disk]["Name"] = host_disk
+    DISKINFO[host_disk]["Type"] = "Device"
+    DISKINFO[host_disk]["HostDevice"] = "N/A"
+    DISKINFO[host_disk]["Partitions"] = []
+    DISKINFO[host_disk]["Vendor"] = get_vendor(node)
+    DISKINFO[host_disk]["Product"] = get_product(node)
+
+    #Fall back to udev's database if lshw didn't find them.
+    if DISKINFO[host_disk]["Vendor"] == "Unknown":
+        DISKINFO[host_disk]["Vendor"] = get_udev_property(host_disk, "ID_VENDOR")
+
+    if DISKINFO[host_disk]["Product"] == "Unknown":
+        DISKINFO[host_disk]["Product"] = get_udev_property(host_disk, "ID_MODEL")
+
+    #Ignore capacities for all optical media.
+    if "/dev/cdrom" in host_disk or "/dev/sr" in host_disk or "/dev/dvd" in host_disk:
+        DISKINFO[host_disk]["RawCapacity"], DISKINFO[host_disk]["Capacity"] = ("N/A", "N/A")
+
+    else:
+        DISKINFO[host_disk]["RawCapacity"], DISKINFO[host_disk]["Capacity"] = get_capacity(node)
+
+    if isinstance(node.description.string, bytes):
+        #NOTE: is this ever bytes?
+        DISKINFO[host_disk]["Description"] = node.description.string.decode("utf-8")
+
+    else:
+        DISKINFO[host_disk]["Description"] = node.description.string
+
+    DISKINFO[host_disk]["Flags"] = get_capabilities(node)
+
+    #Don't open removable devices with no media in them.
+    no_media = has_no_media(host_disk)
+
+    if no_media:
+        DISKINFO[host_disk]["Partitioning"] = "No media"
+
+    else:
+        queue_probe(host_disk, "Partitioning", get_partitioning, host_disk)
+
+    DISKINFO[host_disk]["FileSystem"] = "N/A"
+    DISKINFO[host_disk]["UUID"] = "N/A"
+    DISKINFO[host_disk]["ID"] = get_id(host_disk)
+    DISKINFO[host_disk]["Label"] = "N/A"
+    DISKINFO[host_disk]["PartUUID"] = "N/A"
+    DISKINFO[host_disk]["Path"] = get_path(host_disk)
+
+    #Don't try to get Boot Records for optical drives, or devices with no media.
+    if no_media:
+        DISKINFO[host_disk]["BootRecord"], DISKINFO[host_disk]["BootRecordStrings"] = \
+        ("No media", ["No media"])
+
+    elif "/dev/cdrom" in host_disk or "/dev/sr" in host_disk or "/dev/dvd" in host_disk:
+        DISKINFO[host_disk]["BootRecord"], DISKINFO[host_disk]["BootRecordStrings"] = \
+        ("N/A", ["N/A"])
+
+    else:
+        queue_probe(host_disk, ("BootRecord", "BootRecordStrings"), get_boot_record, host_disk)
+
+    return host_disk
+
+def get_partition_info(subnode, host_disk):
+    """
+    Private, implementation detail.
+
+    This function gathers and assembles information for partitions.
+    It employs some simple logic and the other functions defined in this
+    module to do its work.
+
+    Args:
+        subnode:            A "node" representing a partition, generated
+                            from lshw's XML output.
+
+        host_disk (str):    The "parent" or "host" device. eg: for
+                            /dev/sda1, the host disk would be /dev/sda.
+                            Used to organise everything nicely in the
+                            disk info dictionary.
+
+    Returns:
+        string.     The name of the partition.
+
+    Usage:
+
+    >>> volume = get_device_info(<aNode>)
+    """
+
+    try:
+        if isinstance(subnode.logicalname.string, bytes):
+            #NOTE: is this ever bytes?
+            volume = subnode.logicalname.string.decode("utf-8")
+
+        else:
+            volume = subnode.logicalname.string
+
+    except AttributeError:
+        if isinstance(subnode.physid.string, bytes):
+            #NOTE: is this ever bytes?
+            if "nvme" in host_disk:
+                volume = host_disk+"p"+subnode.physid.string.decode("utf-8")
+
+            else:
+                volume = host_disk+subnode.physid.string.decode("utf-8")
+
+        else:
+            if "nvme" in host_disk:
+                volume = host_disk+"p"+subnode.physid.string
+
+            else:
+                volume = host_disk+subnode.physid.string
+
+    #Fix bug on Pmagic, if the volume already exists in DISKINFO,
+    #or if it is an optical drive, ignore it here.
+    if volume in DISKINFO or "/dev/cdrom" in volume or "/dev/sr" in volume \
+        or "/dev/dvd" in volume:
+
+        return None
+
+    #Ignore partitions on devices that have been filtered out.
+    if host_disk not in DISKINFO:
+        return None
+
+    DISKINFO[volume] = {}
+    DISKINFO[volume]["Name"] = volume
+    DISKINFO[volume]["Type"] = "Partition"
+    DISKINFO[volume]["HostDevice"] = host_disk
+    DISKINFO[volume]["Partitions"] = []
+    DISKINFO[host_disk]["Partitions"].append(volume)
+    DISKINFO[volume]["Vendor"] = get_vendor(subnode)
+    DISKINFO[volume]["Product"] = "Host Device: "+DISKINFO[host_disk]["Product"]
+    DISKINFO[volume]["RawCapacity"], DISKINFO[volume]["Capacity"] = get_capacity(subnode)
+
+    if isinstance(subnode.description.string, bytes):
+        #NOTE: is this ever bytes?
+        DISKINFO[volume]["Description"] = subnode.description.string.decode("utf-8")
+
+    else:
+        DISKINFO[volume]["Description"] = subnode.description.string
+
+    DISKINFO[volume]["Flags"] = get_capabilities(subnode)
+
+    #Fx bug: don't try to get file systems of extended partitions.
+    if "extended" in DISKINFO[volume]["Flags"]:
+        DISKINFO[volume]["FileSystem"] = "N/A"
+
+    else:
+        #Read lshw's answer now, because the XML is freed while the probes are
+        #running, and lxml trees can't be read in one thread while another one
+        #changes them. Only the fallback (which reads the disk) is queued.
+        file_system = get_lshw_file_system(subnode)
+
+        if file_system != "Unknown" or subnode.logicalname is None:
+            DISKINFO[volume]["FileSystem"] = file_system
+
+        else:
+            queue_probe(volume, "FileSystem", get_lv_file_system, volume)
+
+    DISKINFO[volume]["Partitioning"] = "N/A"
+    queue_probe(volume, "UUID", get_uuid, volume)
+    DISKINFO[volume]["ID"] = get_id(volume)
+    queue_probe(volume, "Label", get_label, volume)
+    DISKINFO[volume]["PartUUID"] = get_partuuid(volume)
+    DISKINFO[volume]["Path"] = get_path(volume)
+    queue_probe(volume, ("BootRecord", "BootRecordStrings"), get_boot_record, volume)
+
+    return volume
+
+def parse_lvm_output(lines=None, testing=False):
+    """
+    Private, implementation detail.
+
+    This function is used to get LVM partition information from the
+    output of lvdisplay --maps. The output is read once, line by line,
+    so it can come straight from lvdisplay's pipe, and each logical volume
+    is assembled as soon as all of its lines have been read.
+
+    Args:
+        lines(=None) (iterable):    The lines of lvdisplay's output.
+                                    Uses LVMOUTPUT if None.
+
+        testing(=False) (bool):     Used during unit tests.
+
+    Usage:
+
+    >>> parse_lvm_output()
+
+    OR:
+
+    >>> parse_lvm_output(lines=<someLines>, testing=<aBool>)
+    """
+
+    if lines is None:
+        lines = LVMOUTPUT
+
+    #The lines for the logical volume we are reading (None before the first one).
+    raw_lvm_info = None
+
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+
+        if "--- Logical volume ---" in line:
+            #We've got everything for the previous volume.
+            if raw_lvm_info is not None:
+                assemble_lvm_disk_info(raw_lvm_info, testing=testing)
+
+            raw_lvm_info = []
+
+        elif raw_lvm_info is not None:
+            raw_lvm_info.append(line.replace("'", "").rstrip("\n"))
+
+    if raw_lvm_info is not None:
+        assemble_lvm_disk_info(raw_lvm_info, testing=testing)
+
+def assemble_lvm_disk_info(raw_lvm_info, testing=False):
+    """
+    Private, implementation detail.
+
+    This function is used to assemble LVM disk info into the dictionary.
+
+    Like get_device_info(), and get_partition_info(), it uses some of the
+    helper functions here.
+
+    Args:
+        raw_lvm_info (list):    The lines of lvdisplay's output for a
+                                particular logical volume.
+
+        testing(=False) (bool): Used during unit tests.
+
+    Usage:
+
+    >>> assemble_lvm_disk_info(<aList>)
+
+    OR:
+
+    >>> assemble_lvm_disk_info(<aList>, testing=<aBool>)
+    """
+
+    #Start assembling the entry.
+    for line in raw_lvm_info:
+        if "LV Path" in line:
+            #Get the volume name and a list of aliases it has.
+            if testing is False:
+                volume, alias_list = get_lv_aliases(line)
+
+            else:
+                #Get them from the test data, overriding the check to see if they exist.
+                volume, alias_list = get_lv_aliases_test(line) #pylint: disable=undefined-variable
+
+            vg_name, lv_name = get_lv_and_vg_name(volume)
+            add_lvm_volume(volume, alias_list, vg_name, lv_name)
+
+        elif "LV UUID" in line:
+            DISKINFO[volume]["UUID"] = line.split()[-1]
+
+        elif "LV Size" in line:
+            DISKINFO[volume]["Capacity"] = ' '.join(line.split()[-2:])
+
+            #Workaround for weird bug where size is garbled.
+            if DISKINFO[volume]["Capacity"] == "<size":
+                DISKINFO[volume]["Capacity"] = "Unknown"
+
+            DISKINFO[volume]["RawCapacity"] = "Unknown"
+
+        elif "Physical volume" in line:
+            set_lvm_host(volume, line.split()[-1])
+
+    #If there are any entries called "Unknown" (disks that we couldn't get the name for),
+    #remove them now to prevent issues.
     if "Unknown" in DISKINFO:
         DISKINFO.pop("Unknown")
 
-def parse_lsblk_output():
+def add_lvm_volume(volume, alias_list, vg_name, lv_name):
+    """
+    Private, implementation detail.
+
+    This function adds the parts of a logical volume's entry that don't
+    depend on where the information came from (lvdisplay or lvs), and
+    queues its probes.
+
+    Args:
+        volume (str):       The logical volume's name (eg /dev/mapper/fedora-root).
+        alias_list (list):  The logical volume's aliases.
+        vg_name (str):      The name of the volume group.
+        lv_name (str):      The name of the logical volume.
+
+    Usage:
+
+    >>> add_lvm_volume(<aVolume>, <aList>, <aVGName>, <anLVName>)
+    """
+
+    DISKINFO[volume] = {}
+    DISKINFO[volume]["Name"] = volume
+    DISKINFO[volume]["Aliases"] = alias_list
+    DISKINFO[volume]["VGName"] = vg_name
+    DISKINFO[volume]["LVName"] = lv_name
+    DISKINFO[volume]["Type"] = "Partition"
+    DISKINFO[volume]["Partitions"] = []
+    DISKINFO[volume]["Vendor"] = "Linux"
+    DISKINFO[volume]["Product"] = "LVM Partition"
+    DISKINFO[volume]["Description"] = "LVM partition "+lv_name+" in volume group "+vg_name
+    DISKINFO[volume]["Flags"] = []
+    queue_probe(volume, "FileSystem", get_lv_file_system, volume)
+    DISKINFO[volume]["Partitioning"] = "N/A"
+    queue_probe(volume, ("BootRecord", "BootRecordStrings"), get_boot_record, volume)
+    DISKINFO[volume]["ID"] = "dm-name-"+vg_name+"-"+lv_name
+
+def set_lvm_host(volume, host_partition):
+    """
+    Private, implementation detail.
+
+    This function records the physical volume a logical volume lives on,
+    and the device that holds that physical volume.
+
+    Args:
+        volume (str):           The logical volume's name.
+        host_partition (str):   The physical volume (eg /dev/sda3).
+
+    Usage:
+
+    >>> set_lvm_host(<aVolume>, <aPhysicalVolume>)
+    """
+
+    DISKINFO[volume]["HostPartition"] = host_partition
+
+    if host_partition in DISKINFO:
+        DISKINFO[volume]["HostDevice"] = DISKINFO[host_partition]["HostDevice"]
+
+    else:
+        DISKINFO[volume]["HostDevice"] = "Unknown"
+
+def get_lvm_report(futures=None):
+    """
+    Private, implementation detail.
+
+    This function gets LVM's JSON reports for the logical volumes and
+    physical volumes, using lvs and pvs. Sizes are reported in bytes.
+
+    Args:
+        futures(=None) (tuple):     lvs and pvs, if they have already been
+                                    started with start_commands(). They
+                                    are run here if None.
+
+    Returns:
+        tuple (dict, dict). The reports (lvs_report, pvs_report), or None
+        if they couldn't be obtained (eg lvm2 is too old to support
+        --reportformat json).
+
+    Usage:
+
+    >>> reports = get_lvm_report()
+
+    OR:
+
+    >>> reports = get_lvm_report(futures=(<anLVSFuture>, <aPVSFuture>))
+    """
+
+    if futures is None:
+        commands = start_commands({"lvs": LVS_COMMAND, "pvs": PVS_COMMAND})
+        futures = (commands["lvs"], commands["pvs"])
+
+    reports = []
+
+    for future in futures:
+        try:
+            output = finish_command(future).stdout
+            reports.append(json.loads(output.decode("utf-8", errors="replace")))
+
+        except (OSError, subprocess.SubprocessError, ValueError):
+            return None
+
+    return tuple(reports)
+
+def parse_lvm_report(lvs_report, pvs_report):
+    """
+    Private, implementation detail.
+
+    This function is used to get LVM partition information from lvs's
+    and pvs's JSON reports. Unlike lvdisplay's output, this includes
+    the exact size of each logical volume.
+
+    Args:
+        lvs_report (dict):      The decoded output of lvs --reportformat json.
+        pvs_report (dict):      The decoded output of pvs --reportformat json.
+
+    Usage:
+
+    >>> parse_lvm_report(<anLVSReport>, <aPVSReport>)
+    """
+
+    #Find the physical volumes in each volume group, in case lvs doesn't list an LV's devices.
+    physical_volumes = {}
+
+    for report in pvs_report["report"]:
+        for physical_volume in report.get("pv", []):
+            physical_volumes.setdefault(physical_volume["vg_name"], []) \
+                .append(physical_volume["pv_name"])
+
+    for report in lvs_report["report"]:
+        for logical_volume in report.get("lv", []):
+            #Hidden and internal volumes (eg thin pools) don't have a path.
+            if not logical_volume["lv_path"]:
+                continue
+
+            alias_list = [alias for alias in (logical_volume["lv_dm_path"],
+                                              logical_volume["lv_path"]) if alias]
+
+            volume = alias_list[0]
+
+            #lvs reports a row for each segment of the volume, so we might have seen it already.
+            if volume in DISKINFO:
+                continue
+
+            add_lvm_volume(volume, alias_list, logical_volume["vg_name"],
+                           logical_volume["lv_name"])
+
+            DISKINFO[volume]["UUID"] = logical_volume["lv_uuid"]
+            DISKINFO[volume]["RawCapacity"] = logical_volume["lv_size"]
+            DISKINFO[volume]["Capacity"] = get_human_readable_size(logical_volume["lv_size"])
+
+            #Devices look like /dev/sda3(0),/dev/sdb1(0) (extent numbers in brackets).
+            devices = logical_volume["devices"].split(",")[0].split("(")[0]
+
+            if not devices:
+                devices = physical_volumes.get(logical_volume["vg_name"], ["Unknown"])[0]
+
+            set_lvm_host(volume, devices)
+
+def get_nvme_info():
+    """
+    **Public**
+
+    .. note:
+        It is perfectly safe to use this. It only reads small files
+        in sysfs, so it is fast, and doesn't need nvme-cli or lshw.
+
+    This function describes the NVMe controllers in /sys/class/nvme, and
+    the namespaces behind them. If native NVMe multipath is used, each
+    namespace (eg /dev/nvme0n1) can be reached through more than one
+    controller, and the controller's paths to it (eg nvme0c0n1) are listed
+    too. Subsystems are found in /sys/class/nvme-subsystem.
+
+    Returns:
+        dict. Each controller (eg /dev/nvme0), mapped to a dictionary:
+
+            - "Name"            - The controller, eg /dev/nvme0.
+            - "Model"           - The model.
+            - "Serial"          - The serial number.
+            - "Firmware"        - The firmware revision.
+            - "Transport"       - eg "pcie", "tcp", "rdma", "fc", "loop".
+            - "Address"         - The controller's address (eg its PCI address).
+            - "State"           - eg "live".
+            - "QueueCount"      - The number of I/O queues (an int), or "Unknown".
+            - "Subsystem"       - The subsystem, eg "nvme-subsys0", or "Unknown".
+            - "SubsystemNQN"    - The subsystem's NVMe Qualified Name.
+            - "Namespaces"      - The namespaces behind the controller, eg ["/dev/nvme0n1"].
+            - "Paths"           - The multipath paths through this controller,
+                                  eg ["nvme0c0n1"]. Empty without multipath.
+
+        Any of the strings can be "Unknown" if they couldn't be read.
+
+    Usage:
+
+    >>> nvme_info = get_nvme_info()
+    """
+
+    try:
+        controllers = sorted(os.listdir(SYSFS+"/class/nvme"))
+
+    except OSError:
+        #No NVMe controllers.
+        return {}
+
+    #Find each controller's subsystem.
+    subsystems = {}
+
+    try:
+        for subsystem in sorted(os.listdir(SYSFS+"/class/nvme-subsystem")):
+            for entry in os.listdir(SYSFS+"/class/nvme-subsystem/"+subsystem):
+                if entry in controllers:
+                    subsystems[entry] = subsystem
+
+    except OSError:
+        pass
+
+    nvme_info = {}
+
+    for controller in controllers:
+        path = SYSFS+"/class/nvme/"+controller
+        subsystem = subsystems.get(controller, "Unknown")
+
+        info = {}
+        info["Name"] = "/dev/"+controller
+        info["Model"] = read_sysfs_file(path+"/model")
+        info["Serial"] = read_sysfs_file(path+"/serial")
+        info["Firmware"] = read_sysfs_file(path+"/firmware_rev")
+        info["Transport"] = read_sysfs_file(path+"/transport")
+        info["Address"] = read_sysfs_file(path+"/address")
+        info["State"] = read_sysfs_file(path+"/state")
+        info["QueueCount"] = read_sysfs_file(path+"/queue_count")
+
+        if info["QueueCount"].isdigit():
+            info["QueueCount"] = int(info["QueueCount"])
+
+        info["Subsystem"] = subsystem
+        info["SubsystemNQN"] = read_sysfs_file(path+"/subsysnqn")
+        info["Namespaces"] = []
+        info["Paths"] = []
+
+        try:
+            entries = sorted(os.listdir(path))
+
+        except OSError:
+            entries = []
+
+        for entry in entries:
+            match = NVME_NAMESPACE_REGEX.match(entry)
+
+            if match is None:
+                continue
+
+            #Paths are named after the controller, but the namespace they lead to is
+            #named after the subsystem.
+            if match.group(2) is not None and subsystem != "Unknown":
+                info["Paths"].append(entry)
+                namespace = "/dev/nvme"+subsystem.replace("nvme-subsys", "")+"n"+match.group(3)
+
+            else:
+                namespace = "/dev/"+entry
+
+            if namespace not in info["Namespaces"]:
+                info["Namespaces"].append(namespace)
+
+        nvme_info[info["Name"]] = info
+
+    return nvme_info
+
+def parse_nvme():
+    """
+    Private, implementation detail.
+
+    This function adds any NVMe namespaces that haven't been found yet
+    (lshw doesn't find them) to the disk info dictionary, using sysfs.
+    Their products are their controllers' models.
+
+    Usage:
+
+    >>> parse_nvme()
+    """
+
+    for controller in get_nvme_info().values():
+        for namespace in controller["Namespaces"]:
+            if namespace in DISKINFO or is_excluded(namespace) \
+                or not os.path.isdir(SYSFS+"/block/"+namespace.split("/")[-1]):
+
+                continue
+
+            get_sysfs_device_info(namespace.split("/")[-1])
+
+            if DISKINFO[namespace]["Product"] == "Unknown":
+                DISKINFO[namespace]["Product"] = controller["Model"]
+
+                for partition in DISKINFO[namespace]["Partitions"]:
+                    DISKINFO[partition]["Product"] = "Host Device: "+controller["Model"]
+
+def get_zram_info(devices=None):
+    """
+    **Public**
+
+    .. note:
+        It is perfectly safe to use this. It only reads small files
+        in sysfs, so it is cheap enough to call often (eg to watch
+        for zram running out of memory).
+
+    This function gets the statistics of zram (compressed RAM disk)
+    devices from /sys/block/zram*.
+
+    Args:
+        devices(=None) (list):  The zram devices, eg ["/dev/zram0"]. All of
+                                them if None.
+
+    Returns:
+        dict. Each device, mapped to a dictionary of its statistics. Sizes
+        are in bytes, and any of these can be "Unknown" if they couldn't
+        be read (eg if the kernel is too old):
+
+            - "DiskSize"            - The size of the device.
+            - "Algorithm"           - The compression algorithm, eg "lzo-rle".
+            - "OriginalDataSize"    - How much data has been stored.
+            - "CompressedDataSize"  - How big it is compressed.
+            - "CompressionRatio"    - OriginalDataSize / CompressedDataSize,
+                                      or "N/A" if nothing has been stored.
+            - "MemoryUsed"          - The memory used, including overheads.
+            - "MemoryLimit"         - The most memory it can use (0 if unlimited).
+            - "MemoryUsedMax"       - The most memory it has used.
+            - "FailedReads"         - The number of failed reads.
+            - "FailedWrites"        - The number of failed writes (eg because
+                                      the memory limit was reached).
+
+    Usage:
+
+    >>> zram_info = get_zram_info()
+    """
+
+    if devices is None:
+        try:
+            devices = ["/dev/"+name for name in sorted(os.listdir(SYSFS+"/block"))
+                       if name.startswith("zram")]
+
+        except OSError:
+            return {}
+
+    zram_info = {}
+
+    for device in devices:
+        path = SYSFS+"/block/"+device.split("/")[-1]
+
+        #Only the selected algorithm is in brackets, eg "lzo [lz4] zstd".
+        algorithms = read_sysfs_file(path+"/comp_algorithm").split()
+        selected = [algorithm[1:-1] for algorithm in algorithms if algorithm.startswith("[")]
+
+        mm_stat = read_sysfs_file(path+"/mm_stat").split()
+        io_stat = read_sysfs_file(path+"/io_stat").split()
+
+        info = {}
+        info["DiskSize"] = read_sysfs_file(path+"/disksize")
+        info["Algorithm"] = selected[0] if selected else "Unknown"
+
+        #Fields are described in the kernel's zram documentation.
+        for key, stat, index in (("OriginalDataSize", mm_stat, 0),
+                                 ("CompressedDataSize", mm_stat, 1),
+                                 ("MemoryUsed", mm_stat, 2),
+                                 ("MemoryLimit", mm_stat, 3),
+                                 ("MemoryUsedMax", mm_stat, 4),
+                                 ("FailedReads", io_stat, 0),
+                                 ("FailedWrites", io_stat, 1)):
+
+            info[key] = stat[index] if len(stat) > index else "Unknown"
+
+        for key, value in info.items():
+            if value.isdigit():
+                info[key] = int(value)
+
+        if isinstance(info["OriginalDataSize"], int) \
+            and isinstance(info["CompressedDataSize"], int) and info["CompressedDataSize"] > 0:
+
+            info["CompressionRatio"] = round(info["OriginalDataSize"]
+                                             / info["CompressedDataSize"], 2)
+
+        else:
+            info["CompressionRatio"] = "N/A"
+
+        zram_info[device] = info
+
+    return zram_info
+
+def parse_zram():
+    """
+    Private, implementation detail.
+
+    This function adds any zram devices that the device filter lets
+    through to the disk info dictionary (using sysfs, if they haven't
+    been found yet), along with their statistics. The default filter
+    excludes them, so this does nothing unless they've been asked for.
+
+    Usage:
+
+    >>> parse_zram()
+    """
+
+    try:
+        names = sorted(name for name in os.listdir(SYSFS+"/block") if name.startswith("zram"))
+
+    except OSError:
+        return
+
+    devices = ["/dev/"+name for name in names if not is_excluded("/dev/"+name)]
+
+    for device, stats in get_zram_info(devices).items():
+        if device not in DISKINFO:
+            get_sysfs_device_info(device.split("/")[-1])
+
+        DISKINFO[device]["Description"] = "Compressed RAM Disk (zram)"
+        DISKINFO[device]["Zram"] = stats
+
+def get_loop_info(devices=None):
+    """
+    **Public**
+
+    .. note:
+        It is perfectly safe to use this. It only reads small files
+        in sysfs, so even hundreds of loop devices (eg on a system
+        with lots of snaps) take milliseconds.
+
+    This function gets the backing files and settings of the loop
+    devices that are in use, from /sys/block/loop*/loop.
+
+    Args:
+        devices(=None) (list):  The loop devices, eg ["/dev/loop0"]. All of
+                                them if None. Ones that aren't in use are
+                                left out.
+
+    Returns:
+        dict. Each device, mapped to a dictionary of its settings. Any of
+        these can be "Unknown" if they couldn't be read (None for the flags):
+
+            - "BackingFile"     - The file it is attached to.
+            - "Offset"          - Where it starts in the backing file, in bytes.
+            - "SizeLimit"       - How much of the backing file it uses, in
+                                  bytes (0 for all of it).
+            - "AutoClear"       - True if it is detached when it is last closed.
+            - "DirectIO"        - True if the backing file is accessed with
+                                  direct I/O, bypassing the page cache.
+            - "PartScan"        - True if its partitions are scanned.
+            - "ReadOnly"        - True if it is read-only.
+
+    Usage:
+
+    >>> loop_info = get_loop_info()
+    """
+
+    if devices is None:
+        try:
+            devices = ["/dev/"+name for name in sorted(os.listdir(SYSFS+"/block"))
+                       if name.startswith("loop")]
+
+        except OSError:
+            return {}
+
+    loop_info = {}
+
+    for device in devices:
+        path = SYSFS+"/block/"+device.split("/")[-1]
+
+        #Only loop devices that are in use have a loop directory.
+        if not os.path.isdir(path+"/loop"):
+            continue
+
+        info = {}
+        info["BackingFile"] = read_sysfs_file(path+"/loop/backing_file")
+
+        for key, name in (("Offset", "offset"), ("SizeLimit", "sizelimit")):
+            value = read_sysfs_file(path+"/loop/"+name)
+            info[key] = int(value) if value.isdigit() else value
+
+        for key, name in (("AutoClear", "loop/autoclear"), ("DirectIO", "loop/dio"),
+                          ("PartScan", "loop/partscan"), ("ReadOnly", "ro")):
+
+            info[key] = {"1": True, "0": False}.get(read_sysfs_file(path+"/"+name))
+
+        loop_info[device] = info
+
+    return loop_info
+
+def parse_loops():
+    """
+    Private, implementation detail.
+
+    This function adds the loop devices that are in use to the disk info
+    dictionary, along with their settings, if get_info() was asked to
+    include them. The ones that haven't been found yet are described from
+    sysfs and the udev database only, without reading them, so this stays
+    fast with hundreds of them.
+
+    Usage:
+
+    >>> parse_loops()
+    """
+
+    if LOOP_FILTER is None:
+        return
+
+    try:
+        names = sorted(name for name in os.listdir(SYSFS+"/block") if name.startswith("loop"))
+
+    except OSError:
+        return
+
+    devices = ["/dev/"+name for name in names if not is_excluded("/dev/"+name, LOOP_FILTER)]
+
+    for device, info in get_loop_info(devices).items():
+        if device not in DISKINFO:
+            get_loop_device_info(device, info)
+
+        DISKINFO[device]["Loop"] = info
+
+def get_loop_device_info(device, info):
+    """
+    Private, implementation detail.
+
+    This function gets the information for a loop device that is in use,
+    from sysfs and the udev database only.
+
+    Args:
+        device (str):   The loop device, eg /dev/loop0.
+        info (dict):    Its settings, from get_loop_info().
+
+    Returns:
+        string. The name of the device.
+
+    Usage:
+
+    >>> host_disk = get_loop_device_info(<aLoopDevice>, <itsLoopInfo>)
+    """
+
+    path = SYSFS+"/block/"+device.split("/")[-1]
+
+    DISKINFO[device] = {}
+    DISKINFO[device]["Name"] = device
+    DISKINFO[device]["Type"] = "Device"
+    DISKINFO[device]["HostDevice"] = "N/A"
+    DISKINFO[device]["Partitions"] = []
+    DISKINFO[device]["Vendor"] = "Linux"
+    DISKINFO[device]["Product"] = "Loop Device"
+    DISKINFO[device]["RawCapacity"], DISKINFO[device]["Capacity"] = get_sysfs_capacity(path)
+    DISKINFO[device]["Description"] = "Loop Device"
+    DISKINFO[device]["Flags"] = get_sysfs_capabilities(path)
+
+    if info["ReadOnly"]:
+        DISKINFO[device]["Flags"].append("read-only")
+
+    if info["DirectIO"]:
+        DISKINFO[device]["Flags"].append("direct-io")
+
+    DISKINFO[device]["Partitioning"] = "Unknown"
+    DISKINFO[device]["FileSystem"] = get_udev_property(device, "ID_FS_TYPE")
+    DISKINFO[device]["UUID"] = get_udev_property(device, "ID_FS_UUID")
+    DISKINFO[device]["ID"] = "N/A"
+    DISKINFO[device]["Label"] = get_udev_property(device, "ID_FS_LABEL")
+    DISKINFO[device]["PartUUID"] = "N/A"
+    DISKINFO[device]["Path"] = "N/A"
+
+    #Don't read the device.
+    DISKINFO[device]["BootRecord"], DISKINFO[device]["BootRecordStrings"] = ("N/A", ["N/A"])
+
+    return device
+
+def get_multipath_info():
+    """
+    **Public**
+
+    .. note:
+        It is perfectly safe to use this. It only reads small files
+        in sysfs.
+
+    This function finds devices that can be reached by more than one
+    path (eg SAN LUNs), and the paths to them. Paths are grouped by
+    the dm-multipath map that holds them if there is one (using
+    /sys/block/*/holders), or otherwise by their WWIDs.
+
+    Returns:
+        dict. The path chosen to represent each device (the first one
+        that is running), mapped to a dictionary:
+
+            - "WWID"        - The device's WWID, or "Unknown".
+            - "Map"         - The dm-multipath map, eg /dev/mapper/mpatha,
+                              or "N/A" if there isn't one.
+            - "Paths"       - All of the paths, mapped to their states
+                              (eg "running", "offline"), or "Unknown".
+
+    Usage:
+
+    >>> multipath_info = get_multipath_info()
+    """
+
+    try:
+        names = sorted(os.listdir(SYSFS+"/block"))
+
+    except OSError as err:
+        ERRORS.append("linux.get_multipath_info(): Exception: "+str(err)+" while reading sysfs\n")
+        return {}
+
+    groups = {}
+
+    for name in names:
+        if name.startswith("dm-"):
+            continue
+
+        path = SYSFS+"/block/"+name
+        wwid = read_sysfs_file(path+"/device/wwid")
+        multipath_map = None
+
+        try:
+            holders = sorted(os.listdir(path+"/holders"))
+
+        except OSError:
+            holders = []
+
+        for holder in holders:
+            dm_uuid = read_sysfs_file(SYSFS+"/block/"+holder+"/dm/uuid")
+
+            if dm_uuid.startswith("mpath-"):
+                multipath_map = holder
+                wwid = dm_uuid[6:]
+                break
+
+        if multipath_map is None and wwid == "Unknown":
+            continue
+
+        key = ("map", multipath_map) if multipath_map is not None else ("wwid", wwid)
+        groups.setdefault(key, {"WWID": wwid, "Map": "N/A", "Paths": {}})
+
+        if multipath_map is not None:
+            groups[key]["Map"] = "/dev/mapper/"+read_sysfs_file(SYSFS+"/block/"+multipath_map
+                                                                + "/dm/name")
+
+        groups[key]["Paths"]["/dev/"+name] = read_sysfs_file(path+"/device/state")
+
+    multipath_info = {}
+
+    for info in groups.values():
+        #Devices with only one path aren't multipath devices, unless they're in a map.
+        if len(info["Paths"]) < 2 and info["Map"] == "N/A":
+            continue
+
+        running = [path for path, state in info["Paths"].items() if state == "running"]
+        multipath_info[(running or list(info["Paths"]))[0]] = info
+
+    return multipath_info
+
+def parse_multipath():
+    """
+    Private, implementation detail.
+
+    This function adds the paths to each multipath device to the entry
+    for the path that was probed, if multipath devices are being grouped
+    (see get_info()).
+
+    Usage:
+
+    >>> parse_multipath()
+    """
+
+    for device, info in MULTIPATH_INFO.items():
+        if device in DISKINFO:
+            DISKINFO[device]["Multipath"] = info
+
+def get_power_state(disk):
+    """
+    **Public**
+
+    .. note:
+        It is perfectly safe to use this. It doesn't wake up
+        disks that are asleep.
+
+    This function gets the power state of a disk. Runtime power management
+    in sysfs is checked first. Then an ATA CHECK POWER MODE command is sent
+    (like hdparm -C), which drives answer without spinning up.
+
+    Args:
+        disk (str):     The name of a device, eg /dev/sda.
+
+    Returns:
+        string. The power state:
+
+            - "Unknown"         - Couldn't find it (eg the disk isn't an
+                                  ATA disk, and doesn't use runtime power
+                                  management).
+            - "active/idle"     - The disk is running.
+            - "idle"            - The disk is idle, but its platters are
+                                  still spinning.
+            - "standby"         - The disk has spun down.
+            - "sleeping"        - The disk has been suspended by the kernel.
+
+    Usage:
+
+    >>> power_state = get_power_state(<aDiskName>)
+    """
+
+    #Match the kernel's name for the device, in case this is a link.
+    name = os.path.basename(os.path.realpath(disk))
+
+    if read_sysfs_file(SYSFS+"/block/"+name+"/device/power/runtime_status") == "suspended":
+        return "sleeping"
+
+    try:
+        file_descriptor = os.open(disk, os.O_RDONLY | os.O_NONBLOCK)
+
+    except OSError:
+        return "Unknown"
+
+    try:
+        for command in ATA_CHECK_POWER_MODE_COMMANDS:
+            args = bytearray((command, 0, 0, 0))
+
+            try:
+                fcntl.ioctl(file_descriptor, HDIO_DRIVE_CMD, args, True)
+
+            except OSError:
+                continue
+
+            #The power mode is returned in the sector count register.
+            return ATA_POWER_MODES.get(args[2], "Unknown")
+
+    finally:
+        os.close(file_descriptor)
+
+    return "Unknown"
+
+def get_power_states():
+    """
+    Private, implementation detail.
+
+    This function gets the power states of all of the disks that the
+    device filter lets through.
+
+    Returns:
+        dict. Each disk, mapped to its power state (see get_power_state()).
+
+    Usage:
+
+    >>> power_states = get_power_states()
+    """
+
+    try:
+        names = sorted(os.listdir(SYSFS+"/block"))
+
+    except OSError as err:
+        ERRORS.append("linux.get_power_states(): Exception: "+str(err)+" while reading sysfs\n")
+        return {}
+
+    power_states = {}
+
+    for name in names:
+        disk = "/dev/"+name
+
+        #RAM disks and device-mapper devices don't have power states.
+        if name.startswith("ram") or name.startswith("dm-") or is_excluded(disk) \
+            or has_no_media(disk):
+
+            continue
+
+        power_states[disk] = get_power_state(disk)
+
+    return power_states
+
+def is_sleeping(disk):
+    """
+    Private, implementation detail.
+
+    This function checks whether a disk (or the disk a partition is on,
+    or any disk under a device-mapper device) was asleep when get_info()
+    checked, so reading it would wake it up.
+
+    Args:
+        disk (str):     The name of a partition/device, eg /dev/sda1.
+
+    Returns:
+        bool. True if it is asleep, otherwise False (including if power
+        states weren't checked).
+
+    Usage:
+
+    >>> if is_sleeping(<aDiskName>):
+    >>>     ...
+    """
+
+    if not SLEEPING_DISKS:
+        return False
+
+    name = os.path.basename(os.path.realpath(disk))
+
+    #Device-mapper devices (eg logical volumes) are asleep if any of the
+    #devices under them are.
+    try:
+        slaves = os.listdir(SYSFS+"/class/block/"+name+"/slaves")
+
+    except OSError:
+        slaves = []
+
+    if slaves:
+        return any(is_sleeping("/dev/"+slave) for slave in slaves)
+
+    #Partitions are asleep if their device is.
+    if os.path.exists(SYSFS+"/class/block/"+name+"/partition"):
+        name = os.path.basename(os.path.dirname(os.path.realpath(SYSFS+"/class/block/"+name)))
+
+    return "/dev/"+name in SLEEPING_DISKS
+
+def parse_power_states():
+    """
+    Private, implementation detail.
+
+    This function adds the power state of each disk to its entry, and
+    its partitions' entries, if probing is power-aware (see get_info()).
+    Entries for sleeping disks are marked as partially probed.
+
+    Usage:
+
+    >>> parse_power_states()
+    """
+
+    if not POWER_STATES:
+        return
+
+    for disk, info in DISKINFO.items():
+        host_disk = disk if info.get("Type") == "Device" else info.get("HostDevice")
+
+        if host_disk in POWER_STATES:
+            info["PowerState"] = POWER_STATES[host_disk]
+            info["PartiallyProbed"] = host_disk in SLEEPING_DISKS
+
+def parse_lsblk_output():
+    """
+    Private, implementation detail.
+
+    This function is used to get NVME disk information from the output of lsblk.
+
+    .. note::
+            This will only remain here until lshw adds support for NVME disk detection -
+            this is a temporary fix.
+
+    Usage:
+
+    >>> parse_lsblk_output()
+    """
+
+    try:
+        data = json.loads(LSBLKOUTPUT)
+
+    except ValueError:
+        #Not a valid JSON document!
+        ERRORS.append("linux.parse_lsblk_output(): lsblk output is not valid JSON! Output: "
+                      + LSBLKOUTPUT+"\n")
+        return
+
+    for disk in data["blockdevices"]:
+        host_disk = "/dev/"+disk["name"]
+
+        #If this disk is already in the DISKINFO dictionary, ignore it.
+        if host_disk in DISKINFO:
+            continue
+
+        #Ignore devices that have been filtered out (loop, zram, and nbd devices by default).
+        if is_excluded(host_disk):
+            continue
+
+        DISKINFO[host_disk] = {}
+        DISKINFO[host_disk]["Name"] = host_disk
+        DISKINFO[host_disk]["Type"] = "Device"
+        DISKINFO[host_disk]["HostDevice"] = "N/A"
+        DISKINFO[host_disk]["Partitions"] = []
+
+        try:
+            DISKINFO[host_disk]["Vendor"] = disk["vendor"].strip()
+
+        except KeyError:
+            DISKINFO[host_disk]["Vendor"] = "Unknown"
+
+        try:
+            DISKINFO[host_disk]["Product"] = disk["model"].strip()
+
+        except KeyError:
+            DISKINFO[host_disk]["Product"] = "Unknown"
+
+        DISKINFO[host_disk]["UUID"] = "N/A"
+        DISKINFO[host_disk]["FileSystem"] = "N/A"
+
+        try:
+            DISKINFO[host_disk]["RawCapacity"] = str(disk["size"])
+
+        except KeyError:
+            DISKINFO[host_disk]["RawCapacity"] = "Unknown"
+
+        #Calculate human-readable capacity.
+        #Round the sizes to make them human-readable.
+        unit_list = [None, "B", "KB", "MB", "GB", "TB", "PB", "EB"]
+        unit = "B"
+
+        try:
+            human_readable_size = int(DISKINFO[host_disk]["RawCapacity"])
+
+            while len(str(human_readable_size)) > 3:
+                #Shift up one unit.
+                unit = unit_list[unit_list.index(unit)+1]
+                human_readable_size = human_readable_size//1000
+
+        except (KeyError, ValueError, IndexError):
+            DISKINFO[host_disk]["Capacity"] = "Unknown"
+
+        else:
+            DISKINFO[host_disk]["Capacity"] = str(human_readable_size)+" "+unit
+
+        queue_probe(host_disk, ("BootRecord", "BootRecordStrings"), get_boot_record, host_disk)
+
+        DISKINFO[host_disk]["Description"] = generate_description(host_disk)
+        DISKINFO[host_disk]["Flags"] = "Unknown"
+        DISKINFO[host_disk]["Partitioning"] = "Unknown"
+        DISKINFO[host_disk]["ID"] = get_id(host_disk)
+        DISKINFO[host_disk]["Label"] = "N/A"
+        DISKINFO[host_disk]["PartUUID"] = "N/A"
+        DISKINFO[host_disk]["Path"] = get_path(host_disk)
+
+        #Get any partitions as well.
+        if "children" in disk:
+            for child in disk["children"]:
+                child_disk = "/dev/"+child["name"]
+
+                DISKINFO[child_disk] = {}
+                DISKINFO[child_disk]["Name"] = child_disk
+                DISKINFO[child_disk]["Type"] = "Partition"
+                DISKINFO[child_disk]["HostDevice"] = host_disk
+                DISKINFO[child_disk]["Partitions"] = []
+                DISKINFO[host_disk]["Partitions"].append(child_disk)
+                DISKINFO[child_disk]["Vendor"] = "N/A"
+                DISKINFO[child_disk]["Product"] = "Host Device: "+DISKINFO[host_disk]["Product"]
+
+                try:
+                    if child["uuid"] is None:
+                        DISKINFO[child_disk]["UUID"] = "Unknown"
+
+                    else:
+                        DISKINFO[child_disk]["UUID"] = child["uuid"]
+
+                except KeyError:
+                    DISKINFO[child_disk]["UUID"] = "Unknown"
+
+                try:
+                    DISKINFO[child_disk]["FileSystem"] = child["fstype"]
+
+                except KeyError:
+                    DISKINFO[child_disk]["FileSystem"] = "Unknown"
+
+                if DISKINFO[child_disk]["FileSystem"] is None:
+                    DISKINFO[child_disk]["FileSystem"] = "Unknown"
+
+                try:
+                    DISKINFO[child_disk]["RawCapacity"] = str(child["size"])
+
+                except KeyError:
+                    DISKINFO[child_disk]["RawCapacity"] = "Unknown"
+
+                #Calculate human-readable capacity.
+                #Round the sizes to make them human-readable.
+                unit_list = [None, "B", "KB", "MB", "GB", "TB", "PB", "EB"]
+                unit = "B"
+
+                try:
+                    human_readable_size = int(DISKINFO[child_disk]["RawCapacity"])
+
+
+                    while len(str(human_readable_size)) > 3:
+                        #Shift up one unit.
+                        unit = unit_list[unit_list.index(unit)+1]
+                        human_readable_size = human_readable_size//1000
+
+                except (KeyError, ValueError, IndexError):
+                    DISKINFO[child_disk]["Capacity"] = "Unknown"
+
+                else:
+                    DISKINFO[child_disk]["Capacity"] = str(human_readable_size)+" "+unit
+
+                queue_probe(child_disk, ("BootRecord", "BootRecordStrings"), get_boot_record,
+                            child_disk)
+
+                DISKINFO[child_disk]["Description"] = "N/A"
+                DISKINFO[child_disk]["Flags"] = "Unknown"
+                DISKINFO[child_disk]["Partitioning"] = "N/A"
+                DISKINFO[child_disk]["ID"] = get_id(child_disk)
+                queue_probe(child_disk, "Label", get_label, child_disk)
+                DISKINFO[child_disk]["PartUUID"] = get_partuuid(child_disk)
+                DISKINFO[child_disk]["Path"] = get_path(child_disk)
+
+def parse_lsblk_all_output(stdout):
+    """
+    Private, implementation detail.
+
+    This function finds devices and partitions in the output of
+    lsblk -J -O -b, and adds them to the disk info dictionary. It is
+    used instead of lshw and blkid by the "lsblk" backend.
+
+    Partitions are found at any depth (eg partitions on a RAID array
+    are listed under its member disks), and belong to the top-level
+    device they were found under. Logical volumes are skipped, because
+    the LVM tools give us more information about them.
+
+    Args:
+        stdout (str):   lsblk's output.
+
+    Usage:
+
+    >>> parse_lsblk_all_output(<lsblkOutput>)
+    """
+
+    try:
+        devices = json.loads(stdout)["blockdevices"]
+
+    except (ValueError, KeyError, TypeError):
+        ERRORS.append("linux.parse_lsblk_all_output(): lsblk output is not valid JSON! Output: "
+                      + stdout+"\n")
+        return
+
+    for device in devices:
+        host_disk = "/dev/"+device["name"]
+
+        #Ignore devices that have been filtered out (loop, zram, and nbd devices by default).
+        if host_disk in DISKINFO or is_excluded(host_disk):
+            continue
+
+        get_lsblk_device_info(device)
+
+        #Walk through all of the children, and their children.
+        children = list(device.get("children", []))
+
+        while children:
+            child = children.pop(0)
+            children[0:0] = child.get("children", [])
+
+            if child.get("type") == "part":
+                get_lsblk_partition_info(child, host_disk)
+
+def get_lsblk_device_info(device):
+    """
+    Private, implementation detail.
+
+    This function assembles information for a device (whole disk) from
+    its entry in lsblk's output. It is the lsblk equivalent of
+    get_device_info().
+
+    Args:
+        device (dict):  The device's entry in lsblk's output.
+
+    Returns:
+        string.     The name of the device.
+
+    Usage:
+
+    >>> host_disk = get_lsblk_device_info(<aDict>)
+    """
+
+    host_disk = "/dev/"+device["name"]
+
+    DISKINFO[host_disk] = {}
+    DISKINFO[host_disk]["Name"] = host_disk
+    DISKINFO[host_disk]["Type"] = "Device"
+    DISKINFO[host_disk]["HostDevice"] = "N/A"
+    DISKINFO[host_disk]["Partitions"] = []
+    DISKINFO[host_disk]["Vendor"] = (device.get("vendor") or "Unknown").strip()
+    DISKINFO[host_disk]["Product"] = (device.get("model") or "Unknown").strip()
+
+    #Ignore capacities for all optical media.
+    if device.get("type") == "rom":
+        DISKINFO[host_disk]["RawCapacity"], DISKINFO[host_disk]["Capacity"] = ("N/A", "N/A")
+
+    else:
+        DISKINFO[host_disk]["RawCapacity"] = str(device.get("size", "Unknown"))
+        DISKINFO[host_disk]["Capacity"] = \
+        get_human_readable_size(DISKINFO[host_disk]["RawCapacity"])
+
+    DISKINFO[host_disk]["Description"] = generate_description(host_disk)
+    DISKINFO[host_disk]["Flags"] = []
+
+    #Older versions of lsblk use "0" and "1" instead of false and true.
+    if device.get("rm") in (True, "1"):
+        DISKINFO[host_disk]["Flags"].append("removable")
+
+    if device.get("rota") in (True, "1"):
+        DISKINFO[host_disk]["Flags"].append("rotational")
+
+    DISKINFO[host_disk]["Partitioning"] = {"gpt": "gpt", "dos": "mbr"}.get(device.get("pttype"),
+                                                                           "Unknown")
+
+    #Don't open removable devices with no media in them.
+    no_media = has_no_media(host_disk)
+
+    if no_media:
+        DISKINFO[host_disk]["Partitioning"] = "No media"
+
+    DISKINFO[host_disk]["FileSystem"] = "N/A"
+    DISKINFO[host_disk]["UUID"] = "N/A"
+    DISKINFO[host_disk]["ID"] = get_id(host_disk)
+    DISKINFO[host_disk]["Label"] = "N/A"
+    DISKINFO[host_disk]["PartUUID"] = "N/A"
+    DISKINFO[host_disk]["Path"] = get_path(host_disk)
+
+    #Don't try to get Boot Records for optical drives, or devices with no media.
+    if no_media:
+        DISKINFO[host_disk]["BootRecord"], DISKINFO[host_disk]["BootRecordStrings"] = \
+        ("No media", ["No media"])
+
+    elif device.get("type") == "rom":
+        DISKINFO[host_disk]["BootRecord"], DISKINFO[host_disk]["BootRecordStrings"] = \
+        ("N/A", ["N/A"])
+
+    else:
+        queue_probe(host_disk, ("BootRecord", "BootRecordStrings"), get_boot_record, host_disk)
+
+    return host_disk
+
+def get_lsblk_partition_info(partition, host_disk):
+    """
+    Private, implementation detail.
+
+    This function assembles information for a partition from its entry
+    in lsblk's output. It is the lsblk equivalent of get_partition_info().
+
+    Args:
+        partition (dict):   The partition's entry in lsblk's output.
+        host_disk (str):    The device the partition was found under.
+
+    Returns:
+        string.     The name of the partition.
+
+    Usage:
+
+    >>> volume = get_lsblk_partition_info(<aDict>, <aDiskName>)
+    """
+
+    volume = "/dev/"+partition["name"]
+
+    DISKINFO[volume] = {}
+    DISKINFO[volume]["Name"] = volume
+    DISKINFO[volume]["Type"] = "Partition"
+    DISKINFO[volume]["HostDevice"] = host_disk
+    DISKINFO[volume]["Partitions"] = []
+    DISKINFO[host_disk]["Partitions"].append(volume)
+    DISKINFO[volume]["Vendor"] = "N/A"
+    DISKINFO[volume]["Product"] = "Host Device: "+DISKINFO[host_disk]["Product"]
+    DISKINFO[volume]["RawCapacity"] = str(partition.get("size", "Unknown"))
+    DISKINFO[volume]["Capacity"] = get_human_readable_size(DISKINFO[volume]["RawCapacity"])
+    DISKINFO[volume]["Description"] = "N/A"
+    DISKINFO[volume]["Flags"] = []
+    DISKINFO[volume]["FileSystem"] = partition.get("fstype") or "Unknown"
+    DISKINFO[volume]["Partitioning"] = "N/A"
+    DISKINFO[volume]["UUID"] = partition.get("uuid") or "Unknown"
+    DISKINFO[volume]["ID"] = get_id(volume)
+    DISKINFO[volume]["Label"] = partition.get("label") or "Unknown"
+    DISKINFO[volume]["PartUUID"] = partition.get("partuuid") or "Unknown"
+    DISKINFO[volume]["Path"] = get_path(volume)
+    queue_probe(volume, ("BootRecord", "BootRecordStrings"), get_boot_record, volume)
+
+    return volume
+
+def parse_sysfs():
+    """
+    Private, implementation detail.
+
+    This function finds devices and partitions using sysfs, and adds them
+    to the disk info dictionary. It is used instead of lshw and lsblk by
+    the "sysfs" backend, and only reads small files under /sys/block, so
+    it is much faster than running lshw.
+
+    Usage:
+
+    >>> parse_sysfs()
+    """
+
+    try:
+        devices = sorted(os.listdir(SYSFS+"/block"))
+
+    except OSError as err:
+        ERRORS.append("linux.parse_sysfs(): Exception: "+str(err)+" while reading sysfs\n")
+        return
+
+    for device in devices:
+        host_disk = "/dev/"+device
+
+        #Ignore devices that have been filtered out (loop, zram, and nbd devices by default).
+        if is_excluded(host_disk):
+            continue
+
+        #Ignore RAM disks, and device-mapper devices (LVM disks are found using lvdisplay).
+        if device.startswith("ram") or device.startswith("dm-"):
+            continue
+
+        get_sysfs_device_info(device)
+
+def get_sysfs_device_info(device):
+    """
+    Private, implementation detail.
+
+    This function gathers and assembles information for devices (whole disks)
+    and their partitions from sysfs. It is the sysfs equivalent of
+    get_device_info() and get_partition_info().
+
+    Args:
+        device (str):   The kernel name of the device, eg sda.
+
+    Returns:
+        string.     The name of the device, or None if it disappeared
+                    (eg a USB disk that was unplugged).
+
+    Usage:
+
+    >>> host_disk = get_sysfs_device_info(<aKernelName>)
+    """
+
+    path = SYSFS+"/block/"+device
+    host_disk = "/dev/"+device
+
+    #Partitions are subdirectories with a "partition" file holding their number.
+    try:
+        entries = os.listdir(path)
+
+    except OSError as err:
+        ERRORS.append("linux.get_sysfs_device_info(): Exception: "+str(err)
+                      + " while reading sysfs for "+host_disk+"\n")
+
+        return None
+
+    DISKINFO[host_disk] = {}
+    DISKINFO[host_disk]["Name"] = host_disk
+    DISKINFO[host_disk]["Type"] = "Device"
+    DISKINFO[host_disk]["HostDevice"] = "N/A"
+    DISKINFO[host_disk]["Partitions"] = []
+    DISKINFO[host_disk]["Vendor"] = read_sysfs_file(path+"/device/vendor")
+    DISKINFO[host_disk]["Product"] = read_sysfs_file(path+"/device/model")
+
+    #Fall back to udev's database (eg NVMe disks have no vendor file).
+    if DISKINFO[host_disk]["Vendor"] == "Unknown":
+        DISKINFO[host_disk]["Vendor"] = get_udev_property(host_disk, "ID_VENDOR")
+
+    if DISKINFO[host_disk]["Product"] == "Unknown":
+        DISKINFO[host_disk]["Product"] = get_udev_property(host_disk, "ID_MODEL")
+
+    #Ignore capacities for all optical media.
+    if "/dev/cdrom" in host_disk or "/dev/sr" in host_disk or "/dev/dvd" in host_disk:
+        DISKINFO[host_disk]["RawCapacity"], DISKINFO[host_disk]["Capacity"] = ("N/A", "N/A")
+
+    else:
+        DISKINFO[host_disk]["RawCapacity"], DISKINFO[host_disk]["Capacity"] = \
+        get_sysfs_capacity(path)
+
+    DISKINFO[host_disk]["Description"] = generate_description(host_disk)
+    DISKINFO[host_disk]["Flags"] = get_sysfs_capabilities(path)
+
+    #Don't open removable devices with no media in them.
+    no_media = has_no_media(host_disk)
+
+    if no_media:
+        DISKINFO[host_disk]["Partitioning"] = "No media"
+
+    else:
+        queue_probe(host_disk, "Partitioning", get_partitioning, host_disk)
+
+    DISKINFO[host_disk]["FileSystem"] = "N/A"
+    DISKINFO[host_disk]["UUID"] = "N/A"
+    DISKINFO[host_disk]["ID"] = get_id(host_disk)
+    DISKINFO[host_disk]["Label"] = "N/A"
+    DISKINFO[host_disk]["PartUUID"] = "N/A"
+    DISKINFO[host_disk]["Path"] = get_path(host_disk)
+
+    #Don't try to get Boot Records for optical drives, or devices with no media.
+    if no_media:
+        DISKINFO[host_disk]["BootRecord"], DISKINFO[host_disk]["BootRecordStrings"] = \
+        ("No media", ["No media"])
+
+    elif "/dev/cdrom" in host_disk or "/dev/sr" in host_disk or "/dev/dvd" in host_disk:
+        DISKINFO[host_disk]["BootRecord"], DISKINFO[host_disk]["BootRecordStrings"] = \
+        ("N/A", ["N/A"])
+
+    else:
+        queue_probe(host_disk, ("BootRecord", "BootRecordStrings"), get_boot_record, host_disk)
+
+    partitions = []
+
+    for entry in entries:
+        number = read_sysfs_file(path+"/"+entry+"/partition")
+
+        if number.isdigit():
+            partitions.append((int(number), entry))
+
+    for number, partition in sorted(partitions):
+        volume = "/dev/"+partition
+
+        DISKINFO[volume] = {}
+        DISKINFO[volume]["Name"] = volume
+        DISKINFO[volume]["Type"] = "Partition"
+        DISKINFO[volume]["HostDevice"] = host_disk
+        DISKINFO[volume]["Partitions"] = []
+        DISKINFO[host_disk]["Partitions"].append(volume)
+        DISKINFO[volume]["Vendor"] = "N/A"
+        DISKINFO[volume]["Product"] = "Host Device: "+DISKINFO[host_disk]["Product"]
+        DISKINFO[volume]["RawCapacity"], DISKINFO[volume]["Capacity"] = \
+        get_sysfs_capacity(path+"/"+partition)
+
+        DISKINFO[volume]["Description"] = "N/A"
+        DISKINFO[volume]["Flags"] = []
+        queue_probe(volume, "FileSystem", get_lv_file_system, volume)
+        DISKINFO[volume]["Partitioning"] = "N/A"
+        queue_probe(volume, "UUID", get_uuid, volume)
+        DISKINFO[volume]["ID"] = get_id(volume)
+        queue_probe(volume, "Label", get_label, volume)
+        DISKINFO[volume]["PartUUID"] = get_partuuid(volume)
+        DISKINFO[volume]["Path"] = get_path(volume)
+        queue_probe(volume, ("BootRecord", "BootRecordStrings"), get_boot_record, volume)
+
+    return host_disk
+
+def read_sysfs_file(path):
+    """
+    Private, implementation detail.
+
+    This function reads a (small) file from sysfs, and strips any
+    padding from its contents.
+
+    Args:
+        path (str):     The path to the file.
+
+    Returns:
+        string. The contents of the file:
+
+            - "Unknown"     - Couldn't read it.
+            - Anything else - The contents.
+
+    Usage:
+
+    >>> model = read_sysfs_file(<aPath>)
+    """
+
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as sysfs_file:
+            contents = sysfs_file.read().strip()
+
+    except OSError:
+        return "Unknown"
+
+    if contents == "":
+        return "Unknown"
+
+    return contents
+
+def get_sysfs_capacity(path):
+    """
+    Private, implementation detail.
+
+    This function gets the capacity of a device/partition from sysfs.
+    Also rounds it to a human-readable form, and returns both sizes.
+
+    .. note::
+        sysfs always counts in 512-byte sectors, whatever the
+        block size of the device is.
+
+    Args:
+        path (str):     The device's/partition's directory in sysfs.
+
+    Returns:
+        tuple (string, string). The sizes (bytes, human-readable):
+
+            - ("Unknown", "Unknown")     - Couldn't find them.
+            - Anything else              - The sizes.
+
+    Usage:
+
+    >>> raw_size, human_size = get_sysfs_capacity(<aSysfsPath>)
+    """
+
+    try:
+        raw_capacity = str(int(read_sysfs_file(path+"/size")) * 512)
+
+    except ValueError:
+        return "Unknown", "Unknown"
+
+    return raw_capacity, get_human_readable_size(raw_capacity)
+
+def get_sysfs_capabilities(path):
+    """
+    Private, implementation detail.
+
+    This function gets the capabilities of a device from sysfs.
+
+    Args:
+        path (str):     The device's directory in sysfs.
+
+    Returns:
+        list. The capabilities:
+
+            - "removable"   - The device has removable media.
+            - "rotational"  - The device is a spinning disk.
+
+    Usage:
+
+    >>> capabilities = get_sysfs_capabilities(<aSysfsPath>)
+    """
+
+    flags = []
+
+    if read_sysfs_file(path+"/removable") == "1":
+        flags.append("removable")
+
+    if read_sysfs_file(path+"/queue/rotational") == "1":
+        flags.append("rotational")
+
+    return flags
+
+def has_no_media(disk):
+    """
+    Private, implementation detail.
+
+    This function checks sysfs to see whether a device is a removable
+    device with no media in it (eg an empty card reader slot, or an
+    empty optical drive), without opening it. Trying to read these can
+    block for seconds before failing.
+
+    Args:
+        disk (str):     The name of a device, eg /dev/sdb.
+
+    Returns:
+        bool. True if there's no media in it, otherwise False (including
+        if sysfs doesn't know the device).
+
+    Usage:
+
+    >>> if has_no_media(<aDiskName>):
+    >>>     ...
+    """
+
+    #Match the kernel's name for the device, in case this is a link (eg /dev/cdrom).
+    path = SYSFS+"/block/"+os.path.basename(os.path.realpath(disk))
+
+    if read_sysfs_file(path+"/size") != "0":
+        return False
+
+    if read_sysfs_file(path+"/removable") == "1":
+        return True
+
+    #Some devices with removable media (eg card readers) don't say they're removable.
+    events = read_sysfs_file(path+"/events").split()
+
+    return "media_change" in events or "eject_request" in events
+
+def get_human_readable_size(raw_capacity):
+    """
+    Private, implementation detail.
+
+    This function rounds a size in bytes to make it human-readable.
+
+    Args:
+        raw_capacity (str):     The size in bytes.
+
+    Returns:
+        string. The human-readable size:
+
+            - "Unknown"     - The size was not a sensible integer.
+            - Anything else - The human-readable size.
+
+    Usage:
+
+    >>> human_size = get_human_readable_size(<aSize>)
+    """
+
+    unit_list = [None, "B", "KB", "MB", "GB", "TB", "PB", "EB"]
+    unit = "B"
+
+    try:
+        human_readable_size = int(raw_capacity)
+
+        while len(str(human_readable_size)) > 3:
+            #Shift up one unit.
+            unit = unit_list[unit_list.index(unit)+1]
+            human_readable_size = human_readable_size//1000
+
+    except (ValueError, IndexError):
+        return "Unknown"
+
+    return str(human_readable_size)+" "+unit
+
+def get_vendor(node):
+    """
+    Private, implementation detail.
+
+    This function gets the vendor from the structure generated
+    by parsing lshw's XML output.
+
+    Args:
+        node:   Represents a device/partition.
+
+    Returns:
+        string. The vendor:
+
+            - "Unknown"     - Couldn't find it.
+            - Anything else - The vendor.
+
+    Usage:
+
+    >>> vendor = get_vendor(<aNode>)
+    """
+
+    if hasattr(node.vendor, "string"):
+        if isinstance(node.vendor.string, bytes):
+            return node.vendor.string.decode("utf-8", errors="replace")
+
+        if isinstance(node.vendor.string, str):
+            return node.vendor.string #Already a unicode string.
+
+    return "Unknown"
+
+def get_product(node):
+    """
+    Private, implementation detail.
+
+    This function gets the product from the structure generated
+    by parsing lshw's XML output.
+
+    Args:
+        node:   Represents a device/partition.
+
+    Returns:
+        string. The product:
+
+            - "Unknown"     - Couldn't find it.
+            - Anything else - The product.
+
+    Usage:
+
+    >>> product = get_product(<aNode>)
+    """
+
+    if hasattr(node.product, "string"):
+        if isinstance(node.product.string, bytes):
+            return node.product.string.decode("utf-8", errors="replace")
+
+        if isinstance(node.product.string, str):
+            return node.product.string #Already a unicode string.
+
+    return "Unknown"
+
+def get_capacity(node):
+    """
+    Private, implementation detail.
+
+    This function gets the capacity from the structure generated
+    by parsing lshw's XML output. Also rounds it to a human-
+    readable form, and returns both sizes.
+
+    Args:
+        node:   Represents a device/partition.
+
+    Returns:
+        tuple (string, string). The sizes (bytes, human-readable):
+
+            - ("Unknown", "Unknown")     - Couldn't find them.
+            - Anything else              - The sizes.
+
+    Usage:
+
+    >>> raw_size, human_size = get_capacity(<aNode>)
+    """
+
+    if hasattr(node, "size") and hasattr(node.size, "string"):
+        #This is actually an int, despite the misleading name.
+        raw_capacity = str(node.size.string)
+
+    elif hasattr(node, "capacity") and hasattr(node.capacity, "string"):
+        #This is actually an int, despite the misleading name.
+        raw_capacity = str(node.capacity.string)
+
+    else:
+        return "Unknown", "Unknown"
+
+    #Round the sizes to make them human-readable.
+    unit_list = [None, "B", "KB", "MB", "GB", "TB", "PB", "EB"]
+    unit = "B"
+
+    #Return Unknown, Unknown if this is not an integer.
+    try:
+        human_readable_size = int(raw_capacity)
+
+    except ValueError:
+        return "Unknown", "Unknown"
+
+    try:
+        while len(str(human_readable_size)) > 3:
+            #Shift up one unit.
+            unit = unit_list[unit_list.index(unit)+1]
+            human_readable_size = human_readable_size//1000
+
+    except IndexError:
+        return "Unknown", "Unknown"
+
+    #Include the unit in the result for both exact and human-readable sizes.
+    return raw_capacity, str(human_readable_size)+" "+unit
+
+def get_capabilities(node):
+    """
+    Private, implementation detail.
+
+    This function gets the capabilities from the structure
+    generated by parsing lshw's XML output.
+
+    Args:
+        node:   Represents a device/partition.
+
+    Returns:
+        list. The capabilities:
+
+            - []            - Couldn't find them.
+            - Anything else - The capabilities - as unicode strings.
+
+    Usage:
+
+    >>> capabilities = get_capabilities(<aNode>)
+    """
+
+    flags = []
+
+    try:
+        for capability in node.capabilities.children:
+            if getattr(capability, "name", None) != "capability":
+                continue
+
+            if isinstance(capability["id"], bytes):
+                flags.append(capability["id"].decode("utf-8", errors="replace"))
+
+            elif isinstance(capability["id"], str):
+                flags.append(capability["id"])
+
+    except AttributeError:
+        return []
+
+    else:
+        return flags
+
+def generate_description(disk):
+    """
+    Private, implementation detail.
+
+    This function generates a description for the given disk. This is used when
+    the disk came from lsblk's output, so we don't have a description generated
+    from lshw to use.
+
+    Args:
+        disk (str):   The name of a device/partition in
+                      the disk info dictionary.
+
+    Returns:
+        string (str). A description.
+
+    Usage:
+
+    >>> description = generate_description(<aDiskName>)
+    """
+
+    if "nvme" in disk:
+        return "NVME SSD"
+
+    if "cdrom" in disk or "sr" in disk or "scd" in disk:
+        return "Optical Drive"
+
+    if "sd" in disk or "hd" in disk:
+        return "Hard Disk Drive or SATA SSD"
+
+    return "None"
+
+def get_partitioning(disk):
+    """
+    Private, implementation detail.
+
+    This function gets the partition scheme from the
+    structure generated by parsing lshw's XML output,
+    or from udev's database if lshw didn't find it,
+    or by reading the partition table if neither did.
+
+    Args:
+        disk (str):   The name of a device/partition in
+                      the disk info dictionary.
+
+    Returns:
+        string (str). The partition scheme:
+
+            - "Unknown"     - Couldn't find it.
+            - "mbr"         - Old-style MBR partitioning
+                              for BIOS systems.
+            - "gpt"         - New-style GPT partitioning.
+
+    Usage:
+
+    >>> partitioning = get_partitioning(<aDiskName>)
+    """
+    try:
+        partitioning = DISKINFO[disk]["Flags"][-1].split(":")[-1]
+
+        if partitioning in ("gpt", "dos"):
+            if partitioning == "dos":
+                partitioning = "mbr"
+
+        else:
+            partitioning = "Unknown"
+
+    #Fix for unpartitioned disks.
+    except (IndexError, KeyError):
+        partitioning = "Unknown"
+
+    if partitioning == "Unknown":
+        table_type = get_udev_property(disk, "ID_PART_TABLE_TYPE")
+        partitioning = {"gpt": "gpt", "dos": "mbr"}.get(table_type, "Unknown")
+
+    #Read the partition table ourselves as a last resort (but not from optical
+    #drives, or sleeping disks).
+    if partitioning == "Unknown" and not ("/dev/cdrom" in disk or "/dev/sr" in disk
+                                          or "/dev/dvd" in disk or is_sleeping(disk)):
+
+        partitioning = get_partition_table(disk)["Scheme"]
+
+    return partitioning
+
+def get_file_system(node):
+    """
+    Private, implementation detail.
+
+    This function gets the file system from the structure
+    generated by parsing lshw's XML output, or from udev, blkid
+    or the superblock (see get_lv_file_system()) if lshw
+    didn't find it.
+
+    Args:
+        node:   Represents a device/partition.
+
+    Returns:
+        string. The file system:
+
+            - "Unknown"     - Couldn't find it.
+            - Anything else - The file system.
+
+    Usage:
+
+    >>> file_system = get_file_system(<aNode>)
+    """
+
+    file_system = get_lshw_file_system(node)
+    diskname = "Unknown"
+
+    try:
+        if isinstance(node.logicalname.string, bytes):
+            diskname = node.logicalname.string.decode("utf-8") #NOTE: is this ever bytes?
+
+        else:
+            diskname = node.logicalname.string
+
+    except AttributeError:
+        pass
+
+    #Fall back to LVM equivelant if needed (works on all disks and
+    #detects some things that lshw does not).
+    if file_system == "Unknown" and diskname != "Unknown":
+        return get_lv_file_system(diskname)
+
+    return file_system
+
+def get_lshw_file_system(node):
+    """
+    Private, implementation detail.
+
+    This function gets the file system that lshw found, from the
+    structure generated by parsing lshw's XML output, without falling
+    back to anything else.
+
+    Args:
+        node:   Represents a device/partition.
+
+    Returns:
+        string. The file system:
+
+            - "Unknown"     - lshw didn't find it.
+            - Anything else - The file system.
+
+    Usage:
+
+    >>> file_system = get_lshw_file_system(<aNode>)
+    """
+
+    file_system = "Unknown"
+
+    try:
+        for config in node.configuration.children:
+            if getattr(config, "name", None) != "setting":
+                continue
+
+            if config["id"] == "filesystem":
+                if isinstance(config["value"], bytes):
+                    file_system = config["value"].decode("utf-8", errors="replace")
+
+                elif isinstance(config["value"], str):
+                    file_system = config["value"] #Already a unicode string.
+
+                #Use different terminology where wanted.
+                if file_system == "fat":
+                    file_system = "vfat"
+
+                break
+
+    except AttributeError:
+        pass
+
+    return file_system
+
+def get_disk_links(path="/dev/disk"):
+    """
+    Private, implementation detail.
+
+    This function reads the symlinks in /dev/disk/by-uuid, by-id, by-label,
+    by-partuuid and by-path in one pass, and indexes them by the kernel name
+    of the disk they point to (eg sda1). This is much faster than searching
+    the output of ls -l for every disk.
+
+    Where a disk has more than one link of a type (eg IDs), the first
+    one in alphabetical order is used, like when we parsed ls -l.
+
+    Args:
+        path(="/dev/disk") (str):   Where the by-* directories are.
+
+    Returns:
+        dict. Each link type (eg "by-uuid"), mapped to a dictionary of
+        kernel names and link names. Types with no directory are empty.
+
+    Usage:
+
+    >>> disk_links = get_disk_links()
+    """
+
+    disk_links = {}
+
+    for link_type in DISK_LINK_TYPES:
+        disk_links[link_type] = {}
+
+        try:
+            with os.scandir(path+"/"+link_type) as entries:
+                links = sorted((entry.name, entry.path) for entry in entries if entry.is_symlink())
+
+        except OSError:
+            #This type of link doesn't exist on this system.
+            continue
+
+        for name, link in links:
+            try:
+                disk = os.path.basename(os.readlink(link))
+
+            except OSError:
+                continue
+
+            #udev escapes characters like spaces and slashes in labels.
+            if link_type == "by-label":
+                name = UDEV_ESCAPE_REGEX.sub(lambda match: chr(int(match.group(1), 16)), name)
+
+            disk_links[link_type].setdefault(disk, name)
+
+    return disk_links
+
+def get_disk_link(disk, link_type):
+    """
+    Private, implementation detail.
+
+    This function looks up a disk in the /dev/disk/by-* index.
+
+    Args:
+        disk (str):         The name of a partition/device.
+        link_type (str):    The type of link, eg "by-uuid".
+
+    Returns:
+        string. The link's name:
+
+            - "Unknown"     - Couldn't find it.
+            - Anything else - The link's name.
+
+    Usage:
+
+    >>> label = get_disk_link(<aDiskName>, "by-label")
+    """
+
+    try:
+        return DISK_LINKS[link_type].get(disk.split('/')[-1], "Unknown")
+
+    except (KeyError, TypeError):
+        return "Unknown"
+
+def has_udev_database():
+    """
+    Private, implementation detail.
+
+    This function checks whether udev's database has any block devices
+    in it (it doesn't if udev isn't running, eg in some containers).
+
+    Returns:
+        bool. True if it does, otherwise False.
+
+    Usage:
+
+    >>> has_udev_database()
+    """
+
+    try:
+        with os.scandir(UDEV_DATA) as entries:
+            return any(entry.name.startswith("b") for entry in entries)
+
+    except OSError:
+        return False
+
+def get_udev_info(disk):
+    """
+    Private, implementation detail.
+
+    This function looks up a disk in udev's database, which is in
+    /run/udev/data/b<major>:<minor>. udev has already probed every
+    disk with blkid and its own helpers, so this is much faster than
+    running any tools.
+
+    Files are only read again if udev has changed them since the last
+    time they were read.
+
+    Args:
+        disk (str):   The name of a partition/device/logical volume.
+
+    Returns:
+        dict. udev's properties for this disk, eg {"ID_FS_TYPE": "ext4", ...}
+        (empty if udev doesn't know about it).
+
+    Usage:
+
+    >>> properties = get_udev_info(<aDiskName>)
+    """
+
+    #Find the device number (this also works for LVs, which are symlinks to dm-*).
+    name = os.path.basename(os.path.realpath(disk))
+    dev = read_sysfs_file(SYSFS+"/class/block/"+name+"/dev")
+
+    if dev == "Unknown":
+        return {}
+
+    path = UDEV_DATA+"/b"+dev
+
+    try:
+        mtime = os.stat(path).st_mtime_ns
+
+    except OSError:
+        UDEV_CACHE.pop(path, None)
+        return {}
+
+    if path in UDEV_CACHE and UDEV_CACHE[path][0] == mtime:
+        return UDEV_CACHE[path][1]
+
+    properties = {}
+
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as udev_file:
+            for line in udev_file:
+                #Properties are E:KEY=value lines. The rest are links, tags, etc.
+                if line.startswith("E:") and "=" in line:
+                    key, value = line[2:].rstrip("\n").split("=", 1)
+                    properties[key] = value
+
+    except OSError:
+        return {}
+
+    UDEV_CACHE[path] = (mtime, properties)
+
+    return properties
+
+def get_udev_property(disk, key):
+    """
+    Private, implementation detail.
+
+    This function gets a property of a disk from udev's database. Where
+    udev also stores an escaped copy of the property (eg ID_MODEL_ENC,
+    which keeps the spaces that ID_MODEL replaces with underscores),
+    that is used instead.
+
+    Args:
+        disk (str):   The name of a partition/device/logical volume.
+        key (str):    The property, eg "ID_FS_UUID".
+
+    Returns:
+        string. The property:
+
+            - "Unknown"     - Couldn't find it.
+            - Anything else - The property.
+
+    Usage:
+
+    >>> model = get_udev_property(<aDiskName>, "ID_MODEL")
+    """
+
+    properties = get_udev_info(disk)
+
+    if key+"_ENC" in properties:
+        value = UDEV_ESCAPE_REGEX.sub(lambda match: chr(int(match.group(1), 16)),
+                                      properties[key+"_ENC"]).strip()
+
+    else:
+        value = properties.get(key, "").strip()
+
+    return value or "Unknown"
+
+def get_uuid(disk):
+    """
+    Private, implementation detail.
+
+    This function gets the UUID of a given partition.
+
+    Args:
+        disk (str):   The name of a **partition**.
+
+    Returns:
+        string. The UUID:
+
+            - "Unknown"     - Couldn't find it.
+            - Anything else - The UUID.
+
+    Usage:
+
+    >>> uuid = get_uuid(<aPartitionName>)
+    """
+
+    disk_uuid = get_disk_link(disk, "by-uuid")
+
+    #Fall back to udev's database (eg if the link is missing).
+    if disk_uuid == "Unknown":
+        disk_uuid = get_udev_property(disk, "ID_FS_UUID")
+
+    #If udev has a record for this disk, it has already probed it.
+    if disk_uuid == "Unknown" and get_udev_info(disk):
+        return disk_uuid
+
+    #Fall back to the superblock if it's one we know, or blkid (eg if udev isn't
+    #running). blkid is only run for this disk if it hasn't probed every disk.
+    if disk_uuid == "Unknown":
+        if not BLKID_SCANNED and "TYPE" in get_superblock_info(disk):
+            disk_uuid = get_superblock_info(disk).get("UUID", "Unknown")
+
+        else:
+            disk_uuid = get_blkid_info(disk).get("UUID", "Unknown")
+
+    return disk_uuid
+
+def get_id(disk):
+    """
+    Private, implementation detail.
+
+    This function gets the ID of a given partition or device.
+
+    Args:
+        disk (str):   The name of a partition/device.
+
+    Returns:
+        string. The ID:
+
+            - "Unknown"     - Couldn't find it.
+            - Anything else - The ID.
+
+    Usage:
+
+    >>> disk_id = get_id(<aDiskName>)
+    """
+
+    disk_id = get_disk_link(disk, "by-id")
+
+    if disk_id != "Unknown":
+        return disk_id
+
+    #Fall back to udev's database, and name the ID like udev's by-id links.
+    properties = get_udev_info(disk)
+
+    if "ID_BUS" in properties and "ID_SERIAL" in properties:
+        disk_id = properties["ID_BUS"]+"-"+properties["ID_SERIAL"]
+
+    elif "ID_WWN_WITH_EXTENSION" in properties or "ID_WWN" in properties:
+        disk_id = "wwn-"+properties.get("ID_WWN_WITH_EXTENSION", properties.get("ID_WWN"))
+
+    else:
+        return "Unknown"
+
+    if "PARTN" in properties:
+        disk_id += "-part"+properties["PARTN"]
+
+    return disk_id
+
+def get_label(disk):
+    """
+    Private, implementation detail.
+
+    This function gets the file system label of a given partition.
+
+    Args:
+        disk (str):   The name of a **partition**.
+
+    Returns:
+        string. The label:
+
+            - "Unknown"     - Couldn't find it.
+            - Anything else - The label.
+
+    Usage:
+
+    >>> label = get_label(<aPartitionName>)
+    """
+
+    label = get_disk_link(disk, "by-label")
+
+    #Fall back to udev's database (eg if the link is missing).
+    if label == "Unknown":
+        label = get_udev_property(disk, "ID_FS_LABEL")
+
+    #If udev has a record for this disk, it has already probed it.
+    if label == "Unknown" and get_udev_info(disk):
+        return label
+
+    #Fall back to the superblock if it's one we know, or blkid (eg if udev isn't
+    #running). blkid is only run for this disk if it hasn't probed every disk.
+    if label == "Unknown":
+        if not BLKID_SCANNED and "TYPE" in get_superblock_info(disk):
+            label = get_superblock_info(disk).get("LABEL", "Unknown")
+
+        else:
+            label = get_blkid_info(disk).get("LABEL", "Unknown")
+
+    return label
+
+def get_partuuid(disk):
+    """
+    Private, implementation detail.
+
+    This function gets the partition UUID (from the partition
+    table, not the file system) of a given partition.
+
+    Args:
+        disk (str):   The name of a **partition**.
+
+    Returns:
+        string. The partition UUID:
+
+            - "Unknown"     - Couldn't find it.
+            - Anything else - The partition UUID.
+
+    Usage:
+
+    >>> partuuid = get_partuuid(<aPartitionName>)
+    """
+
+    return get_disk_link(disk, "by-partuuid")
+
+def get_path(disk):
     """
     Private, implementation detail.
 
-    This function is used to get NVME disk information from the output of lsblk.
+    This function gets the hardware path (eg pci-0000:00:17.0-ata-1)
+    of a given partition or device.
 
-    .. note::
-            This will only remain here until lshw adds support for NVME disk detection -
-            this is a temporary fix.
+    Args:
+        disk (str):   The name of a partition/device.
+
+    Returns:
+        string. The path:
+
+            - "Unknown"     - Couldn't find it.
+            - Anything else - The path.
 
     Usage:
 
-    >>> parse_lsblk_output()
+    >>> path = get_path(<aDiskName>)
+    """
+
+    return get_disk_link(disk, "by-path")
+
+def get_partition_table(disk, sector_size=None):
+    """
+    **Public**
+
+    .. note:
+        It is perfectly safe to use this. The partition table is only
+        read when lshw and udev don't know the partition scheme, so if
+        you want the details, just call this function with a device name
+        (or the path to a disk image) to get them.
+
+    This function reads a GPT or MBR partition table directly. The MBR,
+    GPT header and GPT partition entries are normally found with one read
+    of the start of the disk. Logical partitions inside MBR extended
+    partitions need another read each.
+
+    Args:
+        disk (str):                 The device or disk image to read.
+        sector_size(=None) (int):   The logical sector size for MBR partition
+                                    tables. Found from sysfs (or 512 for image
+                                    files) if None. GPT's sector size is found
+                                    from where its header is.
+
+    Returns:
+        dict. The partition table:
+
+            - "Scheme"      - "gpt", "mbr", or "Unknown" if there's no partition
+                              table, or it couldn't be read.
+            - "SectorSize"  - The sector size the LBAs are in.
+            - "DiskUUID"    - The GPT disk GUID, or MBR disk signature.
+            - "Partitions"  - A list of dictionaries, one per partition, with
+                              "Number", "StartLBA", "EndLBA", "Type" (a GUID,
+                              or an MBR type like "0x83"), "PartUUID" (as in
+                              /dev/disk/by-partuuid), "Name" ("N/A" for MBR),
+                              and "Aligned" (whether it starts on a 1 MiB
+                              boundary).
+
+    Usage:
+
+    >>> partition_table = get_partition_table(<aDeviceName>)
     """
 
+    if sector_size is None:
+        try:
+            sector_size = int(read_sysfs_file(SYSFS+"/class/block/"
+                                              + os.path.basename(os.path.realpath(disk))
+                                              + "/queue/logical_block_size"))
+
+        except ValueError:
+            #Not a device (eg an image file).
+            sector_size = 512
+
+    partition_table = {"Scheme": "Unknown", "SectorSize": sector_size, "DiskUUID": "Unknown",
+                       "Partitions": []}
+
     try:
-        data = json.loads(LSBLKOUTPUT)
+        file_descriptor = os.open(disk, os.O_RDONLY)
 
-    except ValueError:
-        #Not a valid JSON document!
-        ERRORS.append("linux.parse_lsblk_output(): lsblk output is not valid JSON! Output: "
-                      + LSBLKOUTPUT+"\n")
+        try:
+            head = os.pread(file_descriptor, PARTITION_TABLE_READ_SIZE, 0)
+
+            #The GPT header is in LBA1, so where it is tells us the sector size.
+            for gpt_sector_size in (sector_size, 512, 4096):
+                if head[gpt_sector_size:gpt_sector_size+8] == b"EFI PART":
+                    partition_table["SectorSize"] = gpt_sector_size
+                    parse_gpt(file_descriptor, head, partition_table)
+                    break
+
+            #Fall back to the MBR if there's no GPT, or it's corrupt.
+            if partition_table["Scheme"] == "Unknown":
+                partition_table["SectorSize"] = sector_size
+                parse_mbr(file_descriptor, head, partition_table)
+
+        finally:
+            os.close(file_descriptor)
+
+    except (OSError, struct.error) as err:
+        ERRORS.append("linux.get_partition_table(): Exception: "+str(err)
+                      + " while reading partition table of "+disk+"\n")
+
+        partition_table["Partitions"] = []
+
+    return partition_table
+
+def parse_gpt(file_descriptor, head, partition_table):
+    """
+    Private, implementation detail.
+
+    This function parses a GPT partition table, for get_partition_table().
+
+    Args:
+        file_descriptor (int):  The open disk, to read the partition
+                                entries from if they're not in head.
+
+        head (bytes):           The start of the disk.
+        partition_table (dict): Where to put the results.
+
+    Usage:
+
+    >>> parse_gpt(<aFileDescriptor>, <someBytes>, <aDict>)
+    """
+
+    sector_size = partition_table["SectorSize"]
+
+    #Skip the signature, revision, reserved field and the LBAs we don't need.
+    (header_size, header_crc, disk_guid, entries_lba, number_of_entries, entry_size,
+     entries_crc) = struct.unpack_from("<12xII4x32x16sQIII", head, sector_size)
+
+    header = bytearray(head[sector_size:sector_size+header_size])
+    header[16:20] = b"\x00\x00\x00\x00"
+
+    if header_size < 92 or zlib.crc32(header) != header_crc or entry_size < 128:
+        ERRORS.append("linux.parse_gpt(): GPT header is corrupt, ignoring it\n")
         return
 
-    for disk in data["blockdevices"]:
-        host_disk = "/dev/"+disk["name"]
+    partition_table["Scheme"] = "gpt"
+    partition_table["DiskUUID"] = str(uuid.UUID(bytes_le=disk_guid))
 
-        #If this disk is already in the DISKINFO dictionary, ignore it.
-        if host_disk in DISKINFO:
-            continue
+    #Usually the entries start at LBA2, so we already have them.
+    start = entries_lba * sector_size
+    length = number_of_entries * entry_size
 
-        #Ignore loop, zram, and nbd devices.
-        if "/dev/loop" in host_disk or "/dev/zram" in host_disk or "/dev/nbd" in host_disk:
+    if start + length <= len(head):
+        entries = head[start:start+length]
+
+    else:
+        entries = os.pread(file_descriptor, length, start)
+
+    if zlib.crc32(entries) != entries_crc:
+        ERRORS.append("linux.parse_gpt(): GPT partition entries are corrupt, ignoring them\n")
+        return
+
+    for number in range(number_of_entries):
+        entry = entries[number*entry_size:(number+1)*entry_size]
+
+        #Unused entries have no type.
+        if entry[:16] == bytes(16):
             continue
 
-        DISKINFO[host_disk] = {}
-        DISKINFO[host_disk]["Name"] = host_disk
-        DISKINFO[host_disk]["Type"] = "Device"
-        DISKINFO[host_disk]["HostDevice"] = "N/A"
-        DISKINFO[host_disk]["Partitions"] = []
+        start_lba, end_lba = struct.unpack_from("<QQ", entry, 32)
 
-        try:
-            DISKINFO[host_disk]["Vendor"] = disk["vendor"].strip()
+        partition_table["Partitions"].append(
+            {"Number": number + 1,
+             "StartLBA": start_lba,
+             "EndLBA": end_lba,
+             "Type": str(uuid.UUID(bytes_le=entry[:16])),
+             "PartUUID": str(uuid.UUID(bytes_le=entry[16:32])),
+             "Name": entry[56:128].decode("utf-16-le", errors="replace").split("\x00")[0],
+             "Aligned": (start_lba * sector_size) % PARTITION_ALIGNMENT == 0})
 
-        except KeyError:
-            DISKINFO[host_disk]["Vendor"] = "Unknown"
+def parse_mbr(file_descriptor, head, partition_table):
+    """
+    Private, implementation detail.
 
-        try:
-            DISKINFO[host_disk]["Product"] = disk["model"].strip()
+    This function parses an MBR partition table, including any logical
+    partitions, for get_partition_table().
 
-        except KeyError:
-            DISKINFO[host_disk]["Product"] = "Unknown"
+    Args:
+        file_descriptor (int):  The open disk, to read extended boot
+                                records from.
 
-        DISKINFO[host_disk]["UUID"] = "N/A"
-        DISKINFO[host_disk]["FileSystem"] = "N/A"
+        head (bytes):           The start of the disk.
+        partition_table (dict): Where to put the results.
 
-        try:
-            DISKINFO[host_disk]["RawCapacity"] = str(disk["size"])
+    Usage:
 
-        except KeyError:
-            DISKINFO[host_disk]["RawCapacity"] = "Unknown"
+    >>> parse_mbr(<aFileDescriptor>, <someBytes>, <aDict>)
+    """
 
-        #Calculate human-readable capacity.
-        #Round the sizes to make them human-readable.
-        unit_list = [None, "B", "KB", "MB", "GB", "TB", "PB", "EB"]
-        unit = "B"
+    sector_size = partition_table["SectorSize"]
 
-        try:
-            human_readable_size = int(DISKINFO[host_disk]["RawCapacity"])
+    if head[510:512] != b"\x55\xaa":
+        return
 
-            while len(str(human_readable_size)) > 3:
-                #Shift up one unit.
-                unit = unit_list[unit_list.index(unit)+1]
-                human_readable_size = human_readable_size//1000
+    entries = [struct.unpack_from("<B3xB3xII", head, 446+(number*16)) for number in range(4)]
 
-        except (KeyError, ValueError, IndexError):
-            DISKINFO[host_disk]["Capacity"] = "Unknown"
+    #File systems have boot sectors that end in 55 AA too, but they don't
+    #have valid boot flags where the partition entries would be.
+    if any(status not in (0x00, 0x80) for status, _type, _start, _sectors in entries):
+        return
 
-        else:
-            DISKINFO[host_disk]["Capacity"] = str(human_readable_size)+" "+unit
+    #If they do, only treat them as an MBR if there are partitions.
+    if all(partition_type == 0x00 for _status, partition_type, _start, _sectors in entries) \
+        and (head[3:11] in (b"NTFS    ", b"EXFAT   ") or b"FAT" in (head[54:57], head[82:85])):
 
-        DISKINFO[host_disk]["BootRecord"], DISKINFO[host_disk]["BootRecordStrings"] = get_boot_record(host_disk)
+        return
 
-        DISKINFO[host_disk]["Description"] = generate_description(host_disk)
-        DISKINFO[host_disk]["Flags"] = "Unknown"
-        DISKINFO[host_disk]["Partitioning"] = "Unknown"
-        DISKINFO[host_disk]["ID"] = get_id(host_disk)
+    disk_signature = struct.unpack_from("<I", head, 440)[0]
 
-        #Get any partitions as well.
-        if "children" in disk:
-            for child in disk["children"]:
-                child_disk = "/dev/"+child["name"]
+    partition_table["Scheme"] = "mbr"
+    partition_table["DiskUUID"] = format(disk_signature, "08x")
 
-                DISKINFO[child_disk] = {}
-                DISKINFO[child_disk]["Name"] = child_disk
-                DISKINFO[child_disk]["Type"] = "Partition"
-                DISKINFO[child_disk]["HostDevice"] = host_disk
-                DISKINFO[child_disk]["Partitions"] = []
-                DISKINFO[host_disk]["Partitions"].append(child_disk)
-                DISKINFO[child_disk]["Vendor"] = "N/A"
-                DISKINFO[child_disk]["Product"] = "Host Device: "+DISKINFO[host_disk]["Product"]
+    for number, (_status, partition_type, start_lba, sectors) in enumerate(entries, 1):
+        if partition_type == 0x00:
+            continue
 
-                try:
-                    if child["uuid"] is None:
-                        DISKINFO[child_disk]["UUID"] = "Unknown"
+        #A protective MBR, but the GPT header couldn't be found.
+        if partition_type == 0xee:
+            partition_table["Scheme"] = "gpt"
+            partition_table["Partitions"] = []
+            return
 
-                    else:
-                        DISKINFO[child_disk]["UUID"] = child["uuid"]
+        partition_table["Partitions"].append(get_mbr_partition(number, partition_type, start_lba,
+                                                               sectors, partition_table))
 
-                except KeyError:
-                    DISKINFO[child_disk]["UUID"] = "Unknown"
+        if partition_type not in MBR_EXTENDED_TYPES:
+            continue
 
-                try:
-                    DISKINFO[child_disk]["FileSystem"] = child["fstype"]
+        #Follow the chain of extended boot records. Each one has a logical partition
+        #(relative to itself), and a link to the next one (relative to the extended
+        #partition).
+        logical_number = 5
+        ebr_lba = start_lba
+        seen = set()
 
-                except KeyError:
-                    DISKINFO[child_disk]["FileSystem"] = "Unknown"
+        while ebr_lba not in seen and len(seen) < 256:
+            seen.add(ebr_lba)
+            ebr = os.pread(file_descriptor, 512, ebr_lba * sector_size)
 
-                if DISKINFO[child_disk]["FileSystem"] is None:
-                    DISKINFO[child_disk]["FileSystem"] = "Unknown"
+            if len(ebr) < 512 or ebr[510:512] != b"\x55\xaa":
+                break
 
-                try:
-                    DISKINFO[child_disk]["RawCapacity"] = str(child["size"])
+            #Skip the status (and CHS addresses), which we don't need.
+            logical_type, logical_start, logical_sectors = struct.unpack_from("<4xB3xII", ebr, 446)
+            next_type, next_start = struct.unpack_from("<4xB3xI", ebr, 462)
 
-                except KeyError:
-                    DISKINFO[child_disk]["RawCapacity"] = "Unknown"
+            if logical_type != 0x00:
+                partition_table["Partitions"].append(
+                    get_mbr_partition(logical_number, logical_type, ebr_lba + logical_start,
+                                      logical_sectors, partition_table))
 
-                #Calculate human-readable capacity.
-                #Round the sizes to make them human-readable.
-                unit_list = [None, "B", "KB", "MB", "GB", "TB", "PB", "EB"]
-                unit = "B"
+                logical_number += 1
 
-                try:
-                    human_readable_size = int(DISKINFO[child_disk]["RawCapacity"])
+            if next_type == 0x00:
+                break
 
+            ebr_lba = start_lba + next_start
 
-                    while len(str(human_readable_size)) > 3:
-                        #Shift up one unit.
-                        unit = unit_list[unit_list.index(unit)+1]
-                        human_readable_size = human_readable_size//1000
+def get_mbr_partition(number, partition_type, start_lba, sectors, partition_table):
+    """
+    Private, implementation detail.
 
-                except (KeyError, ValueError, IndexError):
-                    DISKINFO[child_disk]["Capacity"] = "Unknown"
+    This function describes an MBR partition, for parse_mbr().
 
-                else:
-                    DISKINFO[child_disk]["Capacity"] = str(human_readable_size)+" "+unit
+    Args:
+        number (int):           The partition number (logical partitions start at 5).
+        partition_type (int):   The partition type, eg 0x83.
+        start_lba (int):        The first sector, from the start of the disk.
+        sectors (int):          The number of sectors.
+        partition_table (dict): The partition table the partition is in.
 
-                DISKINFO[child_disk]["BootRecord"], DISKINFO[child_disk]["BootRecordStrings"] = get_boot_record(child_disk)
+    Returns:
+        dict. The partition, as described in get_partition_table().
 
-                DISKINFO[child_disk]["Description"] = "N/A"
-                DISKINFO[child_disk]["Flags"] = "Unknown"
-                DISKINFO[child_disk]["Partitioning"] = "N/A"
-                DISKINFO[child_disk]["ID"] = get_id(child_disk)
+    Usage:
 
-def get_vendor(node):
+    >>> partition = get_mbr_partition(<aNumber>, <aType>, <anLBA>, <aSize>, <aDict>)
+    """
+
+    return {"Number": number,
+            "StartLBA": start_lba,
+            "EndLBA": start_lba + sectors - 1,
+            "Type": "0x"+format(partition_type, "02x"),
+            "PartUUID": partition_table["DiskUUID"]+"-"+format(number, "02x"),
+            "Name": "N/A",
+            "Aligned": (start_lba * partition_table["SectorSize"]) % PARTITION_ALIGNMENT == 0}
+
+def get_boot_record(disk):
     """
     Private, implementation detail.
 
-    This function gets the vendor from the structure generated
-    by parsing lshw's XML output.
+    This function gets the MBR/PBR of a given disk. The first sector is
+    read directly, rather than with dd and strings.
 
     Args:
-        node:   Represents a device/partition.
+        disk (str):   The name of a partition/device.
 
     Returns:
-        string. The vendor:
+        tuple (string, string). The boot record (raw, any readable strings):
 
-            - "Unknown"     - Couldn't find it.
-            - Anything else - The vendor.
+            - ("Unknown", "Unknown")     - Couldn't read it.
+            - Anything else              - The PBR/MBR and any readable strings therein.
 
     Usage:
 
-    >>> vendor = get_vendor(<aNode>)
+    >>> boot_record, boot_record_strings = get_boot_record(<aDiskName>)
     """
 
-    if hasattr(node.vendor, "string"):
-        if isinstance(node.vendor.string, bytes):
-            return node.vendor.string.decode("utf-8", errors="replace")
+    #Don't wake up sleeping disks.
+    if is_sleeping(disk):
+        return ("Unknown", ["Unknown"])
 
-        if isinstance(node.vendor.string, str):
-            return node.vendor.string #Already a unicode string.
+    try:
+        file_descriptor = os.open(disk, os.O_RDONLY)
 
-    return "Unknown"
+        try:
+            boot_record = os.pread(file_descriptor, 512, 0)
 
-def get_product(node):
+        finally:
+            os.close(file_descriptor)
+
+    except OSError as err:
+        ERRORS.append("linux.get_boot_record(): Exception: "+str(err)
+                      + " while reading boot record\n")
+
+        return ("Unknown", ["Unknown"])
+
+    return (boot_record.decode("utf-8", errors="replace"), get_boot_record_strings(boot_record))
+
+def get_boot_record_strings(boot_record):
     """
     Private, implementation detail.
 
-    This function gets the product from the structure generated
-    by parsing lshw's XML output.
+    This function finds the readable strings in a boot record, the same way
+    as the strings command does: runs of at least 4 printable ASCII characters
+    (including tabs). As before, spaces are removed from each string, and the
+    list ends with an empty string (where strings' output ended with a newline).
 
     Args:
-        node:   Represents a device/partition.
+        boot_record (bytes):    The raw boot record.
 
     Returns:
-        string. The product:
-
-            - "Unknown"     - Couldn't find it.
-            - Anything else - The product.
+        list. The readable strings.
 
     Usage:
 
-    >>> product = get_product(<aNode>)
+    >>> boot_record_strings = get_boot_record_strings(<someBytes>)
     """
 
-    if hasattr(node.product, "string"):
-        if isinstance(node.product.string, bytes):
-            return node.product.string.decode("utf-8", errors="replace")
+    boot_record_strings = [string.decode("ascii").replace(" ", "")
+                           for string in PRINTABLE_STRING_REGEX.findall(boot_record)]
 
-        if isinstance(node.product.string, str):
-            return node.product.string #Already a unicode string.
+    boot_record_strings.append("")
 
-    return "Unknown"
+    return boot_record_strings
 
-def get_capacity(node):
+def get_blkid_index(disks=None, future=None):
     """
     Private, implementation detail.
 
-    This function gets the capacity from the structure generated
-    by parsing lshw's XML output. Also rounds it to a human-
-    readable form, and returns both sizes.
+    This function runs blkid once to probe the file systems on all disks
+    (or the given disks), and indexes the results by device name. The cache
+    file is bypassed so that the results are up to date.
 
     Args:
-        node:   Represents a device/partition.
+        disks(=None) (list):    The disks to probe. Probes all disks if None.
+        future(=None) (Future): blkid, if it has already been started with
+                                start_commands(). It is run here if None.
 
     Returns:
-        tuple (string, string). The sizes (bytes, human-readable):
+        tuple (dict, bool). The index and whether blkid ran successfully:
+
+            - ({}, False)   - Couldn't run blkid.
+            - Anything else - Each device name (and the path it resolves to),
+                              mapped to a dictionary of blkid's tags, eg
+                              {"TYPE": "ext4", "UUID": ..., "LABEL": ...}.
+
+    Usage:
+
+    >>> blkid_index, success = get_blkid_index()
+
+    OR:
+
+    >>> blkid_index, success = get_blkid_index([<aDiskName>])
+
+    OR:
+
+    >>> blkid_index, success = get_blkid_index(future=<aFuture>)
+    """
+
+    if future is None:
+        future = start_commands({"blkid": BLKID_COMMAND + tuple(disks or ())})["blkid"]
+
+    try:
+        #blkid returns 2 if it didn't find anything.
+        cmd = finish_command(future, ok_statuses=(0, 2))
+
+    except OSError as err:
+        ERRORS.append("linux.get_blkid_index(): Exception: "+str(err)+" while running blkid\n")
+        return {}, False
+
+    except subprocess.CalledProcessError as err:
+        ERRORS.append("linux.get_blkid_index(): blkid exited with status "+str(err.returncode)
+                      + ": "+err.stderr.decode("utf-8", errors="replace")+"\n")
+
+        return {}, False
+
+    except subprocess.SubprocessError as err:
+        ERRORS.append("linux.get_blkid_index(): Exception: "+str(err)+" while running blkid\n")
+        return {}, False
+
+    return parse_blkid_output(cmd.stdout.decode("utf-8", errors="replace")), True
+
+def parse_blkid_output(stdout):
+    """
+    Private, implementation detail.
+
+    This function parses the output of blkid -o export into an index.
+
+    Args:
+        stdout (str):   blkid's output.
 
-            - ("Unknown", "Unknown")     - Couldn't find them.
-            - Anything else              - The sizes.
+    Returns:
+        dict. Each device name (and the path it resolves to), mapped
+        to a dictionary of blkid's tags.
 
     Usage:
 
-    >>> raw_size, human_size = get_capacity(<aNode>)
+    >>> blkid_index = parse_blkid_output(<blkidOutput>)
     """
 
-    if hasattr(node, "size") and hasattr(node.size, "string"):
-        #This is actually an int, despite the misleading name.
-        raw_capacity = str(node.size.string)
-
-    elif hasattr(node, "capacity") and hasattr(node.capacity, "string"):
-        #This is actually an int, despite the misleading name.
-        raw_capacity = str(node.capacity.string)
+    blkid_index = {}
 
-    else:
-        return "Unknown", "Unknown"
+    #Each device is a block of KEY=value lines, separated by blank lines.
+    for block in stdout.split("\n\n"):
+        tags = {}
 
-    #Round the sizes to make them human-readable.
-    unit_list = [None, "B", "KB", "MB", "GB", "TB", "PB", "EB"]
-    unit = "B"
+        for line in block.split("\n"):
+            if "=" not in line:
+                continue
 
-    #Return Unknown, Unknown if this is not an integer.
-    try:
-        human_readable_size = int(raw_capacity)
+            key, value = line.split("=", 1)
+            tags[key] = BLKID_ESCAPE_REGEX.sub(r"\1", value)
 
-    except ValueError:
-        return "Unknown", "Unknown"
+        if "DEVNAME" not in tags:
+            continue
 
-    try:
-        while len(str(human_readable_size)) > 3:
-            #Shift up one unit.
-            unit = unit_list[unit_list.index(unit)+1]
-            human_readable_size = human_readable_size//1000
+        blkid_index[tags["DEVNAME"]] = tags
 
-    except IndexError:
-        return "Unknown", "Unknown"
+        #Also index LVs etc by the name the kernel knows them by (eg /dev/dm-0).
+        blkid_index.setdefault(os.path.realpath(tags["DEVNAME"]), tags)
 
-    #Include the unit in the result for both exact and human-readable sizes.
-    return raw_capacity, str(human_readable_size)+" "+unit
+    return blkid_index
 
-def get_capabilities(node):
+def get_blkid_info(disk):
     """
     Private, implementation detail.
 
-    This function gets the capabilities from the structure
-    generated by parsing lshw's XML output.
+    This function looks up a disk in the blkid index. If blkid hasn't been
+    run for all disks in this scan (eg when calling these functions directly),
+    the disk is probed on its own, and the result is remembered, so no disk is
+    ever probed twice.
 
     Args:
-        node:   Represents a device/partition.
+        disk (str):   The name of a partition/device/logical volume.
 
     Returns:
-        list. The capabilities:
-
-            - []            - Couldn't find them.
-            - Anything else - The capabilities - as unicode strings.
+        dict. blkid's tags for this disk (empty if it didn't find anything).
 
     Usage:
 
-    >>> capabilities = get_capabilities(<aNode>)
+    >>> tags = get_blkid_info(<aDiskName>)
     """
 
-    flags = []
-
-    try:
-        for capability in node.capabilities.children:
-            if (not isinstance(capability, bs4.element.Tag)) or capability.name != "capability":
-                continue
+    if disk in BLKID_INDEX:
+        return BLKID_INDEX[disk]
 
-            if isinstance(capability["id"], bytes):
-                flags.append(capability["id"].decode("utf-8", errors="replace"))
+    realpath = os.path.realpath(disk)
 
-            elif isinstance(capability["id"], str):
-                flags.append(capability["id"])
+    if realpath in BLKID_INDEX:
+        return BLKID_INDEX[realpath]
 
-    except AttributeError:
-        return []
+    #If blkid already probed everything, there's nothing to find.
+    if not BLKID_SCANNED and not is_sleeping(disk):
+        BLKID_INDEX.update(get_blkid_index([disk])[0])
 
-    else:
-        return flags
+    return BLKID_INDEX.setdefault(disk, BLKID_INDEX.get(realpath, {}))
 
-def generate_description(disk):
+def get_lv_file_system(disk):
     """
     Private, implementation detail.
 
-    This function generates a description for the given disk. This is used when
-    the disk came from lsblk's output, so we don't have a description generated
-    from lshw to use.
+    This function gets the file system of a logical volume
+    (or any other disk) from udev's database. If udev doesn't
+    know about the disk, it comes from the blkid index if blkid
+    has probed every disk, or from the superblock. blkid is only
+    run for this disk if the superblock isn't one we know.
 
     Args:
-        disk (str):   The name of a device/partition in
-                      the disk info dictionary.
+        disk (str):   The name of a logical volume.
 
     Returns:
-        string (str). A description.
+        string. The file system.
 
     Usage:
 
-    >>> description = generate_description(<aDiskName>)
+    >>> file_system = get_lv_file_system(<anLVName>)
     """
 
-    if "nvme" in disk:
-        return "NVME SSD"
-
-    if "cdrom" in disk or "sr" in disk or "scd" in disk:
-        return "Optical Drive"
+    #If udev has a record for this disk, it has already probed it.
+    if get_udev_info(disk):
+        return get_udev_property(disk, "ID_FS_TYPE")
 
-    if "sd" in disk or "hd" in disk:
-        return "Hard Disk Drive or SATA SSD"
+    if not BLKID_SCANNED and "TYPE" in get_superblock_info(disk):
+        return get_superblock_info(disk)["TYPE"]
 
-    return "None"
+    return get_blkid_info(disk).get("TYPE", "Unknown")
 
-def get_partitioning(disk):
+def get_superblock_info(disk):
     """
     Private, implementation detail.
 
-    This function gets the partition scheme from the
-    structure generated by parsing lshw's XML output.
+    This function reads the start of a disk with one read, and looks for
+    a file system superblock (or other signature) in it, rather than
+    running blkid. The result is remembered, so no disk is read twice.
 
     Args:
-        disk (str):   The name of a device/partition in
-                      the disk info dictionary.
+        disk (str):   The name of a partition/device/logical volume.
 
     Returns:
-        string (str). The partition scheme:
-
-            - "Unknown"     - Couldn't find it.
-            - "mbr"         - Old-style MBR partitioning
-                              for BIOS systems.
-            - "gpt"         - New-style GPT partitioning.
+        dict. The same tags as blkid ("TYPE", "UUID" and "LABEL"), where
+        they were found. Empty if nothing was found, or the disk couldn't
+        be read.
 
     Usage:
 
-    >>> partitioning = get_partitioning(<aDiskName>)
+    >>> tags = get_superblock_info(<aDiskName>)
     """
+
+    if disk in SUPERBLOCK_INDEX:
+        return SUPERBLOCK_INDEX[disk]
+
+    if is_sleeping(disk):
+        return {}
+
     try:
-        partitioning = DISKINFO[disk]["Flags"][-1].split(":")[-1]
+        file_descriptor = os.open(disk, os.O_RDONLY)
 
-        if partitioning in ("gpt", "dos"):
-            if partitioning == "dos":
-                partitioning = "mbr"
+        try:
+            data = os.pread(file_descriptor, SUPERBLOCK_READ_SIZE, 0)
 
-        else:
-            partitioning = "Unknown"
+        finally:
+            os.close(file_descriptor)
 
-    #Fix for unpartitioned disks.
-    except (IndexError, KeyError):
-        partitioning = "Unknown"
+    except OSError as err:
+        ERRORS.append("linux.get_superblock_info(): Exception: "+str(err)
+                      + " while reading superblock of "+disk+"\n")
 
-    return partitioning
+        data = b""
 
-def get_file_system(node):
+    return SUPERBLOCK_INDEX.setdefault(disk, probe_superblock(data))
+
+def probe_superblock(data):
     """
     Private, implementation detail.
 
-    This function gets the file system from the structure
-    generated by parsing lshw's XML output.
+    This function identifies the file system (or LUKS container, LVM
+    physical volume, swap area, or ZFS pool member) at the start of a
+    disk, using the same names as blkid.
 
     Args:
-        node:   Represents a device/partition.
+        data (bytes):   The start of the disk (at least SUPERBLOCK_READ_SIZE
+                        bytes, unless the disk is smaller).
 
     Returns:
-        string. The file system:
-
-            - "Unknown"     - Couldn't find it.
-            - Anything else - The file system.
+        dict. The tags: "TYPE", and "UUID" and "LABEL" where the file
+        system has them. Empty if nothing was recognised.
 
     Usage:
 
-    >>> file_system = get_file_system(<aNode>)
+    >>> tags = probe_superblock(<someBytes>)
     """
 
-    file_system = "Unknown"
-    diskname = "Unknown"
+    data = data.ljust(SUPERBLOCK_READ_SIZE, b"\x00")
+    tags = {}
 
-    try:
-        if isinstance(node.logicalname.string, bytes):
-            diskname = node.logicalname.string.decode("utf-8") #NOTE: is this ever bytes?
+    #LVM's label can be in any of the first 4 sectors.
+    lvm_offset = next((offset for offset in range(0, 2048, 512)
+                       if data[offset:offset+8] == b"LABELONE"
+                       and data[offset+24:offset+32] == b"LVM2 001"), None)
+
+    #Swap's signature is at the end of the first page, whatever size that was.
+    swap_signature = next((data[page_size-10:page_size] for page_size in (4096, 8192, 16384, 65536)
+                           if data[page_size-10:page_size] in (b"SWAPSPACE2", b"SWAP-SPACE")), None)
+
+    if data[0:6] == b"LUKS\xba\xbe":
+        tags["TYPE"] = "crypto_LUKS"
+        tags["UUID"] = get_superblock_string(data[168:208])
+
+        #Only LUKS2 has labels.
+        if struct.unpack_from(">H", data, 6)[0] == 2:
+            tags["LABEL"] = get_superblock_string(data[24:72])
+
+    elif lvm_offset is not None:
+        pv_uuid = data[lvm_offset+32:lvm_offset+64].decode("ascii", errors="replace")
+        tags["TYPE"] = "LVM2_member"
+        tags["UUID"] = "-".join((pv_uuid[0:6], pv_uuid[6:10], pv_uuid[10:14], pv_uuid[14:18],
+                                 pv_uuid[18:22], pv_uuid[22:26], pv_uuid[26:32]))
+
+    elif data[0:4] == b"XFSB":
+        tags["TYPE"] = "xfs"
+        tags["UUID"] = str(uuid.UUID(bytes=data[32:48]))
+        tags["LABEL"] = get_superblock_string(data[108:120])
+
+    elif data[65600:65608] == b"_BHRfS_M":
+        tags["TYPE"] = "btrfs"
+        tags["UUID"] = str(uuid.UUID(bytes=data[65568:65584]))
+        tags["LABEL"] = get_superblock_string(data[65835:66091])
+
+    elif struct.unpack_from("<H", data, 1080)[0] == 0xef53:
+        compat, incompat, ro_compat = struct.unpack_from("<III", data, 1116)
+
+        #Journal devices are ext3/4 journals on their own.
+        if incompat & 0x8:
+            tags["TYPE"] = "jbd"
+
+        #Anything ext3 doesn't support (besides the file type, recovery, and
+        #meta block group features) makes it ext4.
+        elif incompat & ~0x16 or ro_compat & ~0x7:
+            tags["TYPE"] = "ext4"
+
+        #Ext3 is ext2 with a journal.
+        elif compat & 0x4:
+            tags["TYPE"] = "ext3"
 
         else:
-            diskname = node.logicalname.string
+            tags["TYPE"] = "ext2"
 
-    except AttributeError:
-        pass
+        tags["UUID"] = str(uuid.UUID(bytes=data[1128:1144]))
+        tags["LABEL"] = get_superblock_string(data[1144:1160])
 
-    try:
-        for config in node.configuration.children:
-            if (not isinstance(config, bs4.element.Tag)) or config.name != "setting":
-                continue
+    elif data[32768] == 1 and data[32769:32774] == b"CD001":
+        tags["TYPE"] = "iso9660"
+        tags["LABEL"] = get_superblock_string(data[32808:32840])
 
-            if config["id"] == "filesystem":
-                if isinstance(config["value"], bytes):
-                    file_system = config["value"].decode("utf-8", errors="replace")
+        #The UUID is the volume's creation time, like blkid.
+        created = data[33581:33597].decode("ascii", errors="replace")
 
-                elif isinstance(config["value"], str):
-                    file_system = config["value"] #Already a unicode string.
+        if created.isdigit() and created != "0" * 16:
+            tags["UUID"] = "-".join((created[0:4], created[4:6], created[6:8], created[8:10],
+                                     created[10:12], created[12:14], created[14:16]))
 
-                #Use different terminology where wanted.
-                if file_system == "fat":
-                    file_system = "vfat"
+    elif swap_signature is not None:
+        tags["TYPE"] = "swap"
 
-                break
+        #Old swap areas have no UUID or label.
+        if swap_signature == b"SWAPSPACE2":
+            tags["UUID"] = str(uuid.UUID(bytes=data[1036:1052]))
+            tags["LABEL"] = get_superblock_string(data[1052:1068])
 
-    except AttributeError:
-        pass
+    elif data[3:11] == b"NTFS    ":
+        tags["TYPE"] = "ntfs"
+        tags["UUID"] = format(struct.unpack_from("<Q", data, 72)[0], "016X")
 
-    #Fall back to LVM equivelant if needed (works on all disks and
-    #detects some things that lshw does not).
-    if file_system == "Unknown" and diskname != "Unknown":
-        return get_lv_file_system(diskname)
+    elif data[3:11] == b"EXFAT   ":
+        serial = struct.unpack_from("<I", data, 100)[0]
+        tags["TYPE"] = "exfat"
+        tags["UUID"] = format(serial >> 16, "04X")+"-"+format(serial & 0xffff, "04X")
 
-    return file_system
+    elif data[510:512] == b"\x55\xaa" and (data[82:87] == b"FAT32" or data[54:57] == b"FAT"):
+        #FAT32 keeps its volume ID and label further in than FAT12/16.
+        offset = 67 if data[82:87] == b"FAT32" else 39
 
-def get_uuid(disk):
-    """
-    Private, implementation detail.
+        serial = struct.unpack_from("<I", data, offset)[0]
+        tags["TYPE"] = "vfat"
+        tags["UUID"] = format(serial >> 16, "04X")+"-"+format(serial & 0xffff, "04X")
+        tags["LABEL"] = get_superblock_string(data[offset+4:offset+15])
 
-    This function gets the UUID of a given partition.
+        if tags["LABEL"] == "NO NAME":
+            tags["LABEL"] = ""
 
-    Args:
-        disk (str):   The name of a **partition**.
+    elif 0x00bab10c in struct.unpack_from("<Q", data, 131072) + struct.unpack_from(">Q", data,
+                                                                                  131072):
 
-    Returns:
-        string. The UUID:
+        tags["TYPE"] = "zfs_member"
+        tags.update(get_zfs_pool_info(data[16384:131072]))
 
-            - "Unknown"     - Couldn't find it.
-            - Anything else - The UUID.
+    #Leave out empty labels, like blkid.
+    if tags.get("LABEL") == "":
+        del tags["LABEL"]
 
-    Usage:
+    return tags
 
-    >>> uuid = get_uuid(<aPartitionName>)
+def get_superblock_string(raw):
     """
+    Private, implementation detail.
 
-    uuid = "Unknown"
+    This function decodes a string (eg a label) from a superblock.
+    These are padded with NUL characters or spaces.
 
-    #Try to get the UUID from ls's output.
-    for line in LSUUIDOUTPUT.split('\n'):
-        line = line.replace("'", "")
+    Args:
+        raw (bytes):    The string's field in the superblock.
 
-        try:
-            split_line = line.split()
+    Returns:
+        string. The string, which may be empty.
 
-            if "../../"+disk.split('/')[-1] == split_line[-1]:
-                uuid = split_line[-3]
-                break
+    Usage:
 
-        except IndexError:
-            pass
+    >>> label = get_superblock_string(<someBytes>)
+    """
 
-    return uuid
+    return raw.split(b"\x00")[0].decode("utf-8", errors="replace").strip()
 
-def get_id(disk):
+def get_zfs_pool_info(nvlist):
     """
     Private, implementation detail.
 
-    This function gets the ID of a given partition or device.
+    This function gets the pool name and GUID from a ZFS vdev label's
+    configuration, which is an XDR-encoded name-value list.
 
     Args:
-        disk (str):   The name of a partition/device.
+        nvlist (bytes): The configuration (bytes 16 KiB to 128 KiB of the label).
 
     Returns:
-        string. The ID:
-
-            - "Unknown"     - Couldn't find it.
-            - Anything else - The ID.
+        dict. "LABEL" (the pool name) and "UUID" (the pool GUID), where
+        they were found.
 
     Usage:
 
-    >>> disk_id = get_id(<aDiskName>)
+    >>> tags = get_zfs_pool_info(<someBytes>)
     """
 
-    disk_id = "Unknown"
+    tags = {}
 
-    #Try to get the ID from ls's output.
-    for line in LSIDOUTPUT.split('\n'):
-        line = line.replace("'", "")
+    #Skip the encoding header, version and flags. Then each pair is its size, decoded
+    #size, name, data type, number of elements, and value, all big-endian.
+    offset = 12
 
-        try:
-            split_line = line.split()
+    try:
+        while offset + 12 <= len(nvlist):
+            encoded_size = struct.unpack_from(">I", nvlist, offset)[0]
 
-            if "../../"+disk.split('/')[-1] == split_line[-1]:
-                disk_id = split_line[-3]
+            if encoded_size == 0:
                 break
 
-        except IndexError:
-            pass
+            name_length = struct.unpack_from(">I", nvlist, offset+8)[0]
+            name = nvlist[offset+12:offset+12+name_length]
+            value_offset = offset + 12 + (name_length + 3) // 4 * 4
+            data_type = struct.unpack_from(">I", nvlist, value_offset)[0]
 
-    return disk_id
+            if name == b"name" and data_type == 9:
+                length = struct.unpack_from(">I", nvlist, value_offset+8)[0]
+                tags["LABEL"] = nvlist[value_offset+12:value_offset+12+length].decode(
+                    "utf-8", errors="replace")
 
-def get_boot_record(disk):
+            elif name == b"pool_guid" and data_type == 8:
+                tags["UUID"] = str(struct.unpack_from(">Q", nvlist, value_offset+8)[0])
+
+            offset += encoded_size
+
+    except struct.error:
+        pass
+
+    return tags
+
+def get_dm_index(dev_path="/dev"):
     """
     Private, implementation detail.
 
-    This function gets the MBR/PBR of a given disk.
+    This function indexes the logical volumes in /dev/mapper, so that
+    their aliases and names can be looked up without checking for
+    each possible path. Device mapper devices that sysfs says aren't
+    logical volumes (eg LUKS volumes) are skipped.
 
     Args:
-        disk (str):   The name of a partition/device.
+        dev_path(="/dev") (str):    Where the device nodes are.
 
     Returns:
-        tuple (string, string). The boot record (raw, any readable strings):
+        tuple (dict, dict). The indexes (volumes, names):
 
-            - ("Unknown", "Unknown")     - Couldn't read it.
-            - Anything else              - The PBR/MBR and any readable strings therein.
+            - volumes maps each (vg_name, lv_name) to a list of aliases,
+              eg ("fedora", "root"): ["/dev/mapper/fedora-root", "/dev/fedora/root"].
+            - names maps each alias back to (vg_name, lv_name).
 
     Usage:
 
-    >>> boot_record, boot_record_strings = get_boot_record(<aDiskName>)
+    >>> volumes, names = get_dm_index()
+
+    OR:
+
+    >>> volumes, names = get_dm_index(dev_path=<aPath>)
     """
 
-    #Use status=none to avoid getting status messages from dd in our boot record.
+    volumes = {}
+    names = {}
+
     try:
-        cmd = subprocess.run(["dd", "if="+disk, "bs=512", "count=1", "status=none"],
-                             check=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        dm_names = sorted(entry.name for entry in os.scandir(dev_path+"/mapper")
+                          if entry.name != "control")
 
-    except (OSError, subprocess.CalledProcessError) as err:
-        ERRORS.append("linux.get_boot_record(): Exception: "+str(err)+" while running dd\n")
-        return_value = 1
+    except OSError:
+        return volumes, names
 
-    else:
-        boot_record = cmd.stdout.decode("utf-8", errors="replace")
-        return_value = cmd.returncode
+    #Find out which device mapper devices are logical volumes.
+    dm_uuids = {}
 
-    if return_value != 0:
-        return ("Unknown", ["Unknown"])
+    try:
+        for entry in os.scandir(SYSFS+"/block"):
+            if entry.name.startswith("dm-"):
+                dm_uuids[read_sysfs_file(entry.path+"/dm/name")] = \
+                    read_sysfs_file(entry.path+"/dm/uuid")
+
+    except OSError:
+        pass
 
-    #Get the readable strings in the boot record.
-    with subprocess.Popen(["strings"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-                          stderr=subprocess.STDOUT) as cmd:
+    #The contents of each /dev/<vg_name>, so we only list each one once.
+    vg_dirs = {}
 
-        cmd.stdin.write(bytes(boot_record, encoding="utf-8"))
-        boot_record_strings = cmd.communicate()[0].decode("utf-8", errors="replace").replace(" ", "").split("\n")
-        return_value = cmd.returncode
+    for dm_name in dm_names:
+        if not dm_uuids.get(dm_name, "LVM-").startswith("LVM-"):
+            continue
 
-    if return_value != 0:
-        return (boot_record, ["Unknown"])
+        vg_name, lv_name = split_dm_name(dm_name)
 
-    return (boot_record, boot_record_strings)
+        if lv_name == "Unknown":
+            continue
 
-def get_lv_file_system(disk):
+        if vg_name not in vg_dirs:
+            try:
+                vg_dirs[vg_name] = set(entry.name for entry in os.scandir(dev_path+"/"+vg_name))
+
+            except OSError:
+                vg_dirs[vg_name] = set()
+
+        alias_list = [dev_path+"/mapper/"+dm_name]
+
+        if lv_name in vg_dirs[vg_name]:
+            alias_list.append(dev_path+"/"+vg_name+"/"+lv_name)
+
+        volumes[(vg_name, lv_name)] = alias_list
+
+        for alias in alias_list:
+            names[alias] = (vg_name, lv_name)
+
+    return volumes, names
+
+def split_dm_name(dm_name):
     """
     Private, implementation detail.
 
-    This function gets the file system of a logical volume.
+    This function splits a device mapper name (eg fedora-root) into
+    the volume group and logical volume names. Device mapper doubles
+    any "-" in the names, so the separator is the first "-" that isn't
+    part of a "--" (eg my--vg-root is root in volume group my-vg).
 
     Args:
-        disk (str):   The name of a logical volume.
+        dm_name (str):  The device mapper name.
 
     Returns:
-        string. The file system.
+        tuple (string, string). The VG, and LV name (vg_name, lv_name):
+
+            - (dm_name, "Unknown") - There was no separator.
+            - Anything else        - The VG and LV names.
 
     Usage:
 
-    >>> file_system = get_lv_file_system(<anLVName>)
+    >>> vg_name, lv_name = split_dm_name(<aName>)
     """
-    env = os.environ.copy()
-    env["LC_ALL"] = "C"
-
-    try:
-        cmd = subprocess.run(["blkid", disk], stdout=subprocess.PIPE,
-                             stderr=subprocess.STDOUT, check=True, env=env)
 
-    except (OSError, subprocess.CalledProcessError) as err:
-        ERRORS.append("linux.get_lv_file_system(): Exception: "+str(err)+" while running blkid\n")
-        return "Unknown"
+    index = 0
 
-    else:
-        output = cmd.stdout.decode("utf-8", errors="replace")
+    while index < len(dm_name):
+        if dm_name[index] == "-":
+            if dm_name[index+1:index+2] != "-":
+                return (dm_name[:index].replace("--", "-"),
+                        dm_name[index+1:].replace("--", "-"))
 
-    if isinstance(output, bytes):
-        output = output.decode("utf-8", errors="replace")
+            #Skip both characters of "--".
+            index += 1
 
-    if "TYPE=" in output:
-        return output.rsplit("TYPE=", maxsplit=1)[-1].split(" ")[0].replace("\"", "").replace("\n", "")
+        index += 1
 
-    #We didn't find the type.
-    return "Unknown"
+    return dm_name, "Unknown"
 
 def get_lv_aliases(line):
     """
@@ -1111,47 +4957,36 @@ def get_lv_aliases(line):
     name. Find and return all of them.
 
     Args:
-        line (int):   The line number where the LV name can be found.
+        line (str):   The line from lvdisplay's output with the LV's path.
 
     Returns:
         tuple (string, list). The aliases (default_name, all aliases).
 
     Usage:
 
-    >>> default_name, alias_list = get_lv_aliases(<anLVName>)
+    >>> default_name, alias_list = get_lv_aliases(<aLine>)
     """
 
-    alias_list = []
-    default_name = "Unknown"
+    global DM_VOLUMES
+    global DM_NAMES
 
-    #Get relevant part of the output line.
-    temp = line.split()[-1]
+    #Index /dev/mapper if get_info() hasn't done it yet.
+    if DM_VOLUMES is None:
+        DM_VOLUMES, DM_NAMES = get_dm_index()
 
-    #Try this way first for better compatibility with most systems.
-    if os.path.exists("/dev/mapper/"+'-'.join(temp.split("/")[2:])):
-        alias_list.append("/dev/mapper/"+'-'.join(temp.split("/")[2:]))
-
-    #Alternative ways of obtaining the info.
-    if os.path.exists(temp):
-        alias_list.append(temp)
-
-    #Weird one for Ubuntu with extra - in it.
-    if "-" in temp:
-        #Get volume group name and logical volume name.
-        vg_name = temp.split("/")[2]
-        lv_name = temp.split("/")[3]
+    #Get relevant part of the output line (eg /dev/fedora/root).
+    try:
+        vg_name, lv_name = line.split()[-1].split("/")[2:4]
 
-        #Insert another "-" in the middle (if possible).
-        vg_name = vg_name.replace("-", "--")
+    except (IndexError, ValueError):
+        return "Unknown", []
 
-        #Check whether this works.
-        if os.path.exists("/dev/mapper/"+vg_name+"-"+lv_name):
-            alias_list.append("/dev/mapper/"+vg_name+"-"+lv_name)
+    alias_list = DM_VOLUMES.get((vg_name, lv_name), [])
 
-    if len(alias_list) >= 1:
-        default_name = alias_list[0]
+    if alias_list:
+        return alias_list[0], alias_list
 
-    return default_name, alias_list
+    return "Unknown", alias_list
 
 def get_lv_and_vg_name(volume):
     """
@@ -1179,23 +5014,83 @@ def get_lv_and_vg_name(volume):
     >>> vg_name, lv_name = get_lv_and_vg_name(<anLVPath>)
     """
 
+    if DM_NAMES is not None and volume in DM_NAMES:
+        return DM_NAMES[volume]
+
     if "/dev/mapper/" in volume:
-        separator = "-"
+        return split_dm_name(volume.replace("/dev/mapper/", ""))
 
-        if "--" in volume:
-            separator = "--" #Weird Ubuntu LVM thing.
+    if "/dev/" in volume and volume.count("/") >= 3:
+        return volume.split("/")[2], volume.split("/")[3]
 
-        volume_group = volume.replace("/dev/mapper/", "").split(separator)[0]
-        logical_volume = volume.replace("/dev/mapper/", "").split(separator)[1]
+    return "Unknown", "Unknown"
 
-    elif "/dev/" in volume:
-        volume_group = volume.split("/")[2]
-        logical_volume = volume.split("/")[3]
+def get_block_sizes(devices=None):
+    """
+    **Public**
 
-    else:
-        volume_group, logical_volume = ("Unknown", "Unknown")
+    .. note:
+        It is perfectly safe to use this. The block size information
+        isn't calculated when getting device information, so if you
+        need some, just call this function to get it for all devices
+        at once (or the ones you want).
+
+    This function reads the block sizes of devices from sysfs
+    (/sys/class/block/<device>/queue/), without running any tools.
+    Partitions have the same block sizes as their devices.
+
+    Args:
+        devices(=None) (list):  The partitions/devices/logical volumes that we
+                                want block sizes for. All of them if None.
+
+    Returns:
+        dict. Each device (eg /dev/sda), mapped to a dictionary of its
+        block sizes in bytes, or None if they couldn't be read:
+
+            - "LogicalBlockSize"    - The smallest unit the device can address.
+            - "PhysicalBlockSize"   - The smallest unit the device can write
+                                      without a read-modify-write.
+            - "MinimumIOSize"       - The preferred minimum I/O size.
+            - "OptimalIOSize"       - The preferred I/O size for streaming (0 if
+                                      the device doesn't say).
+
+    Usage:
+
+    >>> block_sizes = get_block_sizes()
+
+    OR:
+
+    >>> block_sizes = get_block_sizes([<aDeviceName>, <anotherDeviceName>])
+    """
+
+    if devices is None:
+        try:
+            devices = ["/dev/"+name for name in sorted(os.listdir(SYSFS+"/class/block"))]
+
+        except OSError as err:
+            ERRORS.append("linux.get_block_sizes(): Exception: "+str(err)+" while reading sysfs\n")
+            return {}
+
+    block_sizes = {}
+
+    for device in devices:
+        path = SYSFS+"/class/block/"+os.path.basename(os.path.realpath(device))
 
-    return volume_group, logical_volume
+        #Partitions don't have queues, so use their device's.
+        if not os.path.isdir(path+"/queue"):
+            path = os.path.dirname(os.path.realpath(path))
+
+        try:
+            block_sizes[device] = {key: int(read_sysfs_file(path+"/queue/"+name))
+                                   for key, name in (("LogicalBlockSize", "logical_block_size"),
+                                                     ("PhysicalBlockSize", "physical_block_size"),
+                                                     ("MinimumIOSize", "minimum_io_size"),
+                                                     ("OptimalIOSize", "optimal_io_size"))}
+
+        except ValueError:
+            block_sizes[device] = None
+
+    return block_sizes
 
 def get_block_size(disk):
     """
@@ -1207,8 +5102,9 @@ def get_block_size(disk):
         need some, just call this function with a device name to get
         it.
 
-    This function uses the blockdev command to get the block size
-    of the given device.
+    This function gets the physical block size of the given device
+    from sysfs, like get_block_sizes(). The blockdev command is only
+    used if sysfs doesn't know about the device.
 
     Args:
         disk (str):     The partition/device/logical volume that
@@ -1225,6 +5121,11 @@ def get_block_size(disk):
     >>> block_size = get_block_size(<aDeviceName>)
     """
 
+    block_sizes = get_block_sizes([disk])[disk]
+
+    if block_sizes is not None:
+        return block_sizes["PhysicalBlockSize"]
+
     #Run /sbin/blockdev to try and get blocksize information.
     command = ["blockdev",  "--getpbsz", disk]
 
@@ -1263,12 +5164,8 @@ def compute_block_size(stdout):
 
     #Check it worked (it should be convertable to an integer if it did).
     try:
-        int(result)
+        return int(result)
 
     except ValueError:
         #It didn't, this is probably a file, not a disk.
         return None
-
-    else:
-        #It did.
-        return result
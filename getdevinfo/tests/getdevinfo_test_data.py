@@ -18,6 +18,7 @@
 #Note: The non-roman characters in this test data are random.
 #If they by some random chance spell something offensive, I apologise.
 
+import json
 import bs4
 
 #Classes for test cases.
@@ -1688,54 +1689,233 @@ def return_fake_lvm_output():
    
    """.split("\n")
 
-def return_fake_lsuuid_output():
-    return """total 0
-lrwxrwxrwx 1 root root 15 Mar 23 08:16 8243-0631 -> ../../sda1
-lrwxrwxrwx 1 root root 15 Mar 23 08:16 9B4C-DEED -> ../../sda2
-lrwxrwxrwx 1 root root 15 Mar 23 08:16 EAC64F91C64F0CEF -> ../../sda4
-lrwxrwxrwx 1 root root 15 Mar 23 08:16 02E053D7F053CF91 -> ../../sda5
-lrwxrwxrwx 1 root root 15 Mar 23 08:16 880CE2C20CE29A88 -> ../../sda6
-lrwxrwxrwx 1 root root 11 Mar 23 08:16 A636D41B36D44E45 -> ../../sda7
-lrwxrwxrwx 1 root root 15 Mar 23 08:16 80125090124FFA24 -> ../../sda8
-lrwxrwxrwx 1 root root 15 Mar 23 08:16 33ec5956-b699-4da7-8046-e4ce7bcf8521 -> ../../sda9
-lrwxrwxrwx 1 root root 15 Mar 23 08:16 fcacb083-163d-4d0a-94a1-22536f5bba9b -> ../../sda10
-lrwxrwxrwx 1 root root 11 Mar 23 08:16 b507c745-d3c9-4c43-8e88-0487913fbf00 -> ../../sdb1
-lrwxrwxrwx 1 root root 15 Mar 23 08:16 83788ffc-d36b-4f3a-b48f-18638f1591a8 -> ../../sdb2"""
-
-def return_fake_lsid_output():
-    return """total 0
-lrwxrwxrwx 1 root root  9 Oct 17 08:45 ata-HL-DT-ST_DVD+_-RW_GA50N_K0ADADE0046 -> ../../sr0
-lrwxrwxrwx 1 root root  9 Oct 17 08:45 ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L -> ../../sda
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part1 -> ../../sda1
-lrwxrwxrwx 1 root root 11 Oct 17 08:45 ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part10 -> ../../sda10
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part2 -> ../../sda2
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part3 -> ../../sda3
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part4 -> ../../sda4
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part5 -> ../../sda5
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part6 -> ../../sda6
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part7 -> ../../sda7
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part8 -> ../../sda8
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part9 -> ../../sda9
-lrwxrwxrwx 1 root root  9 Oct 17 08:45 ata-ST1000DM003-1CH162_W1D2BRDP -> ../../sdb
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 ata-ST1000DM003-1CH162_W1D2BRDP-part1 -> ../../sdb1
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 ata-ST1000DM003-1CH162_W1D2BRDP-part2 -> ../../sdb2
-lrwxrwxrwx 1 root root  9 Oct 17 08:45 usb-Generic_STORAGE_DEVICE_000000001206-0:0 -> ../../sdc
-lrwxrwxrwx 1 root root  9 Oct 17 08:45 usb-Generic_STORAGE_DEVICE_000000001206-0:1 -> ../../sdd
-lrwxrwxrwx 1 root root  9 Oct 17 08:45 wwn-0x5000c5006e19c6f2 -> ../../sdb
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 wwn-0x5000c5006e19c6f2-part1 -> ../../sdb1
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 wwn-0x5000c5006e19c6f2-part2 -> ../../sdb2
-lrwxrwxrwx 1 root root  9 Oct 17 08:45 wwn-0x5001480000000000 -> ../../sr0
-lrwxrwxrwx 1 root root  9 Oct 17 08:45 wwn-0x5002538d40897bed -> ../../sda
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 wwn-0x5002538d40897bed-part1 -> ../../sda1
-lrwxrwxrwx 1 root root 11 Oct 17 08:45 wwn-0x5002538d40897bed-part10 -> ../../sda10
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 wwn-0x5002538d40897bed-part2 -> ../../sda2
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 wwn-0x5002538d40897bed-part3 -> ../../sda3
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 wwn-0x5002538d40897bed-part4 -> ../../sda4
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 wwn-0x5002538d40897bed-part5 -> ../../sda5
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 wwn-0x5002538d40897bed-part6 -> ../../sda6
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 wwn-0x5002538d40897bed-part7 -> ../../sda7
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 wwn-0x5002538d40897bed-part8 -> ../../sda8
-lrwxrwxrwx 1 root root 10 Oct 17 08:45 wwn-0x5002538d40897bed-part9 -> ../../sda9"""
+def return_fake_lvs_report():
+    return json.loads("""{
+      "report": [
+          {
+              "lv": [
+                  {"lv_path":"/dev/fakefedora/swap", "lv_uuid":"3e8urm-xsCG-iCAJ-Q3go-2247-OU5N-3AwlD1", "lv_size":"1719664640", "vg_name":"fakefedora", "lv_name":"swap", "devices":"/dev/sda3(0)", "lv_dm_path":"/dev/mapper/fakefedora-swap"},
+                  {"lv_path":"/dev/fakefedora/root", "lv_uuid":"TWxt1j-g62o-GYju-3UpB-A4g3-9ZbB-HWb7jf", "lv_size":"14172553216", "vg_name":"fakefedora", "lv_name":"root", "devices":"/dev/sda3(410)", "lv_dm_path":"/dev/mapper/fakefedora-root"},
+                  {"lv_path":"/dev/fakefedora/root", "lv_uuid":"TWxt1j-g62o-GYju-3UpB-A4g3-9ZbB-HWb7jf", "lv_size":"14172553216", "vg_name":"fakefedora", "lv_name":"root", "devices":"/dev/sdb1(0)", "lv_dm_path":"/dev/mapper/fakefedora-root"},
+                  {"lv_path":"", "lv_uuid":"c0fRHa-7ibx-ugcr-YRXZ-5fPv-QIR2-mZaV5t", "lv_size":"2147483648", "vg_name":"fakefedora", "lv_name":"pool", "devices":"pool_tdata(0)", "lv_dm_path":"/dev/mapper/fakefedora-pool"},
+                  {"lv_path":"/dev/fake-fedora/thin", "lv_uuid":"Sx5Ofc-Fy2C-Hk7u-J1cL-9Kgr-f3vX-CM7PbQ", "lv_size":"1073741824", "vg_name":"fake-fedora", "lv_name":"thin", "devices":"", "lv_dm_path":"/dev/mapper/fake--fedora-thin"}
+              ]
+          }
+      ]
+  }""")
+
+def return_fake_pvs_report():
+    return json.loads("""{
+      "report": [
+          {
+              "pv": [
+                  {"pv_name":"/dev/sda3", "vg_name":"fakefedora"},
+                  {"pv_name":"/dev/sda2", "vg_name":"fake-fedora"}
+              ]
+          }
+      ]
+  }""")
+
+def return_fake_lvm_report_disk_info():
+    diskinfo = return_fake_lvm_disk_info()
+
+    #lvs gives us exact sizes.
+    diskinfo["/dev/mapper/fakefedora-root"]["RawCapacity"] = "14172553216"
+    diskinfo["/dev/mapper/fakefedora-root"]["Capacity"] = "14 GB"
+    diskinfo["/dev/mapper/fakefedora-swap"]["RawCapacity"] = "1719664640"
+    diskinfo["/dev/mapper/fakefedora-swap"]["Capacity"] = "1 GB"
+
+    diskinfo["/dev/mapper/fake--fedora-thin"] = {'LVName': 'thin', 'VGName': 'fake-fedora', 'HostPartition': '/dev/sda2', 'Vendor': 'Linux', 'Name': '/dev/mapper/fake--fedora-thin', 'Capacity': '1 GB', 'Product': 'LVM Partition', 'UUID': 'Sx5Ofc-Fy2C-Hk7u-J1cL-9Kgr-f3vX-CM7PbQ', 'Partitioning': 'N/A', 'HostDevice': '/dev/sda', 'BootRecord': 'Unknown', 'Flags': [], 'RawCapacity': '1073741824', 'BootRecordStrings': ['Unknown'], 'FileSystem': 'Unknown', 'Description': 'LVM partition thin in volume group fake-fedora', 'Aliases': ['/dev/mapper/fake--fedora-thin', '/dev/fake-fedora/thin'], 'Type': 'Partition', 'ID': 'dm-name-fake-fedora-thin', 'Partitions': []}
+
+    return diskinfo
+
+def return_fake_lshw_output():
+    return b"""<?xml version="1.0" standalone="yes" ?>
+<!-- generated by lshw-B.02.19.2 -->
+<!-- GCC 11.2.0 -->
+<!-- Linux 5.15.0-56-generic #62-Ubuntu SMP Tue Nov 22 19:54:14 UTC 2022 x86_64 -->
+<!-- GNU libc 2 (glibc 2.35) -->
+<list>
+  <node id="disk" claimed="true" class="disk" handle="GUID:6f3e1c62-4f0c-4d9b-9a55-2b9e7d3f1a10">
+   <description>ATA Disk</description>
+   <product>Samsung SSD 860</product>
+   <vendor>Samsung</vendor>
+   <physid>0.0.0</physid>
+   <businfo>scsi@0:0.0.0</businfo>
+   <logicalname>/dev/sda</logicalname>
+   <dev>8:0</dev>
+   <version>4B6Q</version>
+   <serial>[REMOVED]</serial>
+   <size units="bytes">500107862016</size>
+   <configuration>
+    <setting id="ansiversion" value="5" />
+    <setting id="guid" value="6f3e1c62-4f0c-4d9b-9a55-2b9e7d3f1a10" />
+    <setting id="logicalsectorsize" value="512" />
+    <setting id="sectorsize" value="512" />
+   </configuration>
+   <capabilities>
+    <capability id="gpt-1.00" >GUID Partition Table version 1.00</capability>
+    <capability id="partitioned" >Partitioned disk</capability>
+    <capability id="partitioned:gpt" >GUID partition table</capability>
+   </capabilities>
+    <node id="volume:0" claimed="true" class="volume" handle="GUID:0b1a5d2e-8c3f-4e6a-9d7b-1f2e3d4c5b6a">
+     <description>Windows FAT volume</description>
+     <vendor>mkfs.fat</vendor>
+     <physid>1</physid>
+     <businfo>scsi@0:0.0.0,1</businfo>
+     <logicalname>/dev/sda1</logicalname>
+     <logicalname>/boot/efi</logicalname>
+     <dev>8:1</dev>
+     <version>FAT32</version>
+     <serial>8243-0631</serial>
+     <size units="bytes">535805952</size>
+     <capacity units="bytes">536870912</capacity>
+     <configuration>
+      <setting id="FATs" value="2" />
+      <setting id="filesystem" value="fat" />
+      <setting id="label" value="EFI" />
+      <setting id="mount.fstype" value="vfat" />
+      <setting id="name" value="EFI System Partition" />
+     </configuration>
+     <capabilities>
+      <capability id="boot" >Contains boot code</capability>
+      <capability id="fat" >Windows FAT</capability>
+      <capability id="initialized" >initialized volume</capability>
+     </capabilities>
+    </node>
+    <node id="volume:1" claimed="true" class="volume" handle="GUID:5c4b3a29-1807-4f6e-8d5c-4b3a29180746">
+     <description>EXT4 volume</description>
+     <vendor>Linux</vendor>
+     <physid>2</physid>
+     <businfo>scsi@0:0.0.0,2</businfo>
+     <logicalname>/dev/sda2</logicalname>
+     <logicalname>/</logicalname>
+     <dev>8:2</dev>
+     <version>1.0</version>
+     <serial>3e7f1b52-0c8d-4a6e-9f21-7d5c3b1a0e9f</serial>
+     <size units="bytes">499570991104</size>
+     <capacity units="bytes">499570991104</capacity>
+     <configuration>
+      <setting id="created" value="2022-12-01 10:00:00" />
+      <setting id="filesystem" value="ext4" />
+      <setting id="state" value="mounted" />
+     </configuration>
+     <capabilities>
+      <capability id="journaled" />
+      <capability id="extended_attributes" >Extended Attributes</capability>
+      <capability id="ext4" />
+      <capability id="initialized" >initialized volume</capability>
+     </capabilities>
+    </node>
+  </node>
+  <node id="cdrom" claimed="true" class="disk" handle="SCSI:01:00:00:00">
+   <description>DVD-RAM writer</description>
+   <product>DVD+-RW GA50N</product>
+   <vendor>HL-DT-ST</vendor>
+   <physid>0.0.0</physid>
+   <businfo>scsi@1:0.0.0</businfo>
+   <logicalname>/dev/cdrom</logicalname>
+   <logicalname>/dev/sr0</logicalname>
+   <dev>11:0</dev>
+   <version>1.00</version>
+   <configuration>
+    <setting id="ansiversion" value="5" />
+    <setting id="status" value="nodisc" />
+   </configuration>
+   <capabilities>
+    <capability id="removable" >support is removable</capability>
+    <capability id="audio" >Audio CD playback</capability>
+    <capability id="dvd" >DVD playback</capability>
+   </capabilities>
+  </node>
+</list>
+"""
+
+def return_fake_lshw_output_diskinfo():
+    return {'/dev/cdrom': {'BootRecord': 'N/A', 'BootRecordStrings': ['N/A'], 'Capacity': 'N/A', 'Description': 'DVD-RAM writer', 'FileSystem': 'N/A', 'Flags': ['removable', 'audio', 'dvd'], 'HostDevice': 'N/A', 'ID': 'Unknown', 'Label': 'N/A', 'Name': '/dev/cdrom', 'PartUUID': 'N/A', 'Partitioning': 'Unknown', 'Partitions': [], 'Path': 'Unknown', 'Product': 'DVD+-RW GA50N', 'RawCapacity': 'N/A', 'Type': 'Device', 'UUID': 'N/A', 'Vendor': 'HL-DT-ST'},
+
+            '/dev/sda': {'BootRecord': 'Unknown', 'BootRecordStrings': ['Unknown'], 'Capacity': '500 GB', 'Description': 'ATA Disk', 'FileSystem': 'N/A', 'Flags': ['gpt-1.00', 'partitioned', 'partitioned:gpt'], 'HostDevice': 'N/A', 'ID': 'Unknown', 'Label': 'N/A', 'Name': '/dev/sda', 'PartUUID': 'N/A', 'Partitioning': 'gpt', 'Partitions': ['/dev/sda1', '/dev/sda2'], 'Path': 'Unknown', 'Product': 'Samsung SSD 860', 'RawCapacity': '500107862016', 'Type': 'Device', 'UUID': 'N/A', 'Vendor': 'Samsung'},
+
+            '/dev/sda1': {'BootRecord': 'Unknown', 'BootRecordStrings': ['Unknown'], 'Capacity': '535 MB', 'Description': 'Windows FAT volume', 'FileSystem': 'vfat', 'Flags': ['boot', 'fat', 'initialized'], 'HostDevice': '/dev/sda', 'ID': 'Unknown', 'Label': 'Unknown', 'Name': '/dev/sda1', 'PartUUID': 'Unknown', 'Partitioning': 'N/A', 'Partitions': [], 'Path': 'Unknown', 'Product': 'Host Device: Samsung SSD 860', 'RawCapacity': '535805952', 'Type': 'Partition', 'UUID': 'Unknown', 'Vendor': 'mkfs.fat'},
+
+            '/dev/sda2': {'BootRecord': 'Unknown', 'BootRecordStrings': ['Unknown'], 'Capacity': '499 GB', 'Description': 'EXT4 volume', 'FileSystem': 'ext4', 'Flags': ['journaled', 'extended_attributes', 'ext4', 'initialized'], 'HostDevice': '/dev/sda', 'ID': 'Unknown', 'Label': 'Unknown', 'Name': '/dev/sda2', 'PartUUID': 'Unknown', 'Partitioning': 'N/A', 'Partitions': [], 'Path': 'Unknown', 'Product': 'Host Device: Samsung SSD 860', 'RawCapacity': '499570991104', 'Type': 'Partition', 'UUID': 'Unknown', 'Vendor': 'Linux'}}
+
+def return_fake_disk_link_tree():
+    return {"by-uuid": {"8243-0631": "../../sda1",
+                        "9B4C-DEED": "../../sda2",
+                        "EAC64F91C64F0CEF": "../../sda4",
+                        "02E053D7F053CF91": "../../sda5",
+                        "880CE2C20CE29A88": "../../sda6",
+                        "A636D41B36D44E45": "../../sda7",
+                        "80125090124FFA24": "../../sda8",
+                        "33ec5956-b699-4da7-8046-e4ce7bcf8521": "../../sda9",
+                        "fcacb083-163d-4d0a-94a1-22536f5bba9b": "../../sda10",
+                        "b507c745-d3c9-4c43-8e88-0487913fbf00": "../../sdb1",
+                        "83788ffc-d36b-4f3a-b48f-18638f1591a8": "../../sdb2"},
+
+            "by-id": {"ata-HL-DT-ST_DVD+_-RW_GA50N_K0ADADE0046": "../../sr0",
+                      "ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L": "../../sda",
+                      "ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part1": "../../sda1",
+                      "ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part10": "../../sda10",
+                      "ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part2": "../../sda2",
+                      "ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part3": "../../sda3",
+                      "ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part4": "../../sda4",
+                      "ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part5": "../../sda5",
+                      "ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part6": "../../sda6",
+                      "ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part7": "../../sda7",
+                      "ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part8": "../../sda8",
+                      "ata-Samsung_SSD_850_EVO_500GB_S21JNXAGC48182L-part9": "../../sda9",
+                      "ata-ST1000DM003-1CH162_W1D2BRDP": "../../sdb",
+                      "ata-ST1000DM003-1CH162_W1D2BRDP-part1": "../../sdb1",
+                      "ata-ST1000DM003-1CH162_W1D2BRDP-part2": "../../sdb2",
+                      "usb-Generic_STORAGE_DEVICE_000000001206-0:0": "../../sdc",
+                      "usb-Generic_STORAGE_DEVICE_000000001206-0:1": "../../sdd",
+                      "wwn-0x5000c5006e19c6f2": "../../sdb",
+                      "wwn-0x5000c5006e19c6f2-part1": "../../sdb1",
+                      "wwn-0x5000c5006e19c6f2-part2": "../../sdb2",
+                      "wwn-0x5001480000000000": "../../sr0",
+                      "wwn-0x5002538d40897bed": "../../sda",
+                      "wwn-0x5002538d40897bed-part1": "../../sda1",
+                      "wwn-0x5002538d40897bed-part10": "../../sda10",
+                      "wwn-0x5002538d40897bed-part2": "../../sda2",
+                      "wwn-0x5002538d40897bed-part3": "../../sda3",
+                      "wwn-0x5002538d40897bed-part4": "../../sda4",
+                      "wwn-0x5002538d40897bed-part5": "../../sda5",
+                      "wwn-0x5002538d40897bed-part6": "../../sda6",
+                      "wwn-0x5002538d40897bed-part7": "../../sda7",
+                      "wwn-0x5002538d40897bed-part8": "../../sda8",
+                      "wwn-0x5002538d40897bed-part9": "../../sda9"},
+
+            "by-label": {"EFI\\x20System\\x2fBoot": "../../sda1",
+                         "Data": "../../sdb2"},
+
+            "by-partuuid": {"9f2c1f30-01": "../../sda1",
+                            "9f2c1f30-02": "../../sda2"},
+
+            "by-path": {"pci-0000:00:17.0-ata-1": "../../sda",
+                        "pci-0000:00:17.0-ata-1-part1": "../../sda1",
+                        "pci-0000:00:17.0-ata-1.0": "../../sda"}}
+
+def return_fake_blkid_export_output():
+    return """DEVNAME=/dev/sda1
+UUID=8243-0631
+BLOCK_SIZE=512
+TYPE=vfat
+PARTUUID=9f2c1f30-01
+
+DEVNAME=/dev/sda2
+LABEL=My\\ Data\\ Disk
+UUID=33ec5956-b699-4da7-8046-e4ce7bcf8521
+TYPE=ext4
+PARTUUID=9f2c1f30-02
+
+DEVNAME=/dev/sda3
+PARTUUID=9f2c1f30-03
+
+DEVNAME=/dev/mapper/fakefedora-root
+UUID=TWxt1j-g62o-GYju-3UpB-A4g3-9ZbB-HWb7jf
+TYPE=xfs
+"""
 
 def return_fake_block_dev_output():
     return ["No such file or device", "512", "1024", "2048", "4096", "8192"]
@@ -1743,6 +1923,16 @@ def return_fake_block_dev_output():
 def fake_get_boot_record(disk):
     return ("Unknown", ["Unknown"])
 
+def fake_get_partition_table(disk, sector_size=None):
+    return {"Scheme": "Unknown", "SectorSize": 512, "DiskUUID": "Unknown", "Partitions": []}
+
+def return_fake_boot_record():
+    return (b"\xebc\x90\x10\x8e\xd0\xbc\x00\xb0\xb8\x00\x00GRUB \x00Geom\x00Hard Disk\x00Read\x00 Error"
+            + b"\r\n\x00abc\x00\tTAB\x00\xff\xfeN\xc3\xa9ver\x00"+b"\x00"*445+b"\x55\xaa")
+
+def return_fake_boot_record_strings():
+    return ["GRUB", "Geom", "HardDisk", "Read", "Error", "\tTAB", ""]
+
 def return_fake_lsblk_output_good_1():
     return """{
    "blockdevices": [
@@ -1774,10 +1964,13 @@ def return_fake_lsblk_output_good_1_diskinfo():
     diskinfo["/dev/nvme0n1"]["RawCapacity"] = "1000204886016"
     diskinfo["/dev/nvme0n1"]["Capacity"] = "1 TB"
     diskinfo["/dev/nvme0n1"]["BootRecord"], diskinfo["/dev/nvme0n1"]["BootRecordStrings"] = ("Unknown", ["Unknown"])
-    diskinfo["/dev/nvme0n1"]["Description"] = "NVME Disk"
+    diskinfo["/dev/nvme0n1"]["Description"] = "NVME SSD"
     diskinfo["/dev/nvme0n1"]["Flags"] = "Unknown"
     diskinfo["/dev/nvme0n1"]["Partitioning"] = "Unknown"
     diskinfo["/dev/nvme0n1"]["ID"] = "Unknown"
+    diskinfo["/dev/nvme0n1"]["Label"] = "N/A"
+    diskinfo["/dev/nvme0n1"]["PartUUID"] = "N/A"
+    diskinfo["/dev/nvme0n1"]["Path"] = "Unknown"
 
     #Fictional /dev/nvme0n1p1
     diskinfo["/dev/nvme0n1p1"] = {}
@@ -1797,6 +1990,9 @@ def return_fake_lsblk_output_good_1_diskinfo():
     diskinfo["/dev/nvme0n1p1"]["Flags"] = "Unknown"
     diskinfo["/dev/nvme0n1p1"]["Partitioning"] = "N/A"
     diskinfo["/dev/nvme0n1p1"]["ID"] = "Unknown"
+    diskinfo["/dev/nvme0n1p1"]["Label"] = "Unknown"
+    diskinfo["/dev/nvme0n1p1"]["PartUUID"] = "Unknown"
+    diskinfo["/dev/nvme0n1p1"]["Path"] = "Unknown"
 
     #Fictional /dev/nvme1n1
     diskinfo["/dev/nvme1n1"] = {}
@@ -1811,10 +2007,13 @@ def return_fake_lsblk_output_good_1_diskinfo():
     diskinfo["/dev/nvme1n1"]["RawCapacity"] = "1000204886016"
     diskinfo["/dev/nvme1n1"]["Capacity"] = "1 TB"
     diskinfo["/dev/nvme1n1"]["BootRecord"], diskinfo["/dev/nvme1n1"]["BootRecordStrings"] = ("Unknown", ["Unknown"])
-    diskinfo["/dev/nvme1n1"]["Description"] = "NVME Disk"
+    diskinfo["/dev/nvme1n1"]["Description"] = "NVME SSD"
     diskinfo["/dev/nvme1n1"]["Flags"] = "Unknown"
     diskinfo["/dev/nvme1n1"]["Partitioning"] = "Unknown"
     diskinfo["/dev/nvme1n1"]["ID"] = "Unknown"
+    diskinfo["/dev/nvme1n1"]["Label"] = "N/A"
+    diskinfo["/dev/nvme1n1"]["PartUUID"] = "N/A"
+    diskinfo["/dev/nvme1n1"]["Path"] = "Unknown"
 
     return diskinfo
 
@@ -1846,10 +2045,13 @@ def return_fake_lsblk_output_bad_1_diskinfo():
     diskinfo["/dev/nvme0n1"]["RawCapacity"] = "1000204886016"
     diskinfo["/dev/nvme0n1"]["Capacity"] = "1 TB"
     diskinfo["/dev/nvme0n1"]["BootRecord"], diskinfo["/dev/nvme0n1"]["BootRecordStrings"] = ("Unknown", ["Unknown"])
-    diskinfo["/dev/nvme0n1"]["Description"] = "NVME Disk"
+    diskinfo["/dev/nvme0n1"]["Description"] = "NVME SSD"
     diskinfo["/dev/nvme0n1"]["Flags"] = "Unknown"
     diskinfo["/dev/nvme0n1"]["Partitioning"] = "Unknown"
     diskinfo["/dev/nvme0n1"]["ID"] = "Unknown"
+    diskinfo["/dev/nvme0n1"]["Label"] = "N/A"
+    diskinfo["/dev/nvme0n1"]["PartUUID"] = "N/A"
+    diskinfo["/dev/nvme0n1"]["Path"] = "Unknown"
 
     #Fictional /dev/nvme1n1
     diskinfo["/dev/nvme1n1"] = {}
@@ -1864,10 +2066,13 @@ def return_fake_lsblk_output_bad_1_diskinfo():
     diskinfo["/dev/nvme1n1"]["RawCapacity"] = "Unknown"
     diskinfo["/dev/nvme1n1"]["Capacity"] = "Unknown"
     diskinfo["/dev/nvme1n1"]["BootRecord"], diskinfo["/dev/nvme1n1"]["BootRecordStrings"] = ("Unknown", ["Unknown"])
-    diskinfo["/dev/nvme1n1"]["Description"] = "NVME Disk"
+    diskinfo["/dev/nvme1n1"]["Description"] = "NVME SSD"
     diskinfo["/dev/nvme1n1"]["Flags"] = "Unknown"
     diskinfo["/dev/nvme1n1"]["Partitioning"] = "Unknown"
     diskinfo["/dev/nvme1n1"]["ID"] = "Unknown"
+    diskinfo["/dev/nvme1n1"]["Label"] = "N/A"
+    diskinfo["/dev/nvme1n1"]["PartUUID"] = "N/A"
+    diskinfo["/dev/nvme1n1"]["Path"] = "Unknown"
 
     return diskinfo
 
@@ -1901,10 +2106,13 @@ def return_fake_lsblk_output_bad_2_diskinfo():
     diskinfo["/dev/nvme0n1"]["RawCapacity"] = "1000204886016"
     diskinfo["/dev/nvme0n1"]["Capacity"] = "1 TB"
     diskinfo["/dev/nvme0n1"]["BootRecord"], diskinfo["/dev/nvme0n1"]["BootRecordStrings"] = ("Unknown", ["Unknown"])
-    diskinfo["/dev/nvme0n1"]["Description"] = "NVME Disk"
+    diskinfo["/dev/nvme0n1"]["Description"] = "NVME SSD"
     diskinfo["/dev/nvme0n1"]["Flags"] = "Unknown"
     diskinfo["/dev/nvme0n1"]["Partitioning"] = "Unknown"
     diskinfo["/dev/nvme0n1"]["ID"] = "Unknown"
+    diskinfo["/dev/nvme0n1"]["Label"] = "N/A"
+    diskinfo["/dev/nvme0n1"]["PartUUID"] = "N/A"
+    diskinfo["/dev/nvme0n1"]["Path"] = "Unknown"
 
     #Fictional /dev/nvme0n1p1
     diskinfo["/dev/nvme0n1p1"] = {}
@@ -1924,6 +2132,9 @@ def return_fake_lsblk_output_bad_2_diskinfo():
     diskinfo["/dev/nvme0n1p1"]["Flags"] = "Unknown"
     diskinfo["/dev/nvme0n1p1"]["Partitioning"] = "N/A"
     diskinfo["/dev/nvme0n1p1"]["ID"] = "Unknown"
+    diskinfo["/dev/nvme0n1p1"]["Label"] = "Unknown"
+    diskinfo["/dev/nvme0n1p1"]["PartUUID"] = "Unknown"
+    diskinfo["/dev/nvme0n1p1"]["Path"] = "Unknown"
 
     #Fictional /dev/nvme0n1p2
     diskinfo["/dev/nvme0n1p2"] = {}
@@ -1943,6 +2154,9 @@ def return_fake_lsblk_output_bad_2_diskinfo():
     diskinfo["/dev/nvme0n1p2"]["Flags"] = "Unknown"
     diskinfo["/dev/nvme0n1p2"]["Partitioning"] = "N/A"
     diskinfo["/dev/nvme0n1p2"]["ID"] = "Unknown"
+    diskinfo["/dev/nvme0n1p2"]["Label"] = "Unknown"
+    diskinfo["/dev/nvme0n1p2"]["PartUUID"] = "Unknown"
+    diskinfo["/dev/nvme0n1p2"]["Path"] = "Unknown"
 
     #Fictional /dev/nvme0n1p3
     diskinfo["/dev/nvme0n1p3"] = {}
@@ -1962,8 +2176,439 @@ def return_fake_lsblk_output_bad_2_diskinfo():
     diskinfo["/dev/nvme0n1p3"]["Flags"] = "Unknown"
     diskinfo["/dev/nvme0n1p3"]["Partitioning"] = "N/A"
     diskinfo["/dev/nvme0n1p3"]["ID"] = "Unknown"
+    diskinfo["/dev/nvme0n1p3"]["Label"] = "Unknown"
+    diskinfo["/dev/nvme0n1p3"]["PartUUID"] = "Unknown"
+    diskinfo["/dev/nvme0n1p3"]["Path"] = "Unknown"
     return diskinfo
 
+#---------------- Fake sysfs tree with the same disks as return_fake_lsblk_output_good_1() ----------------
+def return_fake_lsblk_all_output():
+    return """{
+   "blockdevices": [
+      {"name": "loop0", "type": "loop", "size": 58363904, "rm": false, "rota": false, "vendor": null, "model": null, "pttype": null, "fstype": "squashfs", "uuid": null, "label": null, "partuuid": null},
+      {"name": "sda", "type": "disk", "size": 500107862016, "rm": false, "rota": false, "vendor": "ATA     ", "model": "Samsung SSD 860 ", "serial": "S3Z9NB0K123456", "wwn": "0x5002538e40a1b2c3", "tran": "sata", "pttype": "gpt", "ptuuid": "6f3e1c62-4f0c-4d9b-9a55-2b9e7d3f1a10", "fstype": null, "uuid": null, "label": null, "partuuid": null,
+         "children": [
+            {"name": "sda1", "type": "part", "size": 536870912, "rm": false, "rota": false, "vendor": null, "model": null, "pttype": "gpt", "fstype": "vfat", "uuid": "8243-0631", "label": "EFI", "partuuid": "9f2c1f30-01", "mountpoints": ["/boot/efi"]},
+            {"name": "sda2", "type": "part", "size": 107374182400, "rm": false, "rota": false, "vendor": null, "model": null, "pttype": "gpt", "fstype": "LVM2_member", "uuid": "TJbHQ4-yQzZ-2bHH-8tyN-c2Ra-1zQe-Nx2k9p", "label": null, "partuuid": "9f2c1f30-02",
+               "children": [
+                  {"name": "fakefedora-root", "type": "lvm", "size": 14172553216, "rm": false, "rota": false, "vendor": null, "model": null, "pttype": null, "fstype": "xfs", "uuid": "1c7b5a2e-2f0e-4d6b-8a9c-3e5f7a9b1d2c", "label": null, "partuuid": null, "mountpoints": ["/"]}
+               ]
+            },
+            {"name": "sda3", "type": "part", "size": 392196767744, "rm": false, "rota": false, "vendor": null, "model": null, "pttype": "gpt", "fstype": "linux_raid_member", "uuid": "0a8f3b1c-5d7e-9f2a-4b6c-8d0e2f4a6b8c", "label": "fakehost:0", "partuuid": null,
+               "children": [
+                  {"name": "md0", "type": "raid1", "size": 392062550016, "rm": false, "rota": false, "vendor": null, "model": null, "pttype": "dos", "fstype": null, "uuid": null, "label": null, "partuuid": null,
+                     "children": [
+                        {"name": "md0p1", "type": "part", "size": 392061501440, "rm": false, "rota": false, "vendor": null, "model": null, "pttype": "dos", "fstype": "ext4", "uuid": "3e7f1b52-0c8d-4a6e-9f21-7d5c3b1a0e9f", "label": "My Data", "partuuid": "2c1a9e4f-01"}
+                     ]
+                  }
+               ]
+            }
+         ]
+      },
+      {"name": "sdb", "type": "disk", "size": 16008609792, "rm": "1", "rota": "0", "vendor": "SanDisk ", "model": "Cruzer Blade    ", "tran": "usb", "pttype": "dos", "fstype": null, "uuid": null, "label": null, "partuuid": null,
+         "children": [
+            {"name": "sdb1", "type": "part", "size": 16007561216, "rm": "1", "rota": "0", "vendor": null, "model": null, "pttype": "dos", "fstype": "exfat", "uuid": "64A2-1F0B", "label": null, "partuuid": "0e1d2c3b-01"}
+         ]
+      },
+      {"name": "sr0", "type": "rom", "size": 1073741312, "rm": true, "rota": true, "vendor": "HL-DT-ST", "model": "DVD+-RW GA50N   ", "tran": "sata", "pttype": null, "fstype": null, "uuid": null, "label": null, "partuuid": null}
+   ]
+}"""
+
+def return_fake_lsblk_all_output_diskinfo():
+    return {'/dev/sda': {'BootRecord': 'Unknown', 'BootRecordStrings': ['Unknown'], 'Capacity': '500 GB', 'Description': 'Hard Disk Drive or SATA SSD', 'FileSystem': 'N/A', 'Flags': [], 'HostDevice': 'N/A', 'ID': 'Unknown', 'Label': 'N/A', 'Name': '/dev/sda', 'PartUUID': 'N/A', 'Partitioning': 'gpt', 'Partitions': ['/dev/sda1', '/dev/sda2', '/dev/sda3', '/dev/md0p1'], 'Path': 'Unknown', 'Product': 'Samsung SSD 860', 'RawCapacity': '500107862016', 'Type': 'Device', 'UUID': 'N/A', 'Vendor': 'ATA'},
+
+            '/dev/sda1': {'BootRecord': 'Unknown', 'BootRecordStrings': ['Unknown'], 'Capacity': '536 MB', 'Description': 'N/A', 'FileSystem': 'vfat', 'Flags': [], 'HostDevice': '/dev/sda', 'ID': 'Unknown', 'Label': 'EFI', 'Name': '/dev/sda1', 'PartUUID': '9f2c1f30-01', 'Partitioning': 'N/A', 'Partitions': [], 'Path': 'Unknown', 'Product': 'Host Device: Samsung SSD 860', 'RawCapacity': '536870912', 'Type': 'Partition', 'UUID': '8243-0631', 'Vendor': 'N/A'},
+
+            '/dev/sda2': {'BootRecord': 'Unknown', 'BootRecordStrings': ['Unknown'], 'Capacity': '107 GB', 'Description': 'N/A', 'FileSystem': 'LVM2_member', 'Flags': [], 'HostDevice': '/dev/sda', 'ID': 'Unknown', 'Label': 'Unknown', 'Name': '/dev/sda2', 'PartUUID': '9f2c1f30-02', 'Partitioning': 'N/A', 'Partitions': [], 'Path': 'Unknown', 'Product': 'Host Device: Samsung SSD 860', 'RawCapacity': '107374182400', 'Type': 'Partition', 'UUID': 'TJbHQ4-yQzZ-2bHH-8tyN-c2Ra-1zQe-Nx2k9p', 'Vendor': 'N/A'},
+
+            '/dev/sda3': {'BootRecord': 'Unknown', 'BootRecordStrings': ['Unknown'], 'Capacity': '392 GB', 'Description': 'N/A', 'FileSystem': 'linux_raid_member', 'Flags': [], 'HostDevice': '/dev/sda', 'ID': 'Unknown', 'Label': 'fakehost:0', 'Name': '/dev/sda3', 'PartUUID': 'Unknown', 'Partitioning': 'N/A', 'Partitions': [], 'Path': 'Unknown', 'Product': 'Host Device: Samsung SSD 860', 'RawCapacity': '392196767744', 'Type': 'Partition', 'UUID': '0a8f3b1c-5d7e-9f2a-4b6c-8d0e2f4a6b8c', 'Vendor': 'N/A'},
+
+            '/dev/md0p1': {'BootRecord': 'Unknown', 'BootRecordStrings': ['Unknown'], 'Capacity': '392 GB', 'Description': 'N/A', 'FileSystem': 'ext4', 'Flags': [], 'HostDevice': '/dev/sda', 'ID': 'Unknown', 'Label': 'My Data', 'Name': '/dev/md0p1', 'PartUUID': '2c1a9e4f-01', 'Partitioning': 'N/A', 'Partitions': [], 'Path': 'Unknown', 'Product': 'Host Device: Samsung SSD 860', 'RawCapacity': '392061501440', 'Type': 'Partition', 'UUID': '3e7f1b52-0c8d-4a6e-9f21-7d5c3b1a0e9f', 'Vendor': 'N/A'},
+
+            '/dev/sdb': {'BootRecord': 'Unknown', 'BootRecordStrings': ['Unknown'], 'Capacity': '16 GB', 'Description': 'Hard Disk Drive or SATA SSD', 'FileSystem': 'N/A', 'Flags': ['removable'], 'HostDevice': 'N/A', 'ID': 'Unknown', 'Label': 'N/A', 'Name': '/dev/sdb', 'PartUUID': 'N/A', 'Partitioning': 'mbr', 'Partitions': ['/dev/sdb1'], 'Path': 'Unknown', 'Product': 'Cruzer Blade', 'RawCapacity': '16008609792', 'Type': 'Device', 'UUID': 'N/A', 'Vendor': 'SanDisk'},
+
+            '/dev/sdb1': {'BootRecord': 'Unknown', 'BootRecordStrings': ['Unknown'], 'Capacity': '16 GB', 'Description': 'N/A', 'FileSystem': 'exfat', 'Flags': [], 'HostDevice': '/dev/sdb', 'ID': 'Unknown', 'Label': 'Unknown', 'Name': '/dev/sdb1', 'PartUUID': '0e1d2c3b-01', 'Partitioning': 'N/A', 'Partitions': [], 'Path': 'Unknown', 'Product': 'Host Device: Cruzer Blade', 'RawCapacity': '16007561216', 'Type': 'Partition', 'UUID': '64A2-1F0B', 'Vendor': 'N/A'},
+
+            '/dev/sr0': {'BootRecord': 'N/A', 'BootRecordStrings': ['N/A'], 'Capacity': 'N/A', 'Description': 'Optical Drive', 'FileSystem': 'N/A', 'Flags': ['removable', 'rotational'], 'HostDevice': 'N/A', 'ID': 'Unknown', 'Label': 'N/A', 'Name': '/dev/sr0', 'PartUUID': 'N/A', 'Partitioning': 'Unknown', 'Partitions': [], 'Path': 'Unknown', 'Product': 'DVD+-RW GA50N', 'RawCapacity': 'N/A', 'Type': 'Device', 'UUID': 'N/A', 'Vendor': 'HL-DT-ST'}}
+
+def return_fake_udev_sysfs_tree():
+    return {"class/block/sda/dev": "8:0\n",
+            "class/block/sda1/dev": "8:1\n",
+            "class/block/sdb/dev": "8:16\n",
+            "class/block/sdc/dev": "8:32\n"}
+
+def return_fake_udev_database():
+    return {"b8:0": "S:disk/by-id/ata-Samsung_SSD_860_EVO_500GB_S3Z9NB0K123456\n"
+                    + "W:3\n"
+                    + "I:1634038400\n"
+                    + "E:ID_ATA=1\n"
+                    + "E:ID_TYPE=disk\n"
+                    + "E:ID_BUS=ata\n"
+                    + "E:ID_MODEL=Samsung_SSD_860_EVO_500GB\n"
+                    + "E:ID_MODEL_ENC=Samsung\\x20SSD\\x20860\\x20EVO\\x20500GB\\x20\\x20\\x20\n"
+                    + "E:ID_SERIAL=Samsung_SSD_860_EVO_500GB_S3Z9NB0K123456\n"
+                    + "E:ID_SERIAL_SHORT=S3Z9NB0K123456\n"
+                    + "E:ID_WWN=0x5002538e40a1b2c3\n"
+                    + "E:ID_PART_TABLE_UUID=6f3e1c62-4f0c-4d9b-9a55-2b9e7d3f1a10\n"
+                    + "E:ID_PART_TABLE_TYPE=gpt\n"
+                    + "G:systemd\n"
+                    + "Q:systemd\n"
+                    + "V:1\n",
+
+            "b8:1": "S:disk/by-partuuid/9f2c1f30-01\n"
+                    + "E:ID_BUS=ata\n"
+                    + "E:ID_SERIAL=Samsung_SSD_860_EVO_500GB_S3Z9NB0K123456\n"
+                    + "E:ID_FS_LABEL=My_EFI\n"
+                    + "E:ID_FS_LABEL_ENC=My\\x20EFI\n"
+                    + "E:ID_FS_UUID=8243-0631\n"
+                    + "E:ID_FS_UUID_ENC=8243-0631\n"
+                    + "E:ID_FS_TYPE=vfat\n"
+                    + "E:ID_FS_USAGE=filesystem\n"
+                    + "E:ID_PART_ENTRY_NAME=EFI\\x20system\\x20partition\n"
+                    + "E:ID_PART_ENTRY_TYPE=c12a7328-f81f-11d2-ba4b-00a0c93ec93b\n"
+                    + "E:PARTN=1\n",
+
+            "b8:32": "E:ID_TYPE=disk\n"
+                     + "E:ID_WWN=0x5002538e40a1b2c3\n"
+                     + "E:ID_WWN_WITH_EXTENSION=0x5002538e40a1b2c3\n"}
+
+def return_fake_gpt_partitions():
+    return [("c12a7328-f81f-11d2-ba4b-00a0c93ec93b", "9f2c1f30-5b8e-4c4a-9d1e-3a6f0c2b7e01",
+             256, 511, "EFI system partition"),
+            ("0fc63daf-8483-4772-8e79-3d69d8477de4", "9f2c1f30-5b8e-4c4a-9d1e-3a6f0c2b7e02",
+             1000, 2014, "Linux")]
+
+def return_fake_gpt_partition_table():
+    return {"Scheme": "gpt", "SectorSize": 512, "DiskUUID": "6f3e1c62-4f0c-4d9b-9a55-2b9e7d3f1a10",
+            "Partitions": [{"Number": 1, "StartLBA": 256, "EndLBA": 511,
+                            "Type": "c12a7328-f81f-11d2-ba4b-00a0c93ec93b",
+                            "PartUUID": "9f2c1f30-5b8e-4c4a-9d1e-3a6f0c2b7e01",
+                            "Name": "EFI system partition", "Aligned": False},
+                           {"Number": 2, "StartLBA": 1000, "EndLBA": 2014,
+                            "Type": "0fc63daf-8483-4772-8e79-3d69d8477de4",
+                            "PartUUID": "9f2c1f30-5b8e-4c4a-9d1e-3a6f0c2b7e02",
+                            "Name": "Linux", "Aligned": False}]}
+
+def return_fake_mbr_partition_table():
+    return {"Scheme": "mbr", "SectorSize": 512, "DiskUUID": "1234abcd",
+            "Partitions": [{"Number": 1, "StartLBA": 2048, "EndLBA": 18431, "Type": "0x83",
+                            "PartUUID": "1234abcd-01", "Name": "N/A", "Aligned": True},
+                           {"Number": 2, "StartLBA": 18432, "EndLBA": 59391, "Type": "0x05",
+                            "PartUUID": "1234abcd-02", "Name": "N/A", "Aligned": True},
+                           {"Number": 5, "StartLBA": 18433, "EndLBA": 26624, "Type": "0x83",
+                            "PartUUID": "1234abcd-05", "Name": "N/A", "Aligned": False},
+                           {"Number": 6, "StartLBA": 28672, "EndLBA": 49151, "Type": "0x07",
+                            "PartUUID": "1234abcd-06", "Name": "N/A", "Aligned": True}]}
+
+def return_fake_superblock_tags():
+    return {"ext2": {"TYPE": "ext2", "UUID": "3e7f1b52-0c8d-4a6e-9f21-7d5c3b1a0e9f", "LABEL": "My Data"},
+            "ext3": {"TYPE": "ext3", "UUID": "3e7f1b52-0c8d-4a6e-9f21-7d5c3b1a0e9f", "LABEL": "My Data"},
+            "ext4": {"TYPE": "ext4", "UUID": "3e7f1b52-0c8d-4a6e-9f21-7d5c3b1a0e9f", "LABEL": "My Data"},
+            "xfs": {"TYPE": "xfs", "UUID": "3e7f1b52-0c8d-4a6e-9f21-7d5c3b1a0e9f", "LABEL": "xfsroot"},
+            "btrfs": {"TYPE": "btrfs", "UUID": "3e7f1b52-0c8d-4a6e-9f21-7d5c3b1a0e9f", "LABEL": "butter!"},
+            "vfat": {"TYPE": "vfat", "UUID": "8243-0631", "LABEL": "EFI"},
+            "vfat16": {"TYPE": "vfat", "UUID": "8243-0631", "LABEL": "EFI"},
+            "exfat": {"TYPE": "exfat", "UUID": "64A2-1F0B"},
+            "ntfs": {"TYPE": "ntfs", "UUID": "80125090124FFA24"},
+            "swap": {"TYPE": "swap", "UUID": "3e7f1b52-0c8d-4a6e-9f21-7d5c3b1a0e9f", "LABEL": "swappy"},
+            "crypto_LUKS": {"TYPE": "crypto_LUKS", "UUID": "3e7f1b52-0c8d-4a6e-9f21-7d5c3b1a0e9f",
+                            "LABEL": "secrets!"},
+            "LVM2_member": {"TYPE": "LVM2_member", "UUID": "TJbHQ4-yQzZ-2bHH-8tyN-c2Ra-1zQe-Nx2k9p"},
+            "iso9660": {"TYPE": "iso9660", "UUID": "2022-04-21-16-32-56-00",
+                        "LABEL": "UBUNTU 22.04 LTS AMD64"},
+            "zfs_member": {"TYPE": "zfs_member", "UUID": "5851428633543036423", "LABEL": "tank"}}
+
+def return_fake_nvme_sysfs_tree():
+    tree = {"class/nvme-subsystem/nvme-subsys0/nvme0": "",
+            "class/nvme-subsystem/nvme-subsys0/nvme1": "",
+            "class/nvme-subsystem/nvme-subsys0/nvme0n1/size": "7814037168\n",
+            "class/nvme-subsystem/nvme-subsys2/nvme2": "",
+            "class/nvme/nvme0/nvme0c0n1/size": "7814037168\n",
+            "class/nvme/nvme1/nvme1c1n1/size": "7814037168\n",
+            "class/nvme/nvme2/nvme2n1/size": "1953525168\n",
+            "block/nvme0n1/size": "7814037168\n",
+            "block/nvme0n1/removable": "0\n",
+            "block/nvme0n1/queue/rotational": "0\n",
+            "block/nvme2n1/size": "1953525168\n",
+            "block/nvme2n1/removable": "0\n",
+            "block/nvme2n1/queue/rotational": "0\n",
+            "block/nvme2n1/nvme2n1p1/partition": "1\n",
+            "block/nvme2n1/nvme2n1p1/size": "1024000\n"}
+
+    for controller, model, serial, transport, address, queues in (
+            ("nvme0", "Dual Port NVMe 4TB", "S5XNNA0R100001", "pcie", "0000:3d:00.0", "32"),
+            ("nvme1", "Dual Port NVMe 4TB", "S5XNNA0R100001", "pcie", "0000:3e:00.0", "32"),
+            ("nvme2", "Samsung SSD 970 EVO Plus 1TB", "S4EWNX0R123456", "pcie", "0000:04:00.0",
+             "8")):
+
+        tree["class/nvme/"+controller+"/model"] = model.ljust(40)+"\n"
+        tree["class/nvme/"+controller+"/serial"] = serial.ljust(20)+"\n"
+        tree["class/nvme/"+controller+"/firmware_rev"] = "2B2QEXM7\n"
+        tree["class/nvme/"+controller+"/transport"] = transport+"\n"
+        tree["class/nvme/"+controller+"/address"] = address+"\n"
+        tree["class/nvme/"+controller+"/state"] = "live\n"
+        tree["class/nvme/"+controller+"/queue_count"] = queues+"\n"
+        tree["class/nvme/"+controller+"/subsysnqn"] = "nqn.2014.08.org.nvmexpress:"+serial+"\n"
+
+    return tree
+
+def return_fake_nvme_info():
+    return {"/dev/nvme0": {"Name": "/dev/nvme0", "Model": "Dual Port NVMe 4TB", "Serial": "S5XNNA0R100001",
+                           "Firmware": "2B2QEXM7", "Transport": "pcie", "Address": "0000:3d:00.0",
+                           "State": "live", "QueueCount": 32, "Subsystem": "nvme-subsys0",
+                           "SubsystemNQN": "nqn.2014.08.org.nvmexpress:S5XNNA0R100001",
+                           "Namespaces": ["/dev/nvme0n1"], "Paths": ["nvme0c0n1"]},
+
+            "/dev/nvme1": {"Name": "/dev/nvme1", "Model": "Dual Port NVMe 4TB", "Serial": "S5XNNA0R100001",
+                           "Firmware": "2B2QEXM7", "Transport": "pcie", "Address": "0000:3e:00.0",
+                           "State": "live", "QueueCount": 32, "Subsystem": "nvme-subsys0",
+                           "SubsystemNQN": "nqn.2014.08.org.nvmexpress:S5XNNA0R100001",
+                           "Namespaces": ["/dev/nvme0n1"], "Paths": ["nvme1c1n1"]},
+
+            "/dev/nvme2": {"Name": "/dev/nvme2", "Model": "Samsung SSD 970 EVO Plus 1TB",
+                           "Serial": "S4EWNX0R123456", "Firmware": "2B2QEXM7", "Transport": "pcie",
+                           "Address": "0000:04:00.0", "State": "live", "QueueCount": 8,
+                           "Subsystem": "nvme-subsys2",
+                           "SubsystemNQN": "nqn.2014.08.org.nvmexpress:S4EWNX0R123456",
+                           "Namespaces": ["/dev/nvme2n1"], "Paths": []}}
+
+def return_fake_zram_sysfs_tree():
+    return {"block/zram0/size": "16777216\n",
+            "block/zram0/removable": "0\n",
+            "block/zram0/queue/rotational": "0\n",
+            "block/zram0/disksize": "8589934592\n",
+            "block/zram0/comp_algorithm": "lzo lzo-rle lz4 lz4hc 842 [zstd] \n",
+            "block/zram0/mm_stat": "2147483648 536870912 553648128        0 603979776    12345      678   0   0\n",
+            "block/zram0/io_stat": "       3        7        0     1024\n",
+            "block/zram1/size": "0\n",
+            "block/zram1/disksize": "0\n",
+            "block/zram1/comp_algorithm": "[lzo-rle] lzo lz4\n",
+            "block/zram1/mm_stat": "       0        0        0        0        0        0        0        0        0\n",
+            "block/zram1/io_stat": "       0        0        0        0\n"}
+
+def return_fake_zram_info():
+    return {"/dev/zram0": {"DiskSize": 8589934592, "Algorithm": "zstd", "OriginalDataSize": 2147483648,
+                           "CompressedDataSize": 536870912, "CompressionRatio": 4.0,
+                           "MemoryUsed": 553648128, "MemoryLimit": 0, "MemoryUsedMax": 603979776,
+                           "FailedReads": 3, "FailedWrites": 7},
+
+            "/dev/zram1": {"DiskSize": 0, "Algorithm": "lzo-rle", "OriginalDataSize": 0,
+                           "CompressedDataSize": 0, "CompressionRatio": "N/A", "MemoryUsed": 0,
+                           "MemoryLimit": 0, "MemoryUsedMax": 0, "FailedReads": 0,
+                           "FailedWrites": 0}}
+
+def return_fake_loop_sysfs_tree():
+    return {"block/loop0/size": "130816\n",
+            "block/loop0/ro": "1\n",
+            "block/loop0/removable": "0\n",
+            "block/loop0/queue/rotational": "0\n",
+            "block/loop0/loop/backing_file": "/var/lib/snapd/snaps/core22_1033.snap\n",
+            "block/loop0/loop/offset": "0\n",
+            "block/loop0/loop/sizelimit": "0\n",
+            "block/loop0/loop/autoclear": "1\n",
+            "block/loop0/loop/dio": "1\n",
+            "block/loop0/loop/partscan": "0\n",
+            "block/loop1/size": "2048\n",
+            "block/loop1/ro": "0\n",
+            "block/loop1/loop/backing_file": "/home/user/disk.img (deleted)\n",
+            "block/loop1/loop/offset": "1048576\n",
+            "block/loop1/loop/sizelimit": "1048576\n",
+            "block/loop1/loop/autoclear": "0\n",
+            "block/loop1/loop/dio": "0\n",
+            "block/loop1/loop/partscan": "1\n",
+            "block/loop2/size": "0\n",
+            "block/loop2/ro": "0\n"}
+
+def return_fake_loop_info():
+    return {"/dev/loop0": {"BackingFile": "/var/lib/snapd/snaps/core22_1033.snap", "Offset": 0,
+                           "SizeLimit": 0, "AutoClear": True, "DirectIO": True,
+                           "PartScan": False, "ReadOnly": True},
+
+            "/dev/loop1": {"BackingFile": "/home/user/disk.img (deleted)", "Offset": 1048576,
+                           "SizeLimit": 1048576, "AutoClear": False, "DirectIO": False,
+                           "PartScan": True, "ReadOnly": False}}
+
+def return_fake_no_media_sysfs_tree():
+    return {"block/sdb/size": "0\n",
+            "block/sdb/removable": "1\n",
+            "block/sdb/events": "media_change\n",
+            "block/sdc/size": "0\n",
+            "block/sdc/removable": "0\n",
+            "block/sdc/events": "media_change eject_request\n",
+            "block/sdd/size": "31116288\n",
+            "block/sdd/removable": "1\n",
+            "block/sdd/events": "media_change\n",
+            "block/sde/size": "0\n",
+            "block/sde/removable": "0\n",
+            "block/sr0/size": "0\n",
+            "block/sr0/removable": "1\n",
+            "block/sr0/events": "media_change eject_request\n"}
+
+def return_fake_multipath_sysfs_tree():
+    return {"block/sda/size": "1953525168\n",
+            "block/sda/device/wwid": "t10.ATA     Samsung SSD 860                         S3Z9NB0K\n",
+            "block/sda/device/state": "running\n",
+            "block/sdb/size": "4294967296\n",
+            "block/sdb/device/wwid": "naa.600a0b800011a1b2000003c84f5e1c2d\n",
+            "block/sdb/device/state": "offline\n",
+            "block/sdb/holders/dm-0": "",
+            "block/sdc/size": "4294967296\n",
+            "block/sdc/device/wwid": "naa.600a0b800011a1b2000003c84f5e1c2d\n",
+            "block/sdc/device/state": "running\n",
+            "block/sdc/holders/dm-0": "",
+            "block/sdd/size": "2147483648\n",
+            "block/sdd/device/wwid": "naa.60050768018086a4e800000000000042\n",
+            "block/sdd/device/state": "running\n",
+            "block/sde/size": "2147483648\n",
+            "block/sde/device/wwid": "naa.60050768018086a4e800000000000042\n",
+            "block/sde/device/state": "running\n",
+            "block/dm-0/size": "4294967296\n",
+            "block/dm-0/dm/uuid": "mpath-3600a0b800011a1b2000003c84f5e1c2d\n",
+            "block/dm-0/dm/name": "mpatha\n"}
+
+def return_fake_multipath_info():
+    return {"/dev/sdc": {"WWID": "3600a0b800011a1b2000003c84f5e1c2d", "Map": "/dev/mapper/mpatha",
+                         "Paths": {"/dev/sdb": "offline", "/dev/sdc": "running"}},
+
+            "/dev/sdd": {"WWID": "naa.60050768018086a4e800000000000042", "Map": "N/A",
+                         "Paths": {"/dev/sdd": "running", "/dev/sde": "running"}}}
+
+def return_fake_sysfs_tree():
+    return {"block/nvme0n1/size": "1953525168\n",
+            "block/nvme0n1/removable": "0\n",
+            "block/nvme0n1/queue/rotational": "0\n",
+            "block/nvme0n1/device/vendor": "ATA     \n",
+            "block/nvme0n1/device/model": "Samsung SSD 860 \n",
+            "block/nvme0n1/nvme0n1p1/partition": "1\n",
+            "block/nvme0n1/nvme0n1p1/size": "1024000\n",
+            "block/nvme1n1/size": "1953525168\n",
+            "block/nvme1n1/removable": "0\n",
+            "block/nvme1n1/queue/rotational": "1\n",
+            "block/nvme1n1/device/vendor": "ATA     \n",
+            "block/nvme1n1/device/model": "ST1000DM003-1CH1\n",
+            "block/sr0/size": "2097151\n",
+            "block/sr0/removable": "1\n",
+            "block/sr0/device/vendor": "HL-DT-ST\n",
+            "block/sr0/device/model": "DVD+-RW GA50N   \n",
+            "block/loop0/size": "0\n",
+            "block/dm-0/size": "1024000\n"}
+
+def return_fake_lshw_sysfs_tree():
+    #The same devices as in return_fake_lshw_output(), as sysfs sees them.
+    return {"block/sda/size": "976773168\n",
+            "block/sda/removable": "0\n",
+            "block/sda/queue/rotational": "0\n",
+            "block/sda/device/vendor": "ATA     \n",
+            "block/sda/device/model": "Samsung SSD 860 \n",
+            "block/sda/sda1/partition": "1\n",
+            "block/sda/sda1/size": "1046496\n",
+            "block/sda/sda2/partition": "2\n",
+            "block/sda/sda2/size": "975724592\n",
+            "block/sr0/size": "2097151\n",
+            "block/sr0/removable": "1\n",
+            "block/sr0/device/vendor": "HL-DT-ST\n",
+            "block/sr0/device/model": "DVD+-RW GA50N   \n"}
+
+def return_fake_device_paths():
+    return {"sda": "devices/pci0000:00/0000:00:1f.2/ata1/host0/target0:0:0/0:0:0:0/block/sda",
+            "sda1": "devices/pci0000:00/0000:00:1f.2/ata1/host0/target0:0:0/0:0:0:0/block/sda/sda1",
+            "sdb": "devices/pci0000:00/0000:00:14.0/usb2/2-1/2-1:1.0/host6/target6:0:0/6:0:0:0/block/sdb",
+            "nvme0n1": "devices/pci0000:00/0000:00:1d.0/0000:3d:00.0/nvme/nvme0/nvme0n1",
+            "nvme0n1p1": "devices/pci0000:00/0000:00:1d.0/0000:3d:00.0/nvme/nvme0/nvme0n1/nvme0n1p1",
+            "loop0": "devices/virtual/block/loop0"}
+
+def return_fake_device_filter_sysfs_tree():
+    paths = return_fake_device_paths()
+
+    return {paths["sda"]+"/dev": "8:0\n",
+            paths["sda1"]+"/dev": "8:1\n",
+            paths["sda1"]+"/partition": "1\n",
+            paths["sdb"]+"/dev": "8:16\n",
+            paths["nvme0n1"]+"/dev": "259:0\n",
+            paths["nvme0n1p1"]+"/dev": "259:1\n",
+            paths["nvme0n1p1"]+"/partition": "1\n",
+            paths["loop0"]+"/dev": "7:0\n"}
+
+def return_fake_power_sysfs_tree():
+    paths = return_fake_device_paths()
+    tree = return_fake_device_filter_sysfs_tree()
+
+    tree[paths["sda"]+"/device/power/runtime_status"] = "suspended\n"
+    tree[paths["sdb"]+"/device/power/runtime_status"] = "active\n"
+    tree[paths["nvme0n1"]+"/device/power/runtime_status"] = "unsupported\n"
+
+    return tree
+
+def return_fake_device_filter_links():
+    paths = return_fake_device_paths()
+
+    return {"block": {name: "../"+path for name, path in paths.items() if "1p" not in name
+                      and name != "sda1"},
+            "class/block": {name: "../../"+path for name, path in paths.items()}}
+
+def return_fake_block_size_sysfs_tree():
+    paths = return_fake_device_paths()
+    tree = {}
+
+    for name, sizes in (("sda", (512, 4096, 4096, 0)), ("sdb", (512, 512, 512, 0)),
+                        ("nvme0n1", (4096, 4096, 4096, 131072)), ("loop0", (512, 512, 512, 0))):
+
+        for queue_file, size in zip(("logical_block_size", "physical_block_size",
+                                     "minimum_io_size", "optimal_io_size"), sizes):
+
+            tree[paths[name]+"/queue/"+queue_file] = str(size)+"\n"
+
+    tree[paths["sda1"]+"/partition"] = "1\n"
+    tree[paths["nvme0n1p1"]+"/partition"] = "1\n"
+
+    return tree
+
+def return_fake_block_sizes():
+    return {"/dev/loop0": {"LogicalBlockSize": 512, "PhysicalBlockSize": 512, "MinimumIOSize": 512, "OptimalIOSize": 0},
+            "/dev/nvme0n1": {"LogicalBlockSize": 4096, "PhysicalBlockSize": 4096, "MinimumIOSize": 4096, "OptimalIOSize": 131072},
+            "/dev/nvme0n1p1": {"LogicalBlockSize": 4096, "PhysicalBlockSize": 4096, "MinimumIOSize": 4096, "OptimalIOSize": 131072},
+            "/dev/sda": {"LogicalBlockSize": 512, "PhysicalBlockSize": 4096, "MinimumIOSize": 4096, "OptimalIOSize": 0},
+            "/dev/sda1": {"LogicalBlockSize": 512, "PhysicalBlockSize": 4096, "MinimumIOSize": 4096, "OptimalIOSize": 0},
+            "/dev/sdb": {"LogicalBlockSize": 512, "PhysicalBlockSize": 512, "MinimumIOSize": 512, "OptimalIOSize": 0}}
+
+def return_fake_proc_devices():
+    return """Character devices:
+  1 mem
+  4 tty
+ 10 misc
+
+Block devices:
+  7 loop
+  8 sd
+ 43 nbd
+ 65 sd
+253 device-mapper
+259 blkext
+"""
+
+def return_fake_dm_tree():
+    return {"dev/mapper/control": "",
+            "dev/mapper/fakefedora-root": "",
+            "dev/mapper/fakefedora-swap": "",
+            "dev/mapper/fake--fedora-thin": "",
+            "dev/mapper/luks-3f1c2a": "",
+            "dev/fakefedora/root": "",
+            "dev/fakefedora/swap": "",
+            "sys/block/dm-0/dm/name": "fakefedora-root\n",
+            "sys/block/dm-0/dm/uuid": "LVM-8rXz3S0WQ8Gcx1TWxt1jg62oGYju3UpBA4g3\n",
+            "sys/block/dm-1/dm/name": "luks-3f1c2a\n",
+            "sys/block/dm-1/dm/uuid": "CRYPT-LUKS2-3f1c2a-luks-3f1c2a\n"}
+
+def return_fake_dm_volumes(root):
+    return {("fake-fedora", "thin"): [root+"/dev/mapper/fake--fedora-thin"],
+            ("fakefedora", "root"): [root+"/dev/mapper/fakefedora-root",
+                                     root+"/dev/fakefedora/root"],
+            ("fakefedora", "swap"): [root+"/dev/mapper/fakefedora-swap",
+                                     root+"/dev/fakefedora/swap"]}
+
+def return_fake_sysfs_disk_links():
+    return {"by-uuid": {"nvme0n1p1": "8033-0331"}}
+
 #------------------------------- Not valid JSON -------------------------------
 def return_fake_lsblk_output_bad_3():
     return """this is n(ot) valid JSON ()*"""
@@ -15,6 +15,176 @@
 # You should have received a copy of the GNU General Public License
 # along with GetDevInfo.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
+import struct
+import uuid
+import zlib
+
+def make_fake_sysfs(root, tree):
+    """Creates a fake sysfs tree under root, from a dictionary of paths and file contents."""
+    for path, contents in tree.items():
+        os.makedirs(os.path.dirname(os.path.join(root, path)), exist_ok=True)
+
+        with open(os.path.join(root, path), "w", encoding="utf-8") as sysfs_file:
+            sysfs_file.write(contents)
+
+def make_fake_disk_links(root, tree):
+    """Creates a fake /dev/disk tree of by-* symlinks under root."""
+    for link_type, links in tree.items():
+        os.makedirs(os.path.join(root, link_type))
+
+        for name, target in links.items():
+            os.symlink(target, os.path.join(root, link_type, name))
+
+def fake_get_lv_file_system(disk):
+    """Returns the file systems of the disks in the fake sysfs tree."""
+    return {"/dev/nvme0n1p1": "vfat"}.get(disk, "Unknown")
+
+def make_fake_gpt_image(path, partitions, sector_size=512, disk_guid=None):
+    """
+    Creates a fake disk image with a protective MBR and a GPT partition table.
+    partitions is a list of (type GUID, partition GUID, first LBA, last LBA, name).
+    """
+    entries = bytearray(128 * 128)
+
+    for number, (type_guid, partition_guid, first_lba, last_lba, name) in enumerate(partitions):
+        struct.pack_into("<16s16sQQQ72s", entries, number * 128, uuid.UUID(type_guid).bytes_le,
+                         uuid.UUID(partition_guid).bytes_le, first_lba, last_lba, 0,
+                         name.encode("utf-16-le"))
+
+    header = bytearray(struct.pack("<8sIIIIQQQQ16sQIII", b"EFI PART", 0x10000, 92, 0, 0, 1,
+                                   2047, 34, 2014, uuid.UUID(disk_guid).bytes_le, 2, 128, 128,
+                                   zlib.crc32(entries)))
+
+    struct.pack_into("<I", header, 16, zlib.crc32(header))
+
+    mbr = bytearray(512)
+    struct.pack_into("<B3xB3xII", mbr, 446, 0x00, 0xee, 1, 2047)
+    mbr[510:512] = b"\x55\xaa"
+
+    with open(path, "wb") as image:
+        image.write(mbr.ljust(sector_size, b"\x00"))
+        image.write(bytes(header).ljust(sector_size, b"\x00"))
+        image.write(entries)
+        image.truncate(2048 * sector_size)
+
+def make_fake_mbr_image(path, partitions, logical_partitions=(), disk_signature=0x1234abcd):
+    """
+    Creates a fake disk image with an MBR partition table. partitions is a list of
+    (type, first LBA, sectors). If there are logical partitions, they are put in the
+    extended partition (type 0x05), as a list of (type, first LBA, sectors).
+    """
+    mbr = bytearray(512)
+    struct.pack_into("<I", mbr, 440, disk_signature)
+
+    for number, (partition_type, first_lba, sectors) in enumerate(partitions):
+        struct.pack_into("<B3xB3xII", mbr, 446 + number * 16, 0x80 if number == 0 else 0x00,
+                         partition_type, first_lba, sectors)
+
+    mbr[510:512] = b"\x55\xaa"
+
+    with open(path, "wb") as image:
+        image.write(mbr)
+        image.truncate(65536 * 512)
+
+        extended_lba = [first_lba for partition_type, first_lba, sectors in partitions
+                        if partition_type == 0x05][0] if logical_partitions else None
+
+        #Each EBR sits just before its logical partition.
+        for number, (partition_type, first_lba, sectors) in enumerate(logical_partitions):
+            ebr = bytearray(512)
+            struct.pack_into("<B3xB3xII", ebr, 446, 0x00, partition_type, 1, sectors)
+
+            if number + 1 < len(logical_partitions):
+                next_lba = logical_partitions[number + 1][1] - 1
+                struct.pack_into("<B3xB3xII", ebr, 462, 0x00, 0x05, next_lba - extended_lba,
+                                 logical_partitions[number + 1][2] + 1)
+
+            ebr[510:512] = b"\x55\xaa"
+
+            image.seek((first_lba - 1) * 512)
+            image.write(ebr)
+
+def make_fake_file_system_image(path, file_system):
+    """
+    Creates a small fake disk image with just the superblock (or other signature) of
+    the given file system. The UUIDs and labels match return_fake_superblock_tags().
+    """
+    image = bytearray(256 * 1024)
+    fs_uuid = uuid.UUID("3e7f1b52-0c8d-4a6e-9f21-7d5c3b1a0e9f")
+
+    if file_system in ("ext2", "ext3", "ext4"):
+        compat, incompat, ro_compat = {"ext2": (0x38, 0x2, 0x3), "ext3": (0x3c, 0x2, 0x3),
+                                       "ext4": (0x3c, 0x2c2, 0x46b)}[file_system]
+
+        struct.pack_into("<H", image, 1080, 0xef53)
+        struct.pack_into("<III16s16s", image, 1116, compat, incompat, ro_compat, fs_uuid.bytes,
+                         b"My Data")
+
+    elif file_system == "xfs":
+        image[0:4] = b"XFSB"
+        image[32:48] = fs_uuid.bytes
+        image[108:120] = b"xfsroot".ljust(12, b"\x00")
+
+    elif file_system == "btrfs":
+        image[65568:65584] = fs_uuid.bytes
+        image[65600:65608] = b"_BHRfS_M"
+        image[65835:65842] = b"butter!"
+
+    elif file_system in ("vfat", "vfat16"):
+        image[0:11] = b"\xebX\x90mkfs.fat"
+        offset = 67 if file_system == "vfat" else 39
+        struct.pack_into("<I11s8s", image, offset, 0x82430631, b"EFI        ",
+                         b"FAT32   " if file_system == "vfat" else b"FAT16   ")
+
+        image[510:512] = b"\x55\xaa"
+
+    elif file_system == "exfat":
+        image[0:11] = b"\xebv\x90EXFAT   "
+        struct.pack_into("<I", image, 100, 0x64a21f0b)
+        image[510:512] = b"\x55\xaa"
+
+    elif file_system == "ntfs":
+        image[0:11] = b"\xebR\x90NTFS    "
+        struct.pack_into("<Q", image, 72, 0x80125090124ffa24)
+        image[510:512] = b"\x55\xaa"
+
+    elif file_system == "swap":
+        struct.pack_into("<III16s16s", image, 1024, 1, 2047, 0, fs_uuid.bytes, b"swappy")
+        image[4086:4096] = b"SWAPSPACE2"
+
+    elif file_system == "crypto_LUKS":
+        image[0:8] = b"LUKS\xba\xbe\x00\x02"
+        image[24:32] = b"secrets!"
+        image[168:204] = str(fs_uuid).encode()
+
+    elif file_system == "LVM2_member":
+        image[512:520] = b"LABELONE"
+        image[536:576] = b"LVM2 001TJbHQ4yQzZ2bHH8tyNc2Ra1zQeNx2k9p"
+
+    elif file_system == "iso9660":
+        image[32768:32774] = b"\x01CD001"
+        image[32808:32840] = b"UBUNTU 22.04 LTS AMD64".ljust(32)
+        image[33581:33597] = b"2022042116325600"
+
+    elif file_system == "zfs_member":
+        #A name-value list with the pool name and GUID (and something else to skip).
+        nvlist = bytearray(b"\x01\x01\x00\x00"+struct.pack(">II", 0, 1))
+
+        for name, data_type, value in ((b"version", 8, struct.pack(">Q", 5000)),
+                                       (b"name", 9, struct.pack(">I", 4)+b"tank"),
+                                       (b"pool_guid", 8, struct.pack(">Q", 5851428633543036423))):
+
+            padded_name = name.ljust((len(name) + 3) // 4 * 4, b"\x00")
+            pair = struct.pack(">I", len(name))+padded_name+struct.pack(">II", data_type, 1)+value
+            nvlist += struct.pack(">II", len(pair) + 8, len(pair) + 8)+pair
+
+        image[16384:16384+len(nvlist)] = nvlist
+        struct.pack_into("<Q", image, 131072, 0x00bab10c)
+
+    with open(path, "wb") as image_file:
+        image_file.write(image)
+
 def get_lv_aliases(line):
     """Obtain and verify the name of an LVM volume. Return it once found."""
     alias_list = []
@@ -24,6 +24,7 @@ import os
 import sys
 import plistlib
 import json
+import tempfile
 
 #import test data and functions.
 from . import getdevinfo_test_data as data
@@ -183,6 +184,22 @@ class TestMain(unittest.TestCase):
     #------------------------------------ Tests for get_id ------------------------------------
     #TODO function not yet implemented.
 
+    #------------------------------------ Tests for get_boot_record ------------------------------------
+    def test_get_boot_record_1(self):
+        """Test #1: Test that the boot record and its strings are read correctly from a disk image"""
+        boot_record = data.return_fake_boot_record()
+
+        with tempfile.NamedTemporaryFile() as image:
+            image.write(boot_record+b"\x00"*1024)
+            image.flush()
+
+            self.assertEqual(cygwin.get_boot_record(image.name),
+                             (boot_record, data.return_fake_boot_record_strings()))
+
+    def test_get_boot_record_2(self):
+        """Test #2: Test that ("Unknown", ["Unknown"]) is returned when the disk can't be read"""
+        self.assertEqual(cygwin.get_boot_record("/dev/thisisnotadisk"), ("Unknown", ["Unknown"]))
+
 class TestComputeBlockSize(unittest.TestCase):
     def setUp(self):
         self.correct_results = [None, "512", "1024", "2048", "4096"]
@@ -23,6 +23,15 @@ import unittest
 import os
 import sys
 import plistlib
+import io
+import time
+import subprocess
+import tempfile
+import threading
+import concurrent.futures
+import bs4
+from bs4 import BeautifulSoup
+from lxml import etree
 
 #import test data and functions.
 from . import getdevinfo_test_data as data
@@ -38,11 +47,17 @@ class TestMain(unittest.TestCase):
         #Disk info.
         linux.DISKINFO = data.return_fake_disk_info_linux()
 
-        #Ls ID output.
-        linux.LSIDOUTPUT = data.return_fake_lsid_output()
+        #/dev/disk/by-* links.
+        self.disk_links = tempfile.TemporaryDirectory()
+        functions.make_fake_disk_links(self.disk_links.name, data.return_fake_disk_link_tree())
+        linux.DISK_LINKS = linux.get_disk_links(self.disk_links.name)
 
-        #Ls UUID output.
-        linux.LSUUIDOUTPUT = data.return_fake_lsuuid_output()
+        #blkid output.
+        linux.BLKID_INDEX = linux.parse_blkid_output(data.return_fake_blkid_export_output())
+        linux.BLKID_SCANNED = True
+
+        #Don't read the real udev database.
+        linux.UDEV_DATA = os.devnull
 
         #Good nodes, unicode strings.
         self.node1 = data.Node1().get_copy()
@@ -67,8 +82,12 @@ class TestMain(unittest.TestCase):
 
     def tearDown(self):
         del linux.DISKINFO
-        del linux.LSIDOUTPUT
-        del linux.LSUUIDOUTPUT
+        del linux.DISK_LINKS
+        self.disk_links.cleanup()
+
+        linux.BLKID_INDEX = {}
+        linux.BLKID_SCANNED = False
+        linux.UDEV_DATA = "/run/udev/data"
 
         del self.node1
         del self.node2
@@ -266,6 +285,38 @@ class TestMain(unittest.TestCase):
         """Test #8: Test that mixed characters are handled correctly (byte strings)"""
         self.assertEqual(linux.get_file_system(self.bytenode4), "ꀒꀲꀯꀭꁎꀦꀄewrhtyjthgrfeꀴꀿꀬꀝꅮꅧꅌ")
 
+    def test_get_file_system_9(self):
+        """Test #9: Test that the blkid index is used when lshw doesn't know the file system"""
+        self.assertEqual(linux.get_file_system(self.badnode1), "Unknown")
+
+        self.addCleanup(setattr, self.badnode1.logicalname, "string", "/dev/nada")
+        self.badnode1.logicalname.string = "/dev/sda2"
+        self.assertEqual(linux.get_file_system(self.badnode1), "ext4")
+
+    #------------------------------------ Tests for get_lv_file_system ------------------------------------
+    def test_get_lv_file_system_1(self):
+        """Test #1: Test that file systems are found in the blkid index"""
+        self.assertEqual(linux.get_lv_file_system("/dev/sda1"), "vfat")
+        self.assertEqual(linux.get_lv_file_system("/dev/mapper/fakefedora-root"), "xfs")
+
+    def test_get_lv_file_system_2(self):
+        """Test #2: Test that Unknown is returned, without probing again, for disks blkid didn't find"""
+        self.assertEqual(linux.get_lv_file_system("/dev/sda3"), "Unknown")
+        self.assertEqual(linux.get_lv_file_system("/dev/thisisnotadisk"), "Unknown")
+        self.assertEqual(linux.BLKID_INDEX["/dev/thisisnotadisk"], {})
+
+    #------------------------------------ Tests for parse_blkid_output ------------------------------------
+    def test_parse_blkid_output_1(self):
+        """Test #1: Test that blkid's tags are parsed, and escaped characters are handled"""
+        self.assertEqual(linux.BLKID_INDEX["/dev/sda2"],
+                         {"DEVNAME": "/dev/sda2", "LABEL": "My Data Disk",
+                          "UUID": "33ec5956-b699-4da7-8046-e4ce7bcf8521", "TYPE": "ext4",
+                          "PARTUUID": "9f2c1f30-02"})
+
+    def test_parse_blkid_output_2(self):
+        """Test #2: Test that empty output gives an empty index"""
+        self.assertEqual(linux.parse_blkid_output(""), {})
+
     #------------------------------------ Tests for get_uuid ------------------------------------
     def test_get_uuid_1(self):
         """Test #1: Test that the UUID is returned correctly when present"""
@@ -279,6 +330,10 @@ class TestMain(unittest.TestCase):
         """Test #3: Test that Unknown is returned when we ask for the UUID of a disk that is not present"""
         self.assertEqual(linux.get_uuid("/dev/sda34"), "Unknown")
 
+    def test_get_uuid_4(self):
+        """Test #4: Test that the blkid index is used when there is no by-uuid link"""
+        self.assertEqual(linux.get_uuid("/dev/mapper/fakefedora-root"), "TWxt1j-g62o-GYju-3UpB-A4g3-9ZbB-HWb7jf")
+
     #------------------------------------ Tests for get_id ------------------------------------
     def test_get_id_1(self):
         """Test #1: Test that the ID is returned correctly for a partition when present"""
@@ -292,7 +347,77 @@ class TestMain(unittest.TestCase):
         """Test #3: Test that Unknown is returned for a device/partition that is not present"""
         self.assertEqual(linux.get_id("/dev/sdf"), "Unknown")
 
+    #------------------------------------ Tests for get_label ------------------------------------
+    def test_get_label_1(self):
+        """Test #1: Test that the label is returned correctly when present, with udev's escaping undone"""
+        self.assertEqual(linux.get_label("/dev/sda1"), "EFI System/Boot")
+        self.assertEqual(linux.get_label("/dev/sdb2"), "Data")
+
+    def test_get_label_2(self):
+        """Test #2: Test that Unknown is returned when the label is not present"""
+        self.assertEqual(linux.get_label("/dev/sda3"), "Unknown")
+
+    def test_get_label_3(self):
+        """Test #3: Test that the blkid index is used when there is no by-label link"""
+        self.assertEqual(linux.get_label("/dev/sda2"), "My Data Disk")
+
+    #------------------------------------ Tests for get_partuuid ------------------------------------
+    def test_get_partuuid_1(self):
+        """Test #1: Test that the partition UUID is returned correctly when present"""
+        self.assertEqual(linux.get_partuuid("/dev/sda2"), "9f2c1f30-02")
+
+    def test_get_partuuid_2(self):
+        """Test #2: Test that Unknown is returned when the partition UUID is not present"""
+        self.assertEqual(linux.get_partuuid("/dev/sdb1"), "Unknown")
+
+    #------------------------------------ Tests for get_path ------------------------------------
+    def test_get_path_1(self):
+        """Test #1: Test that the first path in alphabetical order is returned when there are several"""
+        self.assertEqual(linux.get_path("/dev/sda"), "pci-0000:00:17.0-ata-1")
+        self.assertEqual(linux.get_path("/dev/sda1"), "pci-0000:00:17.0-ata-1-part1")
+
+    def test_get_path_2(self):
+        """Test #2: Test that Unknown is returned when the path is not present"""
+        self.assertEqual(linux.get_path("/dev/sdb"), "Unknown")
+
+    #------------------------------------ Tests for get_disk_links ------------------------------------
+    def test_get_disk_links_1(self):
+        """Test #1: Test that missing by-* directories give empty indexes"""
+        with tempfile.TemporaryDirectory() as disk_links:
+            self.assertEqual(linux.get_disk_links(disk_links),
+                             {"by-uuid": {}, "by-id": {}, "by-label": {}, "by-partuuid": {},
+                              "by-path": {}})
+
     #------------------------------------ Tests for get_boot_record ------------------------------------
+    def test_get_boot_record_1(self):
+        """Test #1: Test that the boot record and its strings are read correctly from a disk image"""
+        boot_record = data.return_fake_boot_record()
+
+        with tempfile.NamedTemporaryFile() as image:
+            image.write(boot_record+b"\x00"*1024)
+            image.flush()
+
+            self.assertEqual(linux.get_boot_record(image.name),
+                             (boot_record.decode("utf-8", errors="replace"),
+                              data.return_fake_boot_record_strings()))
+
+    def test_get_boot_record_2(self):
+        """Test #2: Test that ("Unknown", ["Unknown"]) is returned when the disk can't be read"""
+        self.assertEqual(linux.get_boot_record("/dev/thisisnotadisk"), ("Unknown", ["Unknown"]))
+
+    def test_get_boot_record_strings_1(self):
+        """Test #1: Test that only runs of 4 or more printable characters are found, and spaces are removed"""
+        self.assertEqual(linux.get_boot_record_strings(data.return_fake_boot_record()),
+                         data.return_fake_boot_record_strings())
+
+    def test_get_boot_record_strings_2(self):
+        """Test #2: Test that non-ASCII bytes are not treated as readable (no replacement characters)"""
+        self.assertEqual(linux.get_boot_record_strings(b"\xef\xbf\xbdabc\xe2\x80\x9cGRUB\xff"),
+                         ["GRUB", ""])
+
+    def test_get_boot_record_strings_3(self):
+        """Test #3: Test that an empty boot record has no strings"""
+        self.assertEqual(linux.get_boot_record_strings(b""), [""])
 
 class TestParseLSBLKOutput(unittest.TestCase):
     def setUp(self):
@@ -308,8 +433,7 @@ class TestParseLSBLKOutput(unittest.TestCase):
     def test_parse_lsblk_output_1(self):
         """Test #1: Test that this returns expected results with good data in normal circumstances"""
         linux.LSBLKOUTPUT = data.return_fake_lsblk_output_good_1()
-        linux.LSUUIDOUTPUT = ""
-        linux.LSIDOUTPUT = ""
+        linux.DISK_LINKS = {}
 
         diskinfo = data.return_fake_lsblk_output_good_1_diskinfo()
 
@@ -323,8 +447,7 @@ class TestParseLSBLKOutput(unittest.TestCase):
     def test_parse_lsblk_output_2(self):
         """Test #2: Test that this returns expected results with missing vendor, model and size elements for devices"""
         linux.LSBLKOUTPUT = data.return_fake_lsblk_output_bad_1()
-        linux.LSUUIDOUTPUT = ""
-        linux.LSIDOUTPUT = ""
+        linux.DISK_LINKS = {}
 
         diskinfo = data.return_fake_lsblk_output_bad_1_diskinfo()
 
@@ -338,8 +461,7 @@ class TestParseLSBLKOutput(unittest.TestCase):
     def test_parse_lsblk_output_3(self):
         """Test #3: Test that this returns expected results with missing uuid, fstype, and size elements for children"""
         linux.LSBLKOUTPUT = data.return_fake_lsblk_output_bad_2()
-        linux.LSUUIDOUTPUT = ""
-        linux.LSIDOUTPUT = ""
+        linux.DISK_LINKS = {}
 
         diskinfo = data.return_fake_lsblk_output_bad_2_diskinfo()
 
@@ -350,8 +472,7 @@ class TestParseLSBLKOutput(unittest.TestCase):
     def test_parse_lsblk_output_4(self):
         """Test #4: Test that this returns nothing when lsblk returns invalid JSON"""
         linux.LSBLKOUTPUT = data.return_fake_lsblk_output_bad_3()
-        linux.LSUUIDOUTPUT = ""
-        linux.LSIDOUTPUT = ""
+        linux.DISK_LINKS = {}
 
         diskinfo = {}
 
@@ -359,10 +480,293 @@ class TestParseLSBLKOutput(unittest.TestCase):
 
         self.assertEqual(linux.DISKINFO, diskinfo)
 
+    def test_parse_lsblk_all_output_1(self):
+        """Test #1: Test that the lsblk backend finds devices and nested partitions, but skips LVs and excluded devices"""
+        linux.DISK_LINKS = {}
+        linux.DEVICE_FILTER = linux.get_device_filter()
+
+        diskinfo = data.return_fake_lsblk_all_output_diskinfo()
+
+        linux.parse_lsblk_all_output(data.return_fake_lsblk_all_output())
+
+        linux.DEVICE_FILTER = None
+
+        self.assertEqual(linux.DISKINFO, diskinfo)
+
+    def test_parse_lsblk_all_output_2(self):
+        """Test #2: Test that this returns nothing when lsblk returns invalid JSON"""
+        linux.DISK_LINKS = {}
+
+        linux.parse_lsblk_all_output(data.return_fake_lsblk_output_bad_3())
+
+        self.assertEqual(linux.DISKINFO, {})
+
+class TestParseLshwOutput(unittest.TestCase):
+    def setUp(self):
+        self.proper_boot_record_function = linux.get_boot_record
+        self.proper_partition_table_function = linux.get_partition_table
+        linux.get_boot_record = data.fake_get_boot_record
+        linux.get_partition_table = data.fake_get_partition_table
+        linux.DISKINFO = {}
+        linux.DISK_LINKS = {}
+        linux.BLKID_INDEX = {}
+        linux.BLKID_SCANNED = True
+        linux.UDEV_DATA = os.devnull
+        self.maxDiff = None
+
+    def tearDown(self):
+        linux.get_boot_record = self.proper_boot_record_function
+        linux.get_partition_table = self.proper_partition_table_function
+        linux.BLKID_SCANNED = False
+        linux.UDEV_DATA = "/run/udev/data"
+        del linux.DISKINFO
+
+    def test_parse_lshw_output_1(self):
+        """Test #1: Test that devices and partitions are found in lshw's output"""
+        linux.parse_lshw_output(data.return_fake_lshw_output())
+
+        try:
+            self.assertEqual(linux.DISKINFO, data.return_fake_lshw_output_diskinfo())
+
+        except AssertionError as e:
+            functions.print_dict_diffs(linux.DISKINFO, data.return_fake_lshw_output_diskinfo())
+
+            raise e
+
+    def test_parse_lshw_output_2(self):
+        """Test #2: Test that we get the same results as we did with BeautifulSoup"""
+        linux.parse_lshw_output(data.return_fake_lshw_output())
+        lxml_diskinfo = linux.DISKINFO
+
+        linux.DISKINFO = {}
+        output = BeautifulSoup(data.return_fake_lshw_output(), "xml")
+
+        for node in output.list.children:
+            if not isinstance(node, bs4.element.Tag):
+                continue
+
+            host_disk = linux.get_device_info(node)
+
+            for subnode in node.find_all("node"):
+                linux.get_partition_info(subnode, host_disk)
+
+        self.assertEqual(lxml_diskinfo, linux.DISKINFO)
+
+    def test_parse_lshw_output_3(self):
+        """Test #3: Test that we raise RuntimeError if the output isn't what we expected"""
+        self.assertRaises(RuntimeError, linux.parse_lshw_output, b"")
+        self.assertRaises(RuntimeError, linux.parse_lshw_output, b"lshw: not found")
+        self.assertRaises(RuntimeError, linux.parse_lshw_output,
+                          b'<?xml version="1.0" standalone="yes" ?>\n<node id="disk"/>')
+
+    def test_parse_lshw_output_4(self):
+        """Test #4: Test that each device is processed as soon as it has been read"""
+        output = data.return_fake_lshw_output()
+        snapshots = []
+
+        class Stream:
+            """Returns lshw's output a few bytes at a time"""
+            position = 0
+
+            def read1(self, _size):
+                snapshots.append(sorted(linux.DISKINFO))
+                chunk = output[self.position:self.position+100]
+                self.position += 100
+                return chunk
+
+        linux.parse_lshw_output(Stream())
+
+        #The first device and its partitions should be there before the second device is read.
+        self.assertIn(["/dev/sda", "/dev/sda1", "/dev/sda2"], snapshots)
+
+        self.assertEqual(linux.DISKINFO, data.return_fake_lshw_output_diskinfo())
+
+    def test_parse_lshw_output_5(self):
+        """Test #5: Test that output that ends early is reported, and the devices before that are kept"""
+        output = data.return_fake_lshw_output()
+        second_device = output.index(b"<node id=\"cdrom\"")
+        linux.ERRORS = []
+
+        linux.parse_lshw_output(output)
+        self.assertEqual(linux.ERRORS, [])
+
+        linux.DISKINFO = {}
+        linux.parse_lshw_output(output[:second_device+100])
+
+        self.assertIn("/dev/sda1", linux.DISKINFO)
+        self.assertEqual(len(linux.ERRORS), 1)
+        self.assertIn("ended early", linux.ERRORS[0])
+
+        linux.ERRORS = []
+
+    def test_parse_lshw_output_6(self):
+        """Test #6: Test that probes are only given plain values, not lshw's XML, which is freed as it is parsed"""
+        proper_queue_probe_function = linux.queue_probe
+        probe_args = []
+
+        def queue_probe(disk, keys, function, *args):
+            probe_args.extend(args)
+            proper_queue_probe_function(disk, keys, function, *args)
+
+        linux.queue_probe = queue_probe
+
+        try:
+            linux.parse_lshw_output(data.return_fake_lshw_output())
+
+        finally:
+            linux.queue_probe = proper_queue_probe_function
+
+        self.assertTrue(probe_args)
+        self.assertTrue(all(isinstance(arg, str) for arg in probe_args))
+        self.assertEqual(linux.DISKINFO, data.return_fake_lshw_output_diskinfo())
+
+    def test_collect_info_1(self):
+        """Test #1: Test that lshw is killed and reaped if anything goes wrong before its output is read"""
+        proper_functions = (linux.LSHW_COMMAND, linux.watch_process, linux.get_disk_links)
+        processes = []
+
+        def fail():
+            raise RuntimeError("Test")
+
+        linux.LSHW_COMMAND = ("sleep", "10")
+        linux.watch_process = lambda process, name: processes.append(process)
+        linux.get_disk_links = fail
+
+        try:
+            self.assertRaises(RuntimeError, linux.collect_info)
+
+        finally:
+            linux.LSHW_COMMAND, linux.watch_process, linux.get_disk_links = proper_functions
+            linux.DEVICE_FILTER = None
+
+        self.assertEqual(len(processes), 1)
+        self.assertIsNotNone(processes[0].returncode)
+        self.assertTrue(processes[0].stdout.closed)
+
+    def test_get_lshw_command_1(self):
+        """Test #1: Test that the full profile runs all of lshw's tests"""
+        self.assertEqual(linux.get_lshw_command(), ("lshw", "-sanitize", "-class", "disk",
+                                                    "-class", "volume", "-xml"))
+
+    def test_lshw_node_1(self):
+        """Test #1: Test that nodes can be read the same way as BeautifulSoup's nodes"""
+        element = etree.fromstring(data.return_fake_lshw_output())
+        node = linux.LshwNode(element.find("node"))
+
+        self.assertEqual(node.name, "node")
+        self.assertEqual(node["id"], "disk")
+        self.assertEqual(node.logicalname.string, "/dev/sda")
+        self.assertEqual(node.size["units"], "bytes")
+        self.assertIsNone(node.nonexistent)
+        self.assertEqual([child.name for child in node.capabilities.children],
+                         ["capability", "capability", "capability"])
+
+class TestParseSysfs(unittest.TestCase):
+    def setUp(self):
+        self.proper_boot_record_function = linux.get_boot_record
+        self.proper_partition_table_function = linux.get_partition_table
+        self.proper_lv_file_system_function = linux.get_lv_file_system
+        linux.get_boot_record = data.fake_get_boot_record
+        linux.get_partition_table = data.fake_get_partition_table
+        linux.get_lv_file_system = functions.fake_get_lv_file_system
+
+        self.sysfs = tempfile.TemporaryDirectory()
+        functions.make_fake_sysfs(self.sysfs.name, data.return_fake_sysfs_tree())
+        linux.SYSFS = self.sysfs.name
+
+        linux.DISK_LINKS = data.return_fake_sysfs_disk_links()
+        linux.BLKID_INDEX = {}
+        linux.BLKID_SCANNED = True
+        linux.UDEV_DATA = os.devnull
+        self.maxDiff = None
+
+    def tearDown(self):
+        linux.get_boot_record = self.proper_boot_record_function
+        linux.get_partition_table = self.proper_partition_table_function
+        linux.get_lv_file_system = self.proper_lv_file_system_function
+        linux.SYSFS = "/sys"
+        linux.BLKID_SCANNED = False
+        linux.UDEV_DATA = "/run/udev/data"
+        self.sysfs.cleanup()
+        del linux.DISKINFO
+
+    def test_parse_sysfs_1(self):
+        """Test #1: Test that the sysfs backend finds the same information as lsblk (parity test)"""
+        linux.LSBLKOUTPUT = data.return_fake_lsblk_output_good_1()
+        linux.DISKINFO = {}
+        linux.parse_lsblk_output()
+        lsblk_diskinfo = linux.DISKINFO
+
+        linux.DISKINFO = {}
+        linux.parse_sysfs()
+        sysfs_diskinfo = linux.DISKINFO
+
+        #Optical drives are handled differently, and lsblk doesn't know the flags.
+        for diskinfo in (lsblk_diskinfo, sysfs_diskinfo):
+            diskinfo.pop("/dev/sr0", None)
+
+            for disk in diskinfo:
+                diskinfo[disk].pop("Flags")
+
+        self.assertEqual(sysfs_diskinfo, lsblk_diskinfo)
+
+    def test_parse_sysfs_2(self):
+        """Test #2: Test that flags, optical drives and ignored devices are handled correctly"""
+        linux.DISKINFO = {}
+        linux.parse_sysfs()
+
+        self.assertEqual(sorted(linux.DISKINFO), ["/dev/nvme0n1", "/dev/nvme0n1p1", "/dev/nvme1n1", "/dev/sr0"])
+        self.assertEqual(linux.DISKINFO["/dev/nvme0n1"]["Flags"], [])
+        self.assertEqual(linux.DISKINFO["/dev/nvme1n1"]["Flags"], ["rotational"])
+        self.assertEqual(linux.DISKINFO["/dev/sr0"]["Flags"], ["removable"])
+        self.assertEqual(linux.DISKINFO["/dev/sr0"]["RawCapacity"], "N/A")
+        self.assertEqual(linux.DISKINFO["/dev/sr0"]["BootRecord"], "N/A")
+
+    def test_get_sysfs_device_info_1(self):
+        """Test #1: Test that devices that disappear during the scan are skipped"""
+        linux.DISKINFO = {}
+        linux.ERRORS = []
+
+        self.assertIsNone(linux.get_sysfs_device_info("sdz"))
+        self.assertEqual(linux.DISKINFO, {})
+        self.assertEqual(len(linux.ERRORS), 1)
+
+        linux.ERRORS = []
+
+    def test_parse_sysfs_3(self):
+        """Test #3: Test that the sysfs backend finds the same information as lshw (parity test)"""
+        linux.DISK_LINKS = {}
+        linux.DISKINFO = {}
+        linux.parse_lshw_output(data.return_fake_lshw_output())
+        lshw_diskinfo = linux.DISKINFO
+
+        self.sysfs.cleanup()
+        self.sysfs = tempfile.TemporaryDirectory()
+        functions.make_fake_sysfs(self.sysfs.name, data.return_fake_lshw_sysfs_tree())
+        linux.SYSFS = self.sysfs.name
+
+        linux.DISKINFO = {}
+        linux.parse_sysfs()
+        sysfs_diskinfo = linux.DISKINFO
+
+        #lshw calls the optical drive /dev/cdrom, and gets these from its own
+        #tests rather than from sysfs.
+        lshw_diskinfo.pop("/dev/cdrom")
+        sysfs_diskinfo.pop("/dev/sr0")
+
+        for diskinfo in (lshw_diskinfo, sysfs_diskinfo):
+            for disk in diskinfo:
+                for key in ("Vendor", "Description", "Flags", "FileSystem", "Partitioning"):
+                    diskinfo[disk].pop(key)
+
+        self.assertEqual(sysfs_diskinfo, lshw_diskinfo)
+
 class TestParseLVMOutput(unittest.TestCase):
     def setUp(self):
         linux.LVMOUTPUT = data.return_fake_lvm_output()
         linux.DISKINFO = data.return_fake_disk_info_linux()
+        linux.BLKID_INDEX = {}
+        linux.BLKID_SCANNED = True
         self.correct_disk_info = data.return_fake_lvm_disk_info()
         linux.get_lv_aliases_test = functions.get_lv_aliases
         self.maxDiff = None
@@ -384,10 +788,1060 @@ class TestParseLVMOutput(unittest.TestCase):
 
             raise e
 
+    def test_parse_and_assemble_lvm_output_2(self):
+        """Test #2: Test that we get the same result when reading the output from a stream"""
+        stream = io.StringIO("\n".join(line.decode("utf-8") if isinstance(line, bytes) else line
+                                       for line in linux.LVMOUTPUT))
+
+        linux.LVMOUTPUT = None
+        linux.parse_lvm_output(lines=stream, testing=True)
+
+        try:
+            self.assertEqual(linux.DISKINFO, self.correct_disk_info)
+
+        except AssertionError as e:
+            functions.print_dict_diffs(linux.DISKINFO, self.correct_disk_info)
+
+            raise e
+
+    def test_parse_lvm_report_1(self):
+        """Test #1: Test that lvs's and pvs's JSON reports give the same info, but with exact sizes"""
+        linux.parse_lvm_report(data.return_fake_lvs_report(), data.return_fake_pvs_report())
+
+        try:
+            self.assertEqual(linux.DISKINFO, data.return_fake_lvm_report_disk_info())
+
+        except AssertionError as e:
+            functions.print_dict_diffs(linux.DISKINFO, data.return_fake_lvm_report_disk_info())
+
+            raise e
+
+class TestDMIndex(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        functions.make_fake_sysfs(self.root.name, data.return_fake_dm_tree())
+        linux.SYSFS = self.root.name+"/sys"
+
+    def tearDown(self):
+        linux.SYSFS = "/sys"
+        linux.DM_VOLUMES = None
+        linux.DM_NAMES = None
+        self.root.cleanup()
+
+    def test_get_dm_index_1(self):
+        """Test #1: Test that logical volumes are indexed, and other device mapper devices aren't"""
+        volumes, names = linux.get_dm_index(dev_path=self.root.name+"/dev")
+
+        self.assertEqual(volumes, data.return_fake_dm_volumes(self.root.name))
+        self.assertEqual(names[self.root.name+"/dev/fakefedora/root"], ("fakefedora", "root"))
+        self.assertEqual(names[self.root.name+"/dev/mapper/fake--fedora-thin"],
+                         ("fake-fedora", "thin"))
+
+    def test_get_dm_index_2(self):
+        """Test #2: Test that we get empty indexes if there's no /dev/mapper"""
+        self.assertEqual(linux.get_dm_index(dev_path=self.root.name+"/nonexistent"), ({}, {}))
+
+    def test_split_dm_name_1(self):
+        """Test #1: Test that dashes doubled by device mapper are handled"""
+        self.assertEqual(linux.split_dm_name("fedora-root"), ("fedora", "root"))
+        self.assertEqual(linux.split_dm_name("fake--fedora-thin"), ("fake-fedora", "thin"))
+        self.assertEqual(linux.split_dm_name("vg-lv--with--dashes"), ("vg", "lv-with-dashes"))
+        self.assertEqual(linux.split_dm_name("my--vg--2-my--lv"), ("my-vg-2", "my-lv"))
+
+    def test_split_dm_name_2(self):
+        """Test #2: Test that we handle names without a separator"""
+        self.assertEqual(linux.split_dm_name("mpatha"), ("mpatha", "Unknown"))
+        self.assertEqual(linux.split_dm_name("odd--name"), ("odd--name", "Unknown"))
+
+    def test_get_lv_aliases_1(self):
+        """Test #1: Test that aliases are looked up in the index"""
+        linux.DM_VOLUMES, linux.DM_NAMES = linux.get_dm_index(dev_path=self.root.name+"/dev")
+
+        self.assertEqual(linux.get_lv_aliases("  LV Path                /dev/fakefedora/root"),
+                         (self.root.name+"/dev/mapper/fakefedora-root",
+                          [self.root.name+"/dev/mapper/fakefedora-root",
+                           self.root.name+"/dev/fakefedora/root"]))
+
+        self.assertEqual(linux.get_lv_aliases("  LV Path                /dev/fake-fedora/thin"),
+                         (self.root.name+"/dev/mapper/fake--fedora-thin",
+                          [self.root.name+"/dev/mapper/fake--fedora-thin"]))
+
+    def test_get_lv_aliases_2(self):
+        """Test #2: Test that we return Unknown for volumes that aren't in the index"""
+        linux.DM_VOLUMES, linux.DM_NAMES = linux.get_dm_index(dev_path=self.root.name+"/dev")
+
+        self.assertEqual(linux.get_lv_aliases("  LV Path                /dev/fakefedora/home"),
+                         ("Unknown", []))
+
+        self.assertEqual(linux.get_lv_aliases("  LV Path"), ("Unknown", []))
+
+    def test_get_lv_and_vg_name_1(self):
+        """Test #1: Test that names are looked up in the index, and worked out otherwise"""
+        linux.DM_VOLUMES, linux.DM_NAMES = linux.get_dm_index(dev_path=self.root.name+"/dev")
+
+        self.assertEqual(linux.get_lv_and_vg_name(self.root.name+"/dev/mapper/fake--fedora-thin"),
+                         ("fake-fedora", "thin"))
+
+        self.assertEqual(linux.get_lv_and_vg_name("/dev/mapper/my--vg-root"), ("my-vg", "root"))
+        self.assertEqual(linux.get_lv_and_vg_name("/dev/fedora/root"), ("fedora", "root"))
+        self.assertEqual(linux.get_lv_and_vg_name("fedora"), ("Unknown", "Unknown"))
+
+class TestUdevDatabase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        functions.make_fake_sysfs(self.root.name, data.return_fake_udev_sysfs_tree())
+        functions.make_fake_sysfs(self.root.name+"/udev", data.return_fake_udev_database())
+        linux.SYSFS = self.root.name
+        linux.UDEV_DATA = self.root.name+"/udev"
+        linux.UDEV_CACHE = {}
+
+        linux.DISKINFO = {}
+        linux.DISK_LINKS = {}
+        linux.BLKID_INDEX = {}
+        linux.BLKID_SCANNED = True
+
+    def tearDown(self):
+        linux.SYSFS = "/sys"
+        linux.UDEV_DATA = "/run/udev/data"
+        linux.UDEV_CACHE = {}
+        linux.BLKID_SCANNED = False
+        del linux.DISKINFO
+        self.root.cleanup()
+
+    def test_has_udev_database_1(self):
+        """Test #1: Test that the database is only used if udev has put block devices in it"""
+        self.assertTrue(linux.has_udev_database())
+
+        linux.UDEV_DATA = os.devnull
+        self.assertFalse(linux.has_udev_database())
+
+    def test_get_udev_info_1(self):
+        """Test #1: Test that properties are read, and links, tags, etc are ignored"""
+        properties = linux.get_udev_info("/dev/sda1")
+
+        self.assertEqual(properties["ID_FS_TYPE"], "vfat")
+        self.assertEqual(properties["ID_PART_ENTRY_NAME"], "EFI\\x20system\\x20partition")
+        self.assertNotIn("S", properties)
+        self.assertEqual(linux.get_udev_info("/dev/sdb"), {})
+        self.assertEqual(linux.get_udev_info("/dev/nonexistent"), {})
+
+    def test_get_udev_info_2(self):
+        """Test #2: Test that files are only read again if udev has changed them"""
+        properties = linux.get_udev_info("/dev/sda")
+        self.assertIs(linux.get_udev_info("/dev/sda"), properties)
+
+        path = self.root.name+"/udev/b8:0"
+
+        with open(path, "a", encoding="utf-8") as udev_file:
+            udev_file.write("E:ID_PART_TABLE_TYPE=dos\n")
+
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+        self.assertEqual(linux.get_udev_info("/dev/sda")["ID_PART_TABLE_TYPE"], "dos")
+
+    def test_get_uuid_and_label_1(self):
+        """Test #1: Test that disks udev has probed aren't read again if they have no UUID or label"""
+        proper_superblock_function = linux.get_superblock_info
+        linux.get_superblock_info = lambda disk: self.fail("Read the superblock of "+disk)
+        linux.BLKID_SCANNED = False
+
+        try:
+            self.assertEqual(linux.get_uuid("/dev/sda"), "Unknown")
+            self.assertEqual(linux.get_label("/dev/sda"), "Unknown")
+            self.assertEqual(linux.get_label("/dev/sda1"), "My EFI")
+
+        finally:
+            linux.get_superblock_info = proper_superblock_function
+
+    def test_get_udev_property_1(self):
+        """Test #1: Test that escaped properties are preferred, and missing ones are Unknown"""
+        self.assertEqual(linux.get_udev_property("/dev/sda", "ID_MODEL"), "Samsung SSD 860 EVO 500GB")
+        self.assertEqual(linux.get_udev_property("/dev/sda", "ID_VENDOR"), "Unknown")
+        self.assertEqual(linux.get_udev_property("/dev/sda1", "ID_FS_LABEL"), "My EFI")
+        self.assertEqual(linux.get_udev_property("/dev/sda1", "ID_FS_UUID"), "8243-0631")
+
+    def test_udev_fallbacks_1(self):
+        """Test #1: Test that UUIDs, IDs, file systems and partitioning come from udev if the links are missing"""
+        self.assertEqual(linux.get_uuid("/dev/sda1"), "8243-0631")
+        self.assertEqual(linux.get_label("/dev/sda1"), "My EFI")
+        self.assertEqual(linux.get_id("/dev/sda"), "ata-Samsung_SSD_860_EVO_500GB_S3Z9NB0K123456")
+        self.assertEqual(linux.get_id("/dev/sda1"), "ata-Samsung_SSD_860_EVO_500GB_S3Z9NB0K123456-part1")
+        self.assertEqual(linux.get_id("/dev/sdc"), "wwn-0x5002538e40a1b2c3")
+        self.assertEqual(linux.get_lv_file_system("/dev/sda1"), "vfat")
+        self.assertEqual(linux.get_partitioning("/dev/sda"), "gpt")
+
+    def test_udev_fallbacks_2(self):
+        """Test #2: Test that udev's answer is used even if it didn't find a file system"""
+        linux.BLKID_INDEX = {"/dev/sdc": {"TYPE": "ext4"}}
+
+        self.assertEqual(linux.get_lv_file_system("/dev/sdc"), "Unknown")
+
+class TestPartitionTable(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.image = self.root.name+"/disk.img"
+        linux.ERRORS = []
+
+    def tearDown(self):
+        linux.ERRORS = []
+        self.root.cleanup()
+
+    def test_get_partition_table_1(self):
+        """Test #1: Test that GPT partition tables are read"""
+        functions.make_fake_gpt_image(self.image, data.return_fake_gpt_partitions(),
+                                      disk_guid="6f3e1c62-4f0c-4d9b-9a55-2b9e7d3f1a10")
+
+        self.assertEqual(linux.get_partition_table(self.image),
+                         data.return_fake_gpt_partition_table())
+
+    def test_get_partition_table_2(self):
+        """Test #2: Test that GPT partition tables with 4096-byte sectors are read"""
+        functions.make_fake_gpt_image(self.image, data.return_fake_gpt_partitions(),
+                                      sector_size=4096,
+                                      disk_guid="6f3e1c62-4f0c-4d9b-9a55-2b9e7d3f1a10")
+
+        partition_table = linux.get_partition_table(self.image)
+
+        self.assertEqual(partition_table["Scheme"], "gpt")
+        self.assertEqual(partition_table["SectorSize"], 4096)
+        self.assertEqual([partition["Aligned"] for partition in partition_table["Partitions"]],
+                         [True, False])
+
+    def test_get_partition_table_3(self):
+        """Test #3: Test that MBR partition tables and logical partitions are read"""
+        functions.make_fake_mbr_image(self.image, [(0x83, 2048, 16384), (0x05, 18432, 40960)],
+                                      [(0x83, 18433, 8192), (0x07, 28672, 20480)])
+
+        self.assertEqual(linux.get_partition_table(self.image),
+                         data.return_fake_mbr_partition_table())
+
+    def test_get_partition_table_4(self):
+        """Test #4: Test that corrupt GPT headers, file systems and unreadable disks aren't partition tables"""
+        functions.make_fake_gpt_image(self.image, data.return_fake_gpt_partitions(),
+                                      disk_guid="6f3e1c62-4f0c-4d9b-9a55-2b9e7d3f1a10")
+
+        with open(self.image, "r+b") as image:
+            image.seek(512 + 24)
+            image.write(b"\xff")
+
+        #The protective MBR is still there.
+        self.assertEqual(linux.get_partition_table(self.image)["Scheme"], "gpt")
+        self.assertEqual(linux.get_partition_table(self.image)["Partitions"], [])
+
+        #A FAT boot sector ends in 55 AA, but isn't a partition table.
+        boot_sector = bytearray(512)
+        boot_sector[0:11] = b"\xebX\x90mkfs.fat"
+        boot_sector[82:90] = b"FAT32   "
+        boot_sector[510:512] = b"\x55\xaa"
+
+        with open(self.image, "wb") as image:
+            image.write(boot_sector)
+
+        self.assertEqual(linux.get_partition_table(self.image)["Scheme"], "Unknown")
+        self.assertEqual(linux.get_partition_table(self.root.name+"/missing.img")["Scheme"],
+                         "Unknown")
+
+class TestSuperblocks(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        linux.SUPERBLOCK_INDEX = {}
+        linux.ERRORS = []
+        self.maxDiff = None
+
+    def tearDown(self):
+        linux.SUPERBLOCK_INDEX = {}
+        linux.ERRORS = []
+        self.root.cleanup()
+
+    def test_get_superblock_info_1(self):
+        """Test #1: Test that each supported file system is identified, with its UUID and label"""
+        for file_system, tags in data.return_fake_superblock_tags().items():
+            image = self.root.name+"/"+file_system+".img"
+            functions.make_fake_file_system_image(image, file_system)
+
+            self.assertEqual(linux.get_superblock_info(image), tags, file_system)
+
+    def test_get_superblock_info_2(self):
+        """Test #2: Test that empty, short and unreadable disks have no tags, and results are remembered"""
+        image = self.root.name+"/empty.img"
+
+        with open(image, "wb") as image_file:
+            image_file.write(bytes(4096))
+
+        self.assertEqual(linux.get_superblock_info(image), {})
+        self.assertEqual(linux.get_superblock_info(self.root.name+"/missing.img"), {})
+        self.assertEqual(len(linux.ERRORS), 1)
+
+        functions.make_fake_file_system_image(image, "ext4")
+        self.assertEqual(linux.get_superblock_info(image), {})
+
+    def test_get_lv_file_system_1(self):
+        """Test #1: Test that the superblock is used instead of blkid, unless blkid has already probed everything"""
+        image = self.root.name+"/swap.img"
+        functions.make_fake_file_system_image(image, "swap")
+
+        linux.UDEV_DATA = os.devnull
+        linux.BLKID_INDEX = {}
+        self.addCleanup(setattr, linux, "UDEV_DATA", "/run/udev/data")
+
+        linux.BLKID_SCANNED = False
+        self.assertEqual(linux.get_lv_file_system(image), "swap")
+        self.assertEqual(linux.get_uuid(image), "3e7f1b52-0c8d-4a6e-9f21-7d5c3b1a0e9f")
+        self.assertEqual(linux.get_label(image), "swappy")
+
+        linux.BLKID_SCANNED = True
+        self.addCleanup(setattr, linux, "BLKID_SCANNED", False)
+        self.assertEqual(linux.get_lv_file_system(image), "Unknown")
+
+    def test_get_uuid_and_label_1(self):
+        """Test #1: Test that blkid is run for a disk if its superblock isn't one we know"""
+        image = self.root.name+"/unknown.img"
+
+        with open(image, "wb") as image_file:
+            image_file.write(bytes(4096))
+
+        proper_blkid_index_function = linux.get_blkid_index
+        probed = []
+
+        def get_blkid_index(disks):
+            probed.extend(disks)
+            return ({image: {"TYPE": "f2fs", "UUID": "5a6b7c8d", "LABEL": "flash"}}, False)
+
+        linux.get_blkid_index = get_blkid_index
+        linux.UDEV_DATA = os.devnull
+        linux.BLKID_INDEX = {}
+        linux.BLKID_SCANNED = False
+        self.addCleanup(setattr, linux, "UDEV_DATA", "/run/udev/data")
+        self.addCleanup(setattr, linux, "get_blkid_index", proper_blkid_index_function)
+
+        self.assertEqual(linux.get_uuid(image), "5a6b7c8d")
+        self.assertEqual(linux.get_label(image), "flash")
+        self.assertEqual(probed, [image])
+
+class TestNVMe(unittest.TestCase):
+    def setUp(self):
+        self.proper_boot_record_function = linux.get_boot_record
+        self.proper_partition_table_function = linux.get_partition_table
+        self.proper_lv_file_system_function = linux.get_lv_file_system
+        linux.get_boot_record = data.fake_get_boot_record
+        linux.get_partition_table = data.fake_get_partition_table
+        linux.get_lv_file_system = functions.fake_get_lv_file_system
+
+        self.sysfs = tempfile.TemporaryDirectory()
+        functions.make_fake_sysfs(self.sysfs.name, data.return_fake_nvme_sysfs_tree())
+        linux.SYSFS = self.sysfs.name
+        linux.UDEV_DATA = os.devnull
+
+        linux.DISKINFO = {}
+        linux.DISK_LINKS = {}
+        self.maxDiff = None
+
+    def tearDown(self):
+        linux.get_boot_record = self.proper_boot_record_function
+        linux.get_partition_table = self.proper_partition_table_function
+        linux.get_lv_file_system = self.proper_lv_file_system_function
+        linux.SYSFS = "/sys"
+        linux.UDEV_DATA = "/run/udev/data"
+        self.sysfs.cleanup()
+        del linux.DISKINFO
+
+    def test_get_nvme_info_1(self):
+        """Test #1: Test that controllers are described, with their namespaces and multipath paths"""
+        self.assertEqual(linux.get_nvme_info(), data.return_fake_nvme_info())
+
+    def test_get_nvme_info_2(self):
+        """Test #2: Test that there's nothing to describe without any NVMe controllers"""
+        linux.SYSFS = os.devnull
+        self.assertEqual(linux.get_nvme_info(), {})
+
+    def test_parse_nvme_1(self):
+        """Test #1: Test that namespaces lshw missed are added, using their controllers' models"""
+        linux.DISKINFO["/dev/nvme0n1"] = {"Name": "/dev/nvme0n1"}
+        linux.parse_nvme()
+
+        self.assertEqual(linux.DISKINFO["/dev/nvme0n1"], {"Name": "/dev/nvme0n1"})
+        self.assertEqual(linux.DISKINFO["/dev/nvme2n1"]["Product"], "Samsung SSD 970 EVO Plus 1TB")
+        self.assertEqual(linux.DISKINFO["/dev/nvme2n1"]["Description"], "NVME SSD")
+        self.assertEqual(linux.DISKINFO["/dev/nvme2n1"]["Capacity"], "1 TB")
+        self.assertEqual(linux.DISKINFO["/dev/nvme2n1"]["Partitions"], ["/dev/nvme2n1p1"])
+        self.assertEqual(linux.DISKINFO["/dev/nvme2n1p1"]["Product"],
+                         "Host Device: Samsung SSD 970 EVO Plus 1TB")
+
+class TestZram(unittest.TestCase):
+    def setUp(self):
+        self.proper_boot_record_function = linux.get_boot_record
+        self.proper_partition_table_function = linux.get_partition_table
+        linux.get_boot_record = data.fake_get_boot_record
+        linux.get_partition_table = data.fake_get_partition_table
+
+        self.sysfs = tempfile.TemporaryDirectory()
+        functions.make_fake_sysfs(self.sysfs.name, data.return_fake_zram_sysfs_tree())
+        linux.SYSFS = self.sysfs.name
+        linux.UDEV_DATA = os.devnull
+
+        linux.DISKINFO = {}
+        linux.DISK_LINKS = {}
+        self.maxDiff = None
+
+    def tearDown(self):
+        linux.get_boot_record = self.proper_boot_record_function
+        linux.get_partition_table = self.proper_partition_table_function
+        linux.SYSFS = "/sys"
+        linux.UDEV_DATA = "/run/udev/data"
+        linux.DEVICE_FILTER = None
+        self.sysfs.cleanup()
+        del linux.DISKINFO
+
+    def test_get_zram_info_1(self):
+        """Test #1: Test that the statistics are read, and the compression ratio is worked out"""
+        self.assertEqual(linux.get_zram_info(), data.return_fake_zram_info())
+        self.assertEqual(list(linux.get_zram_info(["/dev/zram1"])), ["/dev/zram1"])
+
+    def test_get_device_filter_1(self):
+        """Test #1: Test that asking for zram devices stops them being excluded"""
+        device_filter = linux.get_device_filter(include=("zram",))
+
+        self.assertEqual(device_filter["exclude_names"], ("loop*", "nbd*"))
+        self.assertNotIn(253, device_filter["exclude_majors"])
+
+    def test_parse_zram_1(self):
+        """Test #1: Test that zram devices are only added if they're asked for"""
+        linux.DEVICE_FILTER = linux.get_device_filter()
+        linux.parse_zram()
+
+        self.assertEqual(linux.DISKINFO, {})
+
+        linux.DEVICE_FILTER = linux.get_device_filter(include=("zram",))
+        linux.parse_zram()
+
+        self.assertEqual(sorted(linux.DISKINFO), ["/dev/zram0", "/dev/zram1"])
+        self.assertEqual(linux.DISKINFO["/dev/zram0"]["Description"], "Compressed RAM Disk (zram)")
+        self.assertEqual(linux.DISKINFO["/dev/zram0"]["Capacity"], "8 GB")
+        self.assertEqual(linux.DISKINFO["/dev/zram0"]["Zram"],
+                         data.return_fake_zram_info()["/dev/zram0"])
+
+class TestLoops(unittest.TestCase):
+    def setUp(self):
+        self.proper_boot_record_function = linux.get_boot_record
+        self.proper_partition_table_function = linux.get_partition_table
+        linux.get_boot_record = data.fake_get_boot_record
+        linux.get_partition_table = data.fake_get_partition_table
+
+        self.sysfs = tempfile.TemporaryDirectory()
+        functions.make_fake_sysfs(self.sysfs.name, data.return_fake_loop_sysfs_tree())
+        linux.SYSFS = self.sysfs.name
+        linux.UDEV_DATA = os.devnull
+
+        linux.DISKINFO = {}
+        linux.DISK_LINKS = {}
+        self.maxDiff = None
+
+    def tearDown(self):
+        linux.get_boot_record = self.proper_boot_record_function
+        linux.get_partition_table = self.proper_partition_table_function
+        linux.SYSFS = "/sys"
+        linux.UDEV_DATA = "/run/udev/data"
+        linux.DEVICE_FILTER = None
+        linux.LOOP_FILTER = None
+        self.sysfs.cleanup()
+        del linux.DISKINFO
+
+    def test_get_loop_info_1(self):
+        """Test #1: Test that only loop devices that are in use are reported, with their settings"""
+        self.assertEqual(linux.get_loop_info(), data.return_fake_loop_info())
+        self.assertEqual(list(linux.get_loop_info(["/dev/loop1", "/dev/loop2"])), ["/dev/loop1"])
+
+    def test_parse_loops_1(self):
+        """Test #1: Test that loop devices are only added if they're asked for"""
+        linux.parse_loops()
+
+        self.assertEqual(linux.DISKINFO, {})
+
+        linux.LOOP_FILTER = linux.get_device_filter(include=("loop",))
+        linux.parse_loops()
+
+        self.assertEqual(sorted(linux.DISKINFO), ["/dev/loop0", "/dev/loop1"])
+        self.assertEqual(linux.DISKINFO["/dev/loop0"]["Description"], "Loop Device")
+        self.assertEqual(linux.DISKINFO["/dev/loop0"]["Capacity"], "66 MB")
+        self.assertEqual(linux.DISKINFO["/dev/loop0"]["Flags"], ["read-only", "direct-io"])
+        self.assertEqual(linux.DISKINFO["/dev/loop0"]["Loop"],
+                         data.return_fake_loop_info()["/dev/loop0"])
+
+    def test_parse_loops_2(self):
+        """Test #2: Test that loop devices aren't read, and the device filter still applies"""
+        linux.get_boot_record = lambda disk: self.fail("Read "+disk)
+        linux.LOOP_FILTER = linux.get_device_filter({"exclude_names": ["loop1"]}, include=("loop",))
+        linux.parse_loops()
+
+        self.assertEqual(list(linux.DISKINFO), ["/dev/loop0"])
+        self.assertEqual(linux.DISKINFO["/dev/loop0"]["BootRecord"], "N/A")
+
+    def test_parse_loops_3(self):
+        """Test #3: Test that loop devices that have already been found just get their settings added"""
+        linux.DISKINFO["/dev/loop1"] = {"Name": "/dev/loop1", "Description": "Linux Loop Device"}
+        linux.LOOP_FILTER = linux.get_device_filter(include=("loop",))
+        linux.parse_loops()
+
+        self.assertEqual(linux.DISKINFO["/dev/loop1"]["Description"], "Linux Loop Device")
+        self.assertEqual(linux.DISKINFO["/dev/loop1"]["Loop"],
+                         data.return_fake_loop_info()["/dev/loop1"])
+
+class TestNoMedia(unittest.TestCase):
+    def setUp(self):
+        #Devices with no media must not be opened.
+        self.proper_boot_record_function = linux.get_boot_record
+        self.proper_partitioning_function = linux.get_partitioning
+        linux.get_boot_record = lambda disk: self.fail("Read the boot record of "+disk)
+        linux.get_partitioning = lambda disk: self.fail("Got the partitioning of "+disk)
+
+        self.sysfs = tempfile.TemporaryDirectory()
+        functions.make_fake_sysfs(self.sysfs.name, data.return_fake_no_media_sysfs_tree())
+        linux.SYSFS = self.sysfs.name
+        linux.UDEV_DATA = os.devnull
+
+        linux.DISKINFO = {}
+        linux.DISK_LINKS = {}
+
+    def tearDown(self):
+        linux.get_boot_record = self.proper_boot_record_function
+        linux.get_partitioning = self.proper_partitioning_function
+        linux.SYSFS = "/sys"
+        linux.UDEV_DATA = "/run/udev/data"
+        self.sysfs.cleanup()
+        del linux.DISKINFO
+
+    def test_has_no_media_1(self):
+        """Test #1: Test that empty removable devices are found, using the removable flag or media events"""
+        self.assertTrue(linux.has_no_media("/dev/sdb"))
+        self.assertTrue(linux.has_no_media("/dev/sdc"))
+        self.assertTrue(linux.has_no_media("/dev/sr0"))
+
+    def test_has_no_media_2(self):
+        """Test #2: Test that devices with media, fixed devices, and unknown devices aren't skipped"""
+        self.assertFalse(linux.has_no_media("/dev/sdd"))
+        self.assertFalse(linux.has_no_media("/dev/sde"))
+        self.assertFalse(linux.has_no_media("/dev/sdz"))
+
+    def test_get_sysfs_device_info_1(self):
+        """Test #1: Test that devices with no media are marked without opening them"""
+        for device in ("sdb", "sr0"):
+            linux.get_sysfs_device_info(device)
+
+        self.assertEqual(linux.DISKINFO["/dev/sdb"]["Partitioning"], "No media")
+        self.assertEqual(linux.DISKINFO["/dev/sdb"]["BootRecord"], "No media")
+        self.assertEqual(linux.DISKINFO["/dev/sdb"]["BootRecordStrings"], ["No media"])
+        self.assertEqual(linux.DISKINFO["/dev/sdb"]["Flags"], ["removable"])
+        self.assertEqual(linux.DISKINFO["/dev/sr0"]["Partitioning"], "No media")
+        self.assertEqual(linux.DISKINFO["/dev/sr0"]["Capacity"], "N/A")
+
+    def test_get_lsblk_device_info_1(self):
+        """Test #1: Test that the lsblk backend marks devices with no media too"""
+        linux.get_lsblk_device_info({"name": "sdc", "size": 0, "type": "disk", "rm": False,
+                                     "pttype": None})
+
+        self.assertEqual(linux.DISKINFO["/dev/sdc"]["Partitioning"], "No media")
+        self.assertEqual(linux.DISKINFO["/dev/sdc"]["BootRecord"], "No media")
+
+class TestMultipath(unittest.TestCase):
+    def setUp(self):
+        self.proper_boot_record_function = linux.get_boot_record
+        self.proper_partition_table_function = linux.get_partition_table
+        linux.get_boot_record = data.fake_get_boot_record
+        linux.get_partition_table = data.fake_get_partition_table
+
+        self.sysfs = tempfile.TemporaryDirectory()
+        functions.make_fake_sysfs(self.sysfs.name, data.return_fake_multipath_sysfs_tree())
+        linux.SYSFS = self.sysfs.name
+        linux.UDEV_DATA = os.devnull
+
+        linux.DISKINFO = {}
+        linux.DISK_LINKS = {}
+        self.maxDiff = None
+
+    def tearDown(self):
+        linux.get_boot_record = self.proper_boot_record_function
+        linux.get_partition_table = self.proper_partition_table_function
+        linux.SYSFS = "/sys"
+        linux.UDEV_DATA = "/run/udev/data"
+        linux.DEVICE_FILTER = None
+        linux.MULTIPATH_INFO = {}
+        linux.REDUNDANT_PATHS = set()
+        self.sysfs.cleanup()
+        del linux.DISKINFO
+
+    def test_get_multipath_info_1(self):
+        """Test #1: Test that paths are grouped by map or WWID, and a running path represents each group"""
+        self.assertEqual(linux.get_multipath_info(), data.return_fake_multipath_info())
+
+    def test_parse_sysfs_1(self):
+        """Test #1: Test that every path is probed if multipath devices aren't grouped"""
+        linux.parse_sysfs()
+        linux.parse_multipath()
+
+        self.assertEqual(sorted(linux.DISKINFO), ["/dev/sda", "/dev/sdb", "/dev/sdc",
+                                                  "/dev/sdd", "/dev/sde"])
+
+        self.assertNotIn("Multipath", linux.DISKINFO["/dev/sdc"])
+
+    def test_parse_sysfs_2(self):
+        """Test #2: Test that only one path to each multipath device is probed when they're grouped"""
+        linux.MULTIPATH_INFO = linux.get_multipath_info()
+        linux.REDUNDANT_PATHS = {"/dev/sdb", "/dev/sde"}
+        linux.parse_sysfs()
+        linux.parse_multipath()
+
+        self.assertEqual(sorted(linux.DISKINFO), ["/dev/sda", "/dev/sdc", "/dev/sdd"])
+        self.assertEqual(linux.DISKINFO["/dev/sdc"]["Multipath"],
+                         data.return_fake_multipath_info()["/dev/sdc"])
+
+        self.assertNotIn("Multipath", linux.DISKINFO["/dev/sda"])
+
+class TestPowerAware(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        functions.make_fake_sysfs(self.root.name, data.return_fake_power_sysfs_tree())
+        functions.make_fake_disk_links(self.root.name, data.return_fake_device_filter_links())
+        linux.SYSFS = self.root.name
+        linux.ERRORS = []
+        linux.SUPERBLOCK_INDEX = {}
+
+    def tearDown(self):
+        linux.SYSFS = "/sys"
+        linux.DEVICE_FILTER = None
+        linux.POWER_STATES = {}
+        linux.SLEEPING_DISKS = set()
+        linux.SUPERBLOCK_INDEX = {}
+        linux.ERRORS = []
+        self.root.cleanup()
+
+    def test_get_power_state_1(self):
+        """Test #1: Test that disks suspended by runtime power management are found without opening them"""
+        self.assertEqual(linux.get_power_state("/dev/sda"), "sleeping")
+
+    def test_get_power_state_2(self):
+        """Test #2: Test that the power state is unknown if the disk can't be asked"""
+        self.assertEqual(linux.get_power_state(self.root.name+"/nonexistent"), "Unknown")
+
+    def test_is_sleeping_1(self):
+        """Test #1: Test that partitions are asleep if their device is, and nothing is asleep by default"""
+        self.assertFalse(linux.is_sleeping("/dev/sda1"))
+
+        linux.SLEEPING_DISKS = {"/dev/sda"}
+
+        self.assertTrue(linux.is_sleeping("/dev/sda"))
+        self.assertTrue(linux.is_sleeping("/dev/sda1"))
+        self.assertFalse(linux.is_sleeping("/dev/nvme0n1p1"))
+
+    def test_sleeping_disks_1(self):
+        """Test #1: Test that sleeping disks aren't read, or given to blkid"""
+        linux.SLEEPING_DISKS = {"/dev/sda"}
+
+        self.assertEqual(linux.get_boot_record("/dev/sda1"), ("Unknown", ["Unknown"]))
+        self.assertEqual(linux.get_superblock_info("/dev/sda"), {})
+        self.assertEqual(linux.ERRORS, [])
+        self.assertNotIn("/dev/sda", linux.get_included_devices())
+        self.assertNotIn("/dev/sda1", linux.get_included_devices())
+
+    def test_is_sleeping_2(self):
+        """Test #2: Test that device-mapper devices are asleep if any of the devices under them are"""
+        os.makedirs(self.root.name+"/class/block/dm-0/slaves/sda1")
+        os.makedirs(self.root.name+"/class/block/dm-1/slaves/nvme0n1p1")
+
+        linux.SLEEPING_DISKS = {"/dev/sda"}
+
+        self.assertTrue(linux.is_sleeping("/dev/dm-0"))
+        self.assertFalse(linux.is_sleeping("/dev/dm-1"))
+        self.assertNotIn("/dev/dm-0", linux.get_included_devices())
+        self.assertIn("/dev/dm-1", linux.get_included_devices())
+
+    def test_get_lvm_filter_1(self):
+        """Test #1: Test that LVM is only allowed to see the disks that are awake"""
+        self.assertEqual(linux.get_lvm_filter(), ())
+
+        linux.SLEEPING_DISKS = {"/dev/sda"}
+        options = linux.get_lvm_filter()
+
+        self.assertEqual(set(options[::2]), {"--devices"})
+        self.assertIn("/dev/sdb", options[1::2])
+        self.assertNotIn("/dev/sda", options[1::2])
+        self.assertNotIn("/dev/sda1", options[1::2])
+
+        #Don't run LVM at all if every disk is asleep.
+        linux.SLEEPING_DISKS = {"/dev/sda", "/dev/sdb", "/dev/nvme0n1", "/dev/loop0"}
+
+        self.assertIsNone(linux.get_lvm_filter())
+
+    def test_get_info_1(self):
+        """Test #1: Test that lshw, which would wake up sleeping disks, can't be used"""
+        proper_collect_info_function = linux.collect_info
+        backends = []
+        linux.collect_info = lambda backend, lshw_profile: backends.append(backend)
+
+        try:
+            self.assertRaises(ValueError, linux.get_info, power_aware=True)
+            linux.get_info(backend="sysfs", power_aware=True)
+            linux.get_info(backend="lsblk", power_aware=True)
+            linux.get_info()
+
+        finally:
+            linux.collect_info = proper_collect_info_function
+
+        self.assertEqual(backends, ["sysfs", "lsblk", "lshw"])
+
+    def test_parse_power_states_1(self):
+        """Test #1: Test that entries get their disk's power state, and sleeping disks are marked"""
+        linux.DISKINFO = {"/dev/sda": {"Type": "Device"},
+                          "/dev/sda1": {"Type": "Partition", "HostDevice": "/dev/sda"},
+                          "/dev/sdb": {"Type": "Device"}}
+
+        linux.POWER_STATES = {"/dev/sda": "standby", "/dev/sdb": "active/idle"}
+        linux.SLEEPING_DISKS = {"/dev/sda"}
+        linux.parse_power_states()
+
+        self.assertEqual(linux.DISKINFO["/dev/sda1"], {"Type": "Partition", "HostDevice": "/dev/sda",
+                                                       "PowerState": "standby",
+                                                       "PartiallyProbed": True})
+
+        self.assertEqual(linux.DISKINFO["/dev/sdb"]["PartiallyProbed"], False)
+
+        del linux.DISKINFO
+
+class TestDeviceFilter(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        functions.make_fake_sysfs(self.root.name, data.return_fake_device_filter_sysfs_tree())
+        functions.make_fake_disk_links(self.root.name, data.return_fake_device_filter_links())
+        linux.SYSFS = self.root.name
+
+    def tearDown(self):
+        linux.SYSFS = "/sys"
+        linux.DEVICE_FILTER = None
+        self.root.cleanup()
+
+    def test_get_device_filter_1(self):
+        """Test #1: Test that the default filter excludes loop, zram and nbd devices"""
+        device_filter = linux.get_device_filter()
+
+        self.assertEqual(device_filter["exclude_names"], ("loop*", "zram*", "nbd*"))
+        self.assertEqual(device_filter["include_names"], ())
+        self.assertEqual(device_filter["include_majors"], set())
+
+    def test_get_device_filter_2(self):
+        """Test #2: Test that majors and transports are normalised, and unknown keys are rejected"""
+        device_filter = linux.get_device_filter({"exclude_majors": [7, "43"],
+                                                 "include_transports": "NVMe"})
+
+        self.assertEqual(device_filter["exclude_majors"], {7, 43})
+        self.assertEqual(device_filter["include_transports"], ("nvme",))
+        self.assertRaises(ValueError, linux.get_device_filter, {"exclude_name": ["loop*"]})
+
+    def test_get_block_majors_1(self):
+        """Test #1: Test that only block device majors are read from /proc/devices"""
+        with open(self.root.name+"/devices.txt", "w", encoding="utf-8") as devices:
+            devices.write(data.return_fake_proc_devices())
+
+        self.assertEqual(linux.get_block_majors(self.root.name+"/devices.txt"),
+                         {"loop": 7, "sd": 8, "nbd": 43, "device-mapper": 253, "blkext": 259})
+
+    def test_get_transport_1(self):
+        """Test #1: Test that transports are worked out from the sysfs device tree"""
+        self.assertEqual(linux.get_transport("sda"), "sata")
+        self.assertEqual(linux.get_transport("sdb"), "usb")
+        self.assertEqual(linux.get_transport("nvme0n1"), "nvme")
+        self.assertEqual(linux.get_transport("loop0"), "Unknown")
+        self.assertEqual(linux.get_transport("sdz"), "Unknown")
+
+    def test_is_excluded_1(self):
+        """Test #1: Test the default filter"""
+        self.assertTrue(linux.is_excluded("/dev/loop0"))
+        self.assertTrue(linux.is_excluded("/dev/zram0"))
+        self.assertFalse(linux.is_excluded("/dev/sda"))
+        self.assertFalse(linux.is_excluded("/dev/nvme0n1"))
+
+    def test_is_excluded_2(self):
+        """Test #2: Test filtering by name, major and transport"""
+        linux.DEVICE_FILTER = linux.get_device_filter({"include_names": ["sd*", "nvme*"]})
+        self.assertTrue(linux.is_excluded("/dev/loop0"))
+        self.assertFalse(linux.is_excluded("/dev/sdb"))
+
+        linux.DEVICE_FILTER = linux.get_device_filter({"exclude_majors": [259]})
+        self.assertTrue(linux.is_excluded("/dev/nvme0n1"))
+        self.assertFalse(linux.is_excluded("/dev/sda"))
+
+        linux.DEVICE_FILTER = linux.get_device_filter({"include_majors": [8]})
+        self.assertTrue(linux.is_excluded("/dev/nvme0n1"))
+        self.assertFalse(linux.is_excluded("/dev/sda"))
+
+        linux.DEVICE_FILTER = linux.get_device_filter({"exclude_transports": ["usb"]})
+        self.assertTrue(linux.is_excluded("/dev/sdb"))
+        self.assertFalse(linux.is_excluded("/dev/sda"))
+
+        linux.DEVICE_FILTER = linux.get_device_filter({"include_transports": ["nvme"]})
+        self.assertTrue(linux.is_excluded("/dev/sda"))
+        self.assertFalse(linux.is_excluded("/dev/nvme0n1"))
+
+    def test_get_included_devices_1(self):
+        """Test #1: Test that partitions are filtered along with their devices"""
+        self.assertEqual(linux.get_included_devices(),
+                         ["/dev/nvme0n1", "/dev/nvme0n1p1", "/dev/sda", "/dev/sda1", "/dev/sdb"])
+
+        linux.DEVICE_FILTER = linux.get_device_filter({"exclude_transports": ["sata"]})
+        self.assertEqual(linux.get_included_devices(), ["/dev/loop0", "/dev/nvme0n1",
+                                                        "/dev/nvme0n1p1", "/dev/sdb"])
+
+    def test_get_included_devices_2(self):
+        """Test #2: Test that we return None if nothing is excluded"""
+        linux.DEVICE_FILTER = linux.get_device_filter({})
+        self.assertIsNone(linux.get_included_devices())
+
+    def test_get_lsblk_filter_1(self):
+        """Test #1: Test that majors are passed to lsblk"""
+        linux.DEVICE_FILTER = linux.get_device_filter({"exclude_majors": [43, 7]})
+        self.assertEqual(linux.get_lsblk_filter(), ("-e", "1,7,43"))
+
+        linux.DEVICE_FILTER = linux.get_device_filter({"include_majors": [259, 8],
+                                                       "exclude_majors": [7]})
+        self.assertEqual(linux.get_lsblk_filter(), ("-I", "8,259"))
+
+        linux.DEVICE_FILTER = linux.get_device_filter({})
+        self.assertEqual(linux.get_lsblk_filter(), ())
+
+    def test_parse_lsblk_output_filtered_1(self):
+        """Test #1: Test that filtered devices and their partitions are skipped before being probed"""
+        proper_boot_record_function = linux.get_boot_record
+        probed = []
+        linux.get_boot_record = lambda disk: probed.append(disk) or ("Unknown", ["Unknown"])
+        self.addCleanup(setattr, linux, "get_boot_record", proper_boot_record_function)
+
+        linux.DISK_LINKS = {}
+        linux.DISKINFO = {}
+        linux.LSBLKOUTPUT = data.return_fake_lsblk_output_good_1()
+        linux.DEVICE_FILTER = linux.get_device_filter({"exclude_names": ["nvme1n1"]})
+        linux.parse_lsblk_output()
+
+        self.assertNotIn("/dev/nvme1n1", linux.DISKINFO)
+        self.assertIn("/dev/nvme0n1", linux.DISKINFO)
+        self.assertFalse([disk for disk in probed if disk.startswith("/dev/nvme1n1")])
+
+class TestStartCommands(unittest.TestCase):
+    def test_start_commands_1(self):
+        """Test #1: Test that the commands run at the same time"""
+        start_time = time.monotonic()
+        futures = linux.start_commands({"first": ("sleep", "1"), "second": ("sleep", "1"),
+                                        "third": ("sleep", "1")})
+
+        for future in futures.values():
+            linux.finish_command(future)
+
+        self.assertLess(time.monotonic() - start_time, 2.5)
+
+    def test_finish_command_1(self):
+        """Test #1: Test that we get the output"""
+        cmd = linux.finish_command(linux.start_commands({"echo": ("echo", "test")})["echo"])
+        self.assertEqual(cmd.stdout, b"test\n")
+
+    def test_finish_command_2(self):
+        """Test #2: Test that failures are raised like subprocess.run(check=True) raises them"""
+        futures = linux.start_commands({"false": ("false",),
+                                        "missing": ("getdevinfo-nonexistent-command",)})
+
+        self.assertRaises(subprocess.CalledProcessError, linux.finish_command, futures["false"])
+        self.assertRaises(OSError, linux.finish_command, futures["missing"])
+
+    def test_finish_command_3(self):
+        """Test #3: Test that other exit statuses can be allowed"""
+        future = linux.start_commands({"false": ("false",)})["false"]
+        self.assertEqual(linux.finish_command(future, ok_statuses=(0, 1)).returncode, 1)
+
+class TestProbeExecutor(unittest.TestCase):
+    def setUp(self):
+        self.proper_boot_record_function = linux.get_boot_record
+        self.proper_partition_table_function = linux.get_partition_table
+        linux.get_boot_record = data.fake_get_boot_record
+        linux.get_partition_table = data.fake_get_partition_table
+        linux.DISK_LINKS = {}
+        self.maxDiff = None
+
+    def tearDown(self):
+        linux.get_boot_record = self.proper_boot_record_function
+        linux.get_partition_table = self.proper_partition_table_function
+        linux.PROBE_EXECUTOR = None
+        del linux.DISKINFO
+
+    def test_probe_executor_1(self):
+        """Test #1: Test that running the probes concurrently gives the same result as running them serially (lsblk)"""
+        linux.LSBLKOUTPUT = data.return_fake_lsblk_output_bad_2()
+
+        linux.DISKINFO = {}
+        linux.parse_lsblk_output()
+        serial_diskinfo = linux.DISKINFO
+
+        linux.DISKINFO = {}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            linux.PROBE_EXECUTOR = executor
+            linux.parse_lsblk_output()
+            linux.collect_probes()
+
+        self.assertEqual(linux.DISKINFO, serial_diskinfo)
+        self.assertEqual(list(linux.DISKINFO["/dev/nvme0n1"]), list(serial_diskinfo["/dev/nvme0n1"]))
+
+    def test_probe_executor_2(self):
+        """Test #2: Test that running the probes concurrently gives the same result as running them serially (LVM)"""
+        linux.LVMOUTPUT = data.return_fake_lvm_output()
+        linux.get_lv_aliases_test = functions.get_lv_aliases
+
+        linux.DISKINFO = data.return_fake_disk_info_linux()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            linux.PROBE_EXECUTOR = executor
+            linux.parse_lvm_output(testing=True)
+            linux.collect_probes()
+
+        self.assertEqual(linux.DISKINFO, data.return_fake_lvm_disk_info())
+        self.assertFalse(linux.PENDING_PROBES)
+
+class TestProbeWatchdog(unittest.TestCase):
+    def setUp(self):
+        #Stands in for a device that never responds.
+        self.hung = threading.Event()
+
+        linux.DISKINFO = {"/dev/sda": {"HostDevice": "N/A"},
+                          "/dev/sda1": {"HostDevice": "/dev/sda"},
+                          "/dev/sdb": {"HostDevice": "N/A"}}
+
+        linux.ERRORS = []
+        linux.PROBE_TIMEOUT = 0.2
+
+    def tearDown(self):
+        self.hung.set()
+        linux.stop_probe_workers()
+        linux.PROBE_TIMEOUT = None
+        linux.PROBE_MAX_WORKERS = 1
+        linux.PROBE_EXECUTOR = None
+        linux.ERRORS = []
+        del linux.DISKINFO
+
+    def hang(self, disk):
+        self.hung.wait()
+        return ("Unknown", ["Unknown"])
+
+    def test_probe_watchdog_1(self):
+        """Test #1: Test that probes that hang time out, without holding up other devices"""
+        start_time = time.monotonic()
+
+        linux.queue_probe("/dev/sda", ("BootRecord", "BootRecordStrings"), self.hang, "/dev/sda")
+        linux.queue_probe("/dev/sda1", "FileSystem", lambda disk: "ext4", "/dev/sda1")
+        linux.queue_probe("/dev/sdb", ("BootRecord", "BootRecordStrings"),
+                          data.fake_get_boot_record, "/dev/sdb")
+
+        linux.collect_probes()
+
+        self.assertLess(time.monotonic() - start_time, 2)
+        self.assertEqual(linux.DISKINFO["/dev/sda"]["BootRecord"], "Timed out")
+        self.assertEqual(linux.DISKINFO["/dev/sda"]["BootRecordStrings"], ["Timed out"])
+
+        #sda1 is on the same device, so it is stuck behind the probe that hung.
+        self.assertEqual(linux.DISKINFO["/dev/sda1"]["FileSystem"], "Timed out")
+        self.assertEqual(linux.DISKINFO["/dev/sdb"]["BootRecord"],
+                         data.fake_get_boot_record("/dev/sdb")[0])
+
+        self.assertEqual(len(linux.ERRORS), 2)
+        self.assertFalse(linux.PENDING_PROBES)
+
+    def test_probe_watchdog_2(self):
+        """Test #2: Test that probes that finish in time are stored, and their errors still propagate"""
+        linux.queue_probe("/dev/sda", "Partitioning", lambda disk: "gpt", "/dev/sda")
+        linux.queue_probe("/dev/sdb", "Partitioning", lambda disk: 1/0, "/dev/sdb")
+
+        self.assertRaises(ZeroDivisionError, linux.collect_probes)
+        self.assertEqual(linux.DISKINFO["/dev/sda"]["Partitioning"], "gpt")
+        self.assertEqual(linux.ERRORS, [])
+
+    def test_probe_watchdog_3(self):
+        """Test #3: Test that no more than max_workers workers are started, plus one for each that hangs"""
+        linux.PROBE_MAX_WORKERS = 2
+
+        for disk in ("/dev/sda", "/dev/sda1", "/dev/sdb"):
+            linux.queue_probe(disk, "FileSystem", lambda disk: "ext4", disk)
+
+        linux.collect_probes()
+
+        self.assertEqual(linux.PROBE_WORKER_COUNT, 2)
+
+        linux.queue_probe("/dev/sda", "Partitioning", self.hang, "/dev/sda")
+        linux.queue_probe("/dev/sdb", "Partitioning", lambda disk: "gpt", "/dev/sdb")
+        linux.collect_probes()
+
+        self.assertEqual(linux.PROBE_WORKER_COUNT, 3)
+        self.assertEqual(linux.DISKINFO["/dev/sda"]["Partitioning"], "Timed out")
+        self.assertEqual(linux.DISKINFO["/dev/sdb"]["Partitioning"], "gpt")
+
+    def test_probe_watchdog_4(self):
+        """Test #4: Test that probes never run in the caller's executor, so a hung probe can't stop it from shutting down"""
+        start_time = time.monotonic()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            linux.PROBE_EXECUTOR = executor
+            linux.queue_probe("/dev/sda", "Partitioning", self.hang, "/dev/sda")
+            linux.queue_probe("/dev/sdb", "Partitioning", lambda disk: "gpt", "/dev/sdb")
+            linux.collect_probes()
+
+            self.assertEqual(linux.PROBE_WORKER_COUNT, 2)
+            self.assertEqual(linux.DISKINFO["/dev/sda"]["Partitioning"], "Timed out")
+            self.assertEqual(linux.DISKINFO["/dev/sdb"]["Partitioning"], "gpt")
+
+        #The probe is still hung, but the executor has shut down.
+        self.assertFalse(self.hung.is_set())
+        self.assertLess(time.monotonic() - start_time, 2)
+
+    def test_finish_command_1(self):
+        """Test #1: Test that commands that take too long are given up on"""
+        start_time = time.monotonic()
+        future = linux.start_commands({"sleep": ("sleep", "10")})["sleep"]
+
+        self.assertRaises(subprocess.SubprocessError, linux.finish_command, future)
+        self.assertLess(time.monotonic() - start_time, 2)
+
+    def test_get_info_1(self):
+        """Test #1: Test that get_info() finishes on time if UUID and label lookups hang"""
+        proper_functions = (linux.get_uuid, linux.get_label, linux.get_boot_record,
+                            linux.get_partition_table, linux.get_lv_file_system)
+
+        linux.get_uuid = linux.get_label = self.hang
+        linux.get_boot_record = data.fake_get_boot_record
+        linux.get_partition_table = data.fake_get_partition_table
+        linux.get_lv_file_system = functions.fake_get_lv_file_system
+        linux.PROBE_TIMEOUT = None
+
+        sysfs = tempfile.TemporaryDirectory()
+        functions.make_fake_sysfs(sysfs.name, data.return_fake_sysfs_tree())
+        linux.SYSFS = sysfs.name
+        linux.UDEV_DATA = os.devnull
+
+        try:
+            start_time = time.monotonic()
+            linux.get_info(backend="sysfs", probe_timeout=0.5)
+
+            self.assertLess(time.monotonic() - start_time, 1.5)
+            self.assertEqual(linux.DISKINFO["/dev/nvme0n1p1"]["UUID"], "Timed out")
+            self.assertEqual(linux.DISKINFO["/dev/nvme0n1p1"]["Label"], "Timed out")
+            self.assertEqual(linux.DISKINFO["/dev/nvme1n1"]["BootRecord"], "Unknown")
+            self.assertIsNone(linux.PROBE_TIMEOUT)
+
+        finally:
+            (linux.get_uuid, linux.get_label, linux.get_boot_record, linux.get_partition_table,
+             linux.get_lv_file_system) = proper_functions
+
+            linux.SYSFS = "/sys"
+            linux.UDEV_DATA = "/run/udev/data"
+            sysfs.cleanup()
+
 class TestComputeBlockSize(unittest.TestCase):
     def setUp(self):
         self.block_sizes, self.correct_results = (data.return_fake_block_dev_output(),
-                                                  [None, "512", "1024", "2048", "4096", "8192"])
+                                                  [None, 512, 1024, 2048, 4096, 8192])
 
     def tearDown(self):
         del self.block_sizes
@@ -409,7 +1863,40 @@ class TestComputeBlockSize(unittest.TestCase):
             self.assertEqual(linux.compute_block_size(testdata),
                              self.correct_results[self.block_sizes.index(testdata)])
 
+class TestGetBlockSizes(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        functions.make_fake_sysfs(self.root.name, data.return_fake_block_size_sysfs_tree())
+        functions.make_fake_disk_links(self.root.name, data.return_fake_device_filter_links())
+        linux.SYSFS = self.root.name
+        linux.ERRORS = []
+
+    def tearDown(self):
+        linux.SYSFS = "/sys"
+        linux.ERRORS = []
+        self.root.cleanup()
+
+    def test_get_block_sizes_1(self):
+        """Test #1: Test that the block sizes of every device are read as ints, and partitions use their device's"""
+        self.assertEqual(linux.get_block_sizes(), data.return_fake_block_sizes())
+
+    def test_get_block_sizes_2(self):
+        """Test #2: Test that only the given devices are read, and unknown ones are None"""
+        self.assertEqual(linux.get_block_sizes(["/dev/nvme0n1p1", "/dev/nonexistent"]),
+                         {"/dev/nvme0n1p1": data.return_fake_block_sizes()["/dev/nvme0n1p1"],
+                          "/dev/nonexistent": None})
+
+    def test_get_block_size_1(self):
+        """Test #1: Test that get_block_size() gets the physical block size from sysfs"""
+        self.assertEqual(linux.get_block_size("/dev/sda1"), 4096)
+        self.assertEqual(linux.get_block_size("/dev/nvme0n1"), 4096)
+
 class TestGetInfo(unittest.TestCase):
     def test_get_info(self):
         """Test that the information can be collected on this system without error"""
         linux.get_info()
+
+    def test_get_info_2(self):
+        """Test #2: Test that unknown options are rejected before running anything"""
+        self.assertRaises(ValueError, linux.get_info, backend="udisks")
+        self.assertRaises(ValueError, linux.get_info, lshw_profile="fastest")
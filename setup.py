@@ -17,12 +17,12 @@ here = path.abspath(path.dirname(__file__))
 
 if platform.system() == "Linux":
     LINUX = True
-    dependencies = ("lshw", "blkid", "lsblk", "lvdisplay", "dd", "strings", "blockdev")
+    dependencies = ("lshw", "blkid", "lsblk", "lvdisplay", "blockdev")
 
 elif "CYGWIN" in platform.system():
     LINUX = True
     CYGWIN = True
-    dependencies = ("/sbin/blkid", "/usr/sbin/smartctl", "cygpath", "dd", "strings")
+    dependencies = ("/sbin/blkid", "/usr/sbin/smartctl", "cygpath")
 
 elif platform.system() == "Darwin":
     LINUX = False
@@ -88,6 +88,9 @@ setup(
 
     keywords='devices hardware',
     packages=find_packages(),
-    install_requires=['beautifulsoup4', 'lxml'],
+    install_requires=['lxml'],
+
+    #BeautifulSoup is only used by the tests and benchmarks.
+    extras_require={'test': ['beautifulsoup4']},
     python_requires='>=2.8, !=3.0.*, !=3.1.*, !=3.2.*, !=3.3.*, !=3.4.*',
 )